@@ -5,16 +5,26 @@ NAMESPACES = {
     "normal": {
         "path": "tests/normal/",
         "pytest_args": ["-vv"]
+    },
+    "bench": {
+        "path": "tests/bench/",
+        "pytest_args": ["-v", "--bench-json", "bench_results.json"]
     }
 }
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python runtests.py <namespace1> [<namespace2> ...]")
+        print("Usage: python runtests.py <namespace1> [<namespace2> ...] [-- <pytest args>]")
         print("Available namespaces:", ", ".join(NAMESPACES.keys()))
+        print("e.g. python runtest.py bench -- --bench-baseline baseline.json --bench-db-rows 10000,10000000")
         sys.exit(1)
 
-    selected_namespaces = sys.argv[1:]
+    args = sys.argv[1:]
+    extra_args = []
+    if "--" in args:
+        extra_args = args[args.index("--") + 1:]
+        args = args[:args.index("--")]
+    selected_namespaces = args
 
     for ns in selected_namespaces:
         if ns not in NAMESPACES:
@@ -27,7 +37,7 @@ def main():
 
         print(f"\n=== Running tests for namespace '{ns}' ({path}) ===\n")
         
-        subprocess.run(["pytest", path] + args)
+        subprocess.run(["pytest", path] + args + extra_args)
 
 
 if __name__ == "__main__":
@@ -5,18 +5,208 @@ load_dotenv()
 
 MAX_OBJECT_ENTRIES = 50
 
+RETENTION_INLINE_PRUNE = False  # prune on every insert instead of leaving it to RetentionWorker
+
+RETENTION_ENABLED = True  # pipelines with a database run a RetentionWorker while they run
+
+RETENTION_MAX_AGE_DAYS = 30  # sightings older than this are deleted, None keeps them forever
+
+# per-label overrides of the default policy (max_entries=MAX_OBJECT_ENTRIES, max_age_days=RETENTION_MAX_AGE_DAYS)
+RETENTION_POLICIES = {
+    # "cell phone": {"max_entries": 200, "max_age_days": 90},
+}
+
+RETENTION_DISK_BUDGET_MB = 1024  # images in IMAGE_DIR beyond this are deleted oldest first
+
+RETENTION_INTERVAL_S = 60  # how often the retention worker runs
+
+RETENTION_BATCH_SIZE = 500  # rows deleted per transaction, keeps the camera's inserts unblocked
+
+RETENTION_ORPHAN_GRACE_S = 600  # image files no row refers to are deleted once this old
+
+RETENTION_VACUUM_PAGES = 1024  # free pages returned to the file system per run
+
+LAST_SEEN_CACHE_SIZE = 10  # most recent sightings kept in memory per label, 0 disables the cache
+
+LAST_SEEN_CACHE_LABELS = 64  # labels kept in the last-seen cache before LRU eviction
+
+SQLITE_JOURNAL_MODE = "WAL"  # lets voice queries read while the camera writes
+
+SQLITE_SYNCHRONOUS = "NORMAL"  # safe with WAL, avoids an fsync per commit
+
+SQLITE_CACHE_SIZE_KB = 16384  # page cache per connection
+
 ALLOWED_LABELS = ['backpack', 'umbrella', 'handbag', 'suitcase', 'bottle', 'cup', 'laptop', 'mouse', 'cell phone', 'book', 'scissors']
 
+# spoken words mapped to the detector labels they may refer to
+LABEL_SYNONYMS = {
+    "phone": ["cell phone"],
+    "mobile": ["cell phone"],
+    "smartphone": ["cell phone"],
+    "cellphone": ["cell phone"],
+    "computer": ["laptop"],
+    "notebook": ["laptop"],
+    "mug": ["cup"],
+    "glass": ["cup"],
+    "water bottle": ["bottle"],
+    "purse": ["handbag"],
+    "bag": ["backpack", "handbag", "suitcase"],
+    "rucksack": ["backpack"],
+    "luggage": ["suitcase"],
+    "brolly": ["umbrella"],
+}
+
+QUERY_PAGE_SIZE = 5  # sightings returned per page by the memory query engine
+
+QUERY_COOCCURRENCE_FRAMES = 20  # recent frames of an object searched for what was seen with it
+
+# answers of the memory query engine; also the source of the TTS pre-warm phrases
+SPEECH_LAST_SEEN = "Your {label} was last seen {ago}."
+
+SPEECH_NOT_SEEN = "I have not seen your {label}."
+
 MIN_CONFIDENCE = 0.6
 
 IMAGE_DIR = "data/images/"
 
+IMAGE_JPEG_QUALITY = 85  # 0-100, JPEG quality of saved sighting images
+
+IMAGE_MAX_SIDE = 1280  # longer side of saved images is downscaled to this, 0 keeps full size
+
+IMAGE_SAVE_CROPS = False  # save one crop per object instead of the annotated full frame
+
+IMAGE_CROP_MARGIN = 0.15  # extra context around each crop, relative to the box size
+
+IMAGE_WRITER_WORKERS = 2  # threads encoding and writing images in the background
+
+IMAGE_WRITER_QUEUE_SIZE = 8  # pending image writes before ImageStore.save blocks
+
+IMAGE_DEDUP_ENABLED = True  # reuse the last saved image when a new sighting looks the same
+
+IMAGE_DEDUP_HASH_SIZE = 8  # dHash grid size, giving a 64 bit perceptual hash
+
+IMAGE_DEDUP_MAX_DISTANCE = 6  # max differing hash bits for two images to count as the same
+
+IMAGE_DEDUP_CAPACITY = 256  # recently saved images remembered for reuse
+
+IMAGE_DEDUP_MAX_AGE_S = 600  # a saved image is not reused after this many seconds
+
 YOLO_MODEL_NAME = "yolov8s.pt"
 
+YOLO_MAX_BATCH_SIZE = 8  # max frames pushed through a single model call
+
+YOLO_BATCH_TIMEOUT_MS = 50  # max time to wait for a batch to fill before running it
+
+YOLO_TILE_SIZE = 640  # side in pixels of the tiles large frames are split into in tiled mode
+
+YOLO_TILE_OVERLAP = 0.2  # overlap of neighbouring tiles, relative to the tile size
+
+YOLO_TILE_FULL_FRAME = True  # in tiled mode also infer the whole frame, so objects larger than a tile are kept
+
+YOLO_MERGE_NMS_THRESHOLD = 0.5  # boxes of one label overlapping more than this across tiles/regions are merged
+
+YOLO_MERGE_NMS_METRIC = "ios"  # options: 'ios' (intersection over the smaller box, merges boxes cut at tile edges), 'iou'
+
+# Per camera inference mode, see visionassist.model.regions.InferenceMode.
+# ROIs are (x1, y1, x2, y2) fractions of the frame; only those regions are inferred.
+# e.g. {"desk": {"rois": {"table": (0.2, 0.5, 0.8, 1.0)}}, "hall": {"tile_size": 640}}
+YOLO_SOURCE_MODES = {}
+
+SCENE_GATE_ENABLED = False  # skip YOLO inference while the scene is unchanged
+
+SCENE_CHANGE_THRESHOLD = 0.02  # mean absolute pixel change (0-1) that counts as a new scene
+
+SCENE_MAX_INTERVAL_S = 5.0  # always re-run inference after this many seconds
+
+SCENE_GATE_WIDTH = 64  # frames are downscaled to this width before comparison
+
+TRACKER_IOU_THRESHOLD = 0.3  # min IoU for a detection to continue an existing track
+
+TRACKER_MOVE_THRESHOLD = 0.25  # centroid shift, relative to the box diagonal, that counts as a move
+
+TRACKER_MAX_MISSED = 15  # frames a track may go unseen before it is reported as disappeared
+
+PIPELINE_QUEUE_SIZE = 2  # per-stage queue bound; frames waiting for detect/save are dropped oldest first when full, database writes wait
+
+MULTI_CAMERA_RING_SLOTS = 4  # shared-memory frame slots per camera; frames are dropped while all are in use
+
+MULTI_CAMERA_WRITE_BATCH = 32  # detections per source written to the database in one transaction
+
+MULTI_CAMERA_MAX_RESTARTS = 3  # times a crashed camera worker is respawned before its camera is stopped
+
+MULTI_CAMERA_METRICS_INTERVAL_S = 1.0  # how often camera workers send their metrics to the parent's registry
+
 WHISPER_MODEL_NAME = "small.en"
 
+STT_WORKER_MAX_RESTARTS = 3  # crashes of a ready STT worker process that are restarted before giving up
+
+STT_WORKER_RESTART_BACKOFF_S = 0.5  # wait before the first restart, doubled for every further one
+
 WHISPER_ACCESS_MODE = "online"  # options: 'offline', 'online'
 
+WHISPER_API_TIMEOUT_S = (3.05, 30)  # (connect, read) timeout of online transcription requests
+
+WHISPER_API_RETRIES = 3  # retries on connection errors and 429/5xx responses
+
+WHISPER_API_BACKOFF_S = 0.5  # exponential backoff factor between retries
+
+WHISPER_API_POOL_SIZE = 4  # keep-alive connections kept open to the API
+
+WHISPER_API_MAX_CONCURRENCY = 2  # requests in flight at once
+
+WHISPER_API_UPLOAD_FORMAT = "FLAC"  # options: 'FLAC', 'WAV' (16 kHz mono), None to upload audio unchanged
+
+AUDIO_MAX_SECONDS = 30  # recording ring buffer length; older audio is overwritten
+
+AUDIO_PREROLL_SECONDS = 0.5  # audio kept from before start_recording while the recorder is armed
+
+VAD_FRAME_MS = 30  # analysis frame length of the voice-activity detector
+
+VAD_ENERGY_THRESHOLD = 0.015  # RMS level (0-1) above which a frame counts as speech
+
+VAD_MIN_SILENCE_MS = 600  # silence that ends an utterance
+
+VAD_MIN_SPEECH_MS = 250  # shorter bursts are discarded as noise
+
+VAD_PREROLL_MS = 200  # audio kept from before speech onset so the first syllable isn't cut
+
+VAD_MAX_UTTERANCE_S = 15  # utterances are force-cut at this length
+
+VAD_PARTIAL_INTERVAL_S = 1.0  # how often a partial transcription is produced while speaking
+
+MODEL_LOAD_MODE = "eager"  # options: 'eager' (in __init__), 'background' (loader thread), 'lazy' (on first use)
+
+TTS_BACKEND = "gtts"  # options: 'gtts' (online), 'espeak' (offline, needs espeak-ng installed)
+
+ESPEAK_BINARY = "espeak-ng"
+
+ESPEAK_WORDS_PER_MINUTE = 160
+
+TTS_STREAM_LOOKAHEAD = 1  # sentences synthesized ahead of the one being played
+
+TTS_CACHE_ENABLED = True  # reuse synthesized audio for repeated phrases
+
+TTS_CACHE_DIR = "data/tts_cache/"
+
+TTS_CACHE_MAX_BYTES = 50 * 1024 * 1024  # on-disk budget, least recently used phrases are evicted
+
+TTS_CACHE_MEMORY_ENTRIES = 32  # phrases kept in memory for instant replay
+
+# phrases synthesized at startup so the first answer is served from cache; {label} expands to ALLOWED_LABELS
+TTS_PREWARM_TEMPLATES = [
+    SPEECH_NOT_SEEN,
+    SPEECH_LAST_SEEN.format(label="{label}", ago="just now"),
+]
+
+METRICS_ENABLED = os.getenv("VISIONASSIST_METRICS", "0") == "1"  # counters, histograms and span timers
+
+METRICS_PORT = 9464  # local endpoint serving /metrics (Prometheus) and /metrics.json
+
+METRICS_RESERVOIR_SIZE = 1024  # recent samples per histogram used for p50/p90/p99
+
+# Prometheus histogram buckets for span durations, in ms
+METRICS_LATENCY_BUCKETS_MS = [1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
 ENVITRONMENT = {
     "type" : "production",  # options: 'development', 'production'
     "debug": False, # True or False
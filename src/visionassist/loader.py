@@ -0,0 +1,94 @@
+import threading
+import time
+from visionassist.logger import logger
+
+
+class ModelLoader:
+    """
+    Loads a heavy model once, either eagerly, in a background thread, or on first use.
+
+    Callers that need the model call `get()`, which blocks until it is loaded.
+    Callers that only want to know whether they can answer right away use
+    `is_ready()`, so the app can keep serving memory queries while weights load.
+    """
+
+    MODES = ("eager", "background", "lazy")
+
+    def __init__(self, load, name:str="model", mode:str="eager"):
+        """
+        Args:
+            load: Zero-argument callable returning the loaded model
+            name: Used in log messages
+            mode: 'eager' loads now, 'background' starts a loader thread,
+                'lazy' waits for the first `get()`
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Load mode must be one of {', '.join(self.MODES)}")
+        self._load = load
+        self.name = name
+        self.mode = mode
+        self.load_ms = None
+        self.error = None
+
+        self._model = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._done = threading.Event()  # the last load attempt finished, loaded or failed
+        self._thread = None
+
+        if mode == "eager":
+            self.get()
+        elif mode == "background":
+            self.start()
+
+    def start(self):
+        """Begin loading in a daemon thread; no-op if loading already started."""
+        with self._lock:
+            if self._thread is not None or self._ready.is_set():
+                return
+            self._done.clear()
+            self._thread = threading.Thread(target=self._load_once, name=f"load-{self.name}", daemon=True)
+            self._thread.start()
+
+    def _load_once(self):
+        with self._lock:
+            if self._ready.is_set():
+                return
+            self._done.clear()
+            start = time.perf_counter()
+            try:
+                self._model = self._load()
+                self.error = None
+            except Exception as e:
+                logger.error(f"Failed to load {self.name}: {e}")
+                self.error = e
+            else:
+                self.load_ms = (time.perf_counter() - start) * 1000
+                logger.info(f"{self.name} loaded in {self.load_ms:.0f} ms")
+            finally:
+                self._thread = None
+                if self.error is None:
+                    self._ready.set()
+                self._done.set()
+
+    def is_ready(self):
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout:float=None):
+        """
+        Block until the model is loaded. Returns False on timeout.
+        Raises RuntimeError if loading failed.
+        """
+        if not self._done.wait(timeout):
+            return False
+        if self.error is not None:
+            raise RuntimeError(f"{self.name} failed to load") from self.error
+        return True
+
+    def get(self):
+        """Return the model, loading it on this thread if nobody has started yet."""
+        if not self._ready.is_set():
+            self._load_once()
+            if self.error is not None:
+                raise RuntimeError(f"{self.name} failed to load") from self.error
+        return self._model
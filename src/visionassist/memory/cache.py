@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+from visionassist.config import LAST_SEEN_CACHE_SIZE, LAST_SEEN_CACHE_LABELS
+
+
+def _key(obj):
+    """Identity of a cached object: its row id (plain values in tests are their own key)."""
+    return getattr(obj, "id", obj)
+
+
+class LastSeenCache:
+    """
+    Write-through LRU cache of the most recent sightings per label.
+
+    Each cached label holds its newest `per_label` objects, newest first, exactly
+    as `Database.get_latest_objects` would return them. Labels are evicted least
+    recently used once more than `max_labels` are cached.
+    """
+
+    def __init__(self, per_label:int=LAST_SEEN_CACHE_SIZE, max_labels:int=LAST_SEEN_CACHE_LABELS):
+        self.per_label = per_label
+        self.max_labels = max_labels
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._generations = {}  # bumped on every write, so reads racing a write don't cache stale rows
+        self._lock = threading.Lock()
+
+    def get(self, label:str, limit:int):
+        """Return the newest `limit` objects for `label`, or None on a miss."""
+        with self._lock:
+            entries = self._entries.get(label)
+            if entries is None or limit > self.per_label:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(label)
+            self.hits += 1
+            return entries[:limit]
+
+    def generation(self, label:str):
+        """Write counter for `label`; take it before reading the database and pass it to `load`."""
+        with self._lock:
+            return self._generations.get(label, 0)
+
+    def load(self, label:str, objects, generation:int=None):
+        """
+        Cache the newest objects for `label` as read from the database (newest first).
+        Skipped if `label` was written to since `generation` was taken.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generations.get(label, 0):
+                return
+            self._entries[label] = list(objects[:self.per_label])
+            self._entries.move_to_end(label)
+            while len(self._entries) > self.max_labels:
+                self._entries.popitem(last=False)
+
+    def push(self, label:str, objects):
+        """
+        Prepend freshly inserted objects (newest first) to a cached label.
+        Uncached labels are left alone; the next read loads them from the database.
+        Objects already cached are skipped: a read between the insert's commit and
+        this push can have loaded them already.
+        """
+        with self._lock:
+            self._generations[label] = self._generations.get(label, 0) + 1
+            entries = self._entries.get(label)
+            if entries is not None:
+                cached = {_key(obj) for obj in entries}
+                fresh = [obj for obj in objects if _key(obj) not in cached]
+                self._entries[label] = (fresh + entries)[:self.per_label]
+
+    def trim(self, label:str, max_entries:int):
+        """Drop cached objects beyond the `max_entries` a prune kept in the database."""
+        with self._lock:
+            entries = self._entries.get(label)
+            if entries is not None and len(entries) > max_entries:
+                self._entries[label] = entries[:max_entries]
+
+    def invalidate(self, label:str=None):
+        """Forget one label, or everything if no label is given."""
+        with self._lock:
+            labels = set(self._entries) | set(self._generations) if label is None else [label]
+            for name in labels:
+                self._generations[name] = self._generations.get(name, 0) + 1
+                self._entries.pop(name, None)
+
+    def get_stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "labels": len(self._entries),
+            }
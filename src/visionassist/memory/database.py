@@ -1,72 +1,185 @@
-import json
-from sqlalchemy import create_engine, select, delete, func
+from sqlalchemy import create_engine, event, select, insert, delete, func
 from sqlalchemy.orm import sessionmaker
-from visionassist.config import MAX_OBJECT_ENTRIES
+from visionassist.config import MAX_OBJECT_ENTRIES, RETENTION_INLINE_PRUNE, LAST_SEEN_CACHE_SIZE, SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_CACHE_SIZE_KB
+from visionassist import metrics
 from .models import Base, Detection, DetectedObject
+from .migrations import migrate
+from .cache import LastSeenCache
+
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    """Apply per-connection SQLite settings."""
+    cursor = dbapi_connection.cursor()
+    # only takes effect on a new file; RetentionWorker converts existing ones
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
 
 
 class Database:
-    def __init__(self, db_path="objects.db"):
+    def __init__(self, db_path="objects.db", cache_size=LAST_SEEN_CACHE_SIZE, prune_inline=RETENTION_INLINE_PRUNE):
+        """
+        Args:
+            cache_size: Sightings per label kept in the last-seen cache, 0 disables it
+            prune_inline: Trim to MAX_OBJECT_ENTRIES per label inside every insert;
+                leave False when a RetentionWorker runs so inserts stay cheap
+        """
         self.engine = create_engine(f"sqlite:///{db_path}", echo=False, future=True)
+        event.listen(self.engine, "connect", _configure_sqlite)
         Base.metadata.create_all(self.engine)
+        migrate(self.engine)
         self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False, future=True)
+        self.cache = LastSeenCache(per_label=cache_size) if cache_size else None
+        self.prune_inline = prune_inline
+
+    def insert_detection(self, image_path, objects, source_id=None, frame_size=None):
+        self.insert_detections([(image_path, objects)], source_id=source_id, frame_size=frame_size)
+
+    @metrics.timed("db.insert_detections")
+    def insert_detections(self, detections, source_id=None, frame_size=None):
+        """
+        Bulk insert many detections in one transaction.
+
+        Args:
+            detections: Iterable of (image_path, objects) pairs, where objects is a
+                list of detection dicts with label, confidence and bbox
+            source_id: Camera the frames came from, recorded on every detection
+            frame_size: (width, height) of the frames, so answers can say where in the view an object was
+        """
+        detections = list(detections)
+        if not detections:
+            return
+        width, height = frame_size or (None, None)
 
-    def insert_detection(self, image_path, objects):
         with self.SessionLocal() as db:
-            detection = Detection(image_path=image_path)
-            db.add(detection)
-            db.flush()
-
-            for obj in objects:
-                db.add(
-                    DetectedObject(
-                        detection_id=detection.id,
-                        object_name=obj.get("label"),
-                        confidence=obj.get("confidence"),
-                        bbox=json.dumps(obj.get("bbox", {}))
-                    )
-                )
-                # enforce at most MAX_OBJECT_ENTRIES entries per object
-                self._prune_objects(db, obj["label"], max_entries=MAX_OBJECT_ENTRIES)
+            detection_ids = db.execute(
+                insert(Detection).returning(Detection.id, sort_by_parameter_order=True),
+                [
+                    {"image_path": image_path, "source_id": source_id, "frame_width": width, "frame_height": height}
+                    for image_path, _ in detections
+                ],
+            ).scalars().all()
+
+            rows = []
+            for detection_id, (_, objects) in zip(detection_ids, detections):
+                for obj in objects:
+                    x1, y1, x2, y2 = obj.get("bbox") or (None, None, None, None)
+                    rows.append({
+                        "detection_id": detection_id,
+                        "object_name": obj.get("label"),
+                        "confidence": obj.get("confidence"),
+                        "image_path": obj.get("image_path"),
+                        "x1": x1, "y1": y1, "x2": x2, "y2": y2,
+                    })
+
+            inserted = []
+            if rows:
+                if self.cache is not None:
+                    inserted = db.scalars(
+                        insert(DetectedObject).returning(DetectedObject, sort_by_parameter_order=True),
+                        rows,
+                    ).all()
+                else:
+                    db.execute(insert(DetectedObject), rows)
+                if self.prune_inline:
+                    # enforce at most MAX_OBJECT_ENTRIES entries per object
+                    self._prune_objects(db, {row["object_name"] for row in rows}, max_entries=MAX_OBJECT_ENTRIES)
 
             db.commit()
 
-    def _prune_objects(self, db, object_name, max_entries=50):
+        metrics.inc("db.detections_inserted", len(detections))
+        metrics.inc("db.objects_inserted", len(rows))
+        if inserted:
+            self._update_cache(inserted, max_entries=MAX_OBJECT_ENTRIES)
+
+    def _update_cache(self, inserted, max_entries):
+        """Write freshly committed objects through to the last-seen cache."""
+        by_label = {}
+        for obj in reversed(inserted):
+            by_label.setdefault(obj.object_name, []).append(obj)
+
+        for label, objects in by_label.items():
+            self.cache.push(label, objects)
+            self.cache.trim(label, max_entries)
+
+    def _prune_objects(self, db, object_names, max_entries=50):
         """
-        Deletes older entries keeping only last 'max_entries' rows per object.
+        Deletes older entries keeping only last 'max_entries' rows per object,
+        for all given object names in a single statement.
         """
-        # get IDs of latest allowed items
-        stmt = (
-            select(DetectedObject.id)
-            .where(DetectedObject.object_name == object_name)
-            .order_by(DetectedObject.timestamp.desc())
-            .limit(max_entries)
+        ranked = (
+            select(
+                DetectedObject.id,
+                func.row_number().over(
+                    partition_by=DetectedObject.object_name,
+                    order_by=(DetectedObject.timestamp.desc(), DetectedObject.id.desc()),
+                ).label("rank"),
+            )
+            .where(DetectedObject.object_name.in_(list(object_names)))
+            .subquery()
         )
-        keep_ids = [row[0] for row in db.execute(stmt).all()]
 
-        # delete older ones
         del_stmt = (
             delete(DetectedObject)
-            .where(DetectedObject.object_name == object_name)
-            .where(DetectedObject.id.not_in(keep_ids))
+            .where(DetectedObject.id.in_(select(ranked.c.id).where(ranked.c.rank > max_entries)))
+            .execution_options(synchronize_session=False)
         )
         db.execute(del_stmt)
 
+    @metrics.timed("db.get_latest_objects")
     def get_latest_objects(self, object_name, limit=10):
+        if self.cache is not None:
+            cached = self.cache.get(object_name, limit)
+            if cached is not None:
+                metrics.inc("db.cache_hits")
+                return cached
+            metrics.inc("db.cache_misses")
+
+        # fill a whole cache entry so follow-up queries for this label are served from memory
+        fetch = max(limit, self.cache.per_label) if self.cache is not None else limit
+        generation = self.cache.generation(object_name) if self.cache is not None else None
+
         with self.SessionLocal() as db:
             stmt = (
                 select(DetectedObject)
                 .where(DetectedObject.object_name == object_name)
-                .order_by(DetectedObject.timestamp.desc())
-                .limit(limit)
+                .order_by(DetectedObject.timestamp.desc(), DetectedObject.id.desc())
+                .limit(fetch)
+            )
+            objects = db.execute(stmt).scalars().all()
+
+        if self.cache is not None and fetch == self.cache.per_label:
+            self.cache.load(object_name, objects, generation)
+
+        return objects[:limit]
+
+    @metrics.timed("db.get_objects_in_region")
+    def get_objects_in_region(self, x1, y1, x2, y2, object_name=None, limit=10):
+        """
+        Latest objects whose bounding box overlaps the (x1, y1, x2, y2) region,
+        optionally restricted to one label.
+        """
+        with self.SessionLocal() as db:
+            stmt = (
+                select(DetectedObject)
+                .where(DetectedObject.x1 < x2, DetectedObject.x2 > x1)
+                .where(DetectedObject.y1 < y2, DetectedObject.y2 > y1)
             )
+            if object_name is not None:
+                stmt = stmt.where(DetectedObject.object_name == object_name)
+            stmt = stmt.order_by(DetectedObject.timestamp.desc(), DetectedObject.id.desc()).limit(limit)
             return db.execute(stmt).scalars().all()
 
+    @metrics.timed("db.get_all_detections")
     def get_all_detections(self):
         with self.SessionLocal() as db:
             stmt = select(Detection).order_by(Detection.timestamp.desc())
             return db.execute(stmt).scalars().all()
 
+    @metrics.timed("db.get_detected_object_count")
     def get_detected_object_count(self):
         with self.SessionLocal() as db:
             stmt = func.count(DetectedObject.id)
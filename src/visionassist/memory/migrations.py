@@ -0,0 +1,98 @@
+from sqlalchemy import text
+from visionassist.logger import logger
+from .models import Base
+
+
+def _add_indexes(conn):
+    """Add indexes for per-label lookups and the detection foreign key."""
+    for table in Base.metadata.sorted_tables:
+        columns = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table.name})"))}
+        for index in table.indexes:
+            # indexes on columns added by a later migration are created by that migration
+            if all(column.name in columns for column in index.columns):
+                index.create(conn, checkfirst=True)
+
+
+def _split_bbox(conn):
+    """Move JSON text bboxes into the x1/y1/x2/y2 integer columns."""
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(detection_objects)"))}
+    if "bbox" not in columns:
+        return
+
+    for column in ("x1", "y1", "x2", "y2"):
+        if column not in columns:
+            conn.execute(text(f"ALTER TABLE detection_objects ADD COLUMN {column} INTEGER"))
+
+    conn.execute(text("""
+        UPDATE detection_objects SET
+            x1 = json_extract(bbox, '$[0]'),
+            y1 = json_extract(bbox, '$[1]'),
+            x2 = json_extract(bbox, '$[2]'),
+            y2 = json_extract(bbox, '$[3]')
+        WHERE json_valid(bbox) AND json_type(bbox) = 'array'
+    """))
+    conn.execute(text("ALTER TABLE detection_objects DROP COLUMN bbox"))
+
+
+def _add_object_timestamp_index(conn):
+    """Index sightings by time for label-independent time window queries."""
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_detection_objects_timestamp ON detection_objects (timestamp)"))
+
+
+def _add_object_image_path(conn):
+    """Keep per-object crop paths so retention can delete the files."""
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(detection_objects)"))}
+    if "image_path" not in columns:
+        conn.execute(text("ALTER TABLE detection_objects ADD COLUMN image_path VARCHAR"))
+
+
+def _add_detection_source_id(conn):
+    """Record which camera each detection came from."""
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(detections)"))}
+    if "source_id" not in columns:
+        conn.execute(text("ALTER TABLE detections ADD COLUMN source_id VARCHAR"))
+
+
+def _add_image_path_indexes(conn):
+    """Index image paths so retention can tell whether a shared image is still referenced."""
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_detections_image_path ON detections (image_path)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_detection_objects_image_path ON detection_objects (image_path) WHERE image_path IS NOT NULL"))
+
+
+def _add_detection_frame_size(conn):
+    """Record the frame size so a box can be described as left/right/top/bottom."""
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(detections)"))}
+    for column in ("frame_width", "frame_height"):
+        if column not in columns:
+            conn.execute(text(f"ALTER TABLE detections ADD COLUMN {column} INTEGER"))
+
+
+# Ordered schema migrations; the position in this list is the schema version it upgrades to.
+MIGRATIONS = [
+    _add_indexes,
+    _split_bbox,
+    _add_object_timestamp_index,
+    _add_object_image_path,
+    _add_detection_source_id,
+    _add_image_path_indexes,
+    _add_detection_frame_size,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn):
+    return conn.execute(text("PRAGMA user_version")).scalar()
+
+
+def migrate(engine):
+    """
+    Bring an existing database up to SCHEMA_VERSION.
+    The applied version is tracked in SQLite's `user_version` pragma.
+    """
+    with engine.begin() as conn:
+        version = get_schema_version(conn)
+        for target, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            logger.info(f"Migrating memory database to schema v{target}: {migration.__name__}")
+            migration(conn)
+            conn.execute(text(f"PRAGMA user_version = {target}"))
@@ -1,6 +1,7 @@
 from sqlalchemy import (
-    Column, Integer, String, Float, DateTime, ForeignKey, Text, func
+    Column, Integer, String, Float, DateTime, ForeignKey, Index, func, tuple_
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -10,6 +11,9 @@ class Detection(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     image_path = Column(String, nullable=False)
+    source_id = Column(String, nullable=True)  # camera the frame came from, None for a single camera
+    frame_width = Column(Integer, nullable=True)  # pixel size of the frame the boxes refer to
+    frame_height = Column(Integer, nullable=True)
     timestamp = Column(DateTime, server_default=func.now())
 
     objects = relationship("DetectedObject", back_populates="detection", cascade="all, delete")
@@ -19,12 +23,47 @@ class DetectedObject(Base):
     __tablename__ = "detection_objects"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    detection_id = Column(Integer, ForeignKey("detections.id"), nullable=False)
+    detection_id = Column(Integer, ForeignKey("detections.id", ondelete="CASCADE"), nullable=False)
 
     object_name = Column(String, nullable=False)
     confidence = Column(Float, nullable=True)
-    bbox = Column(Text, nullable=True)
+    image_path = Column(String, nullable=True)  # own crop, when images are saved per object
+
+    # bounding box corners in pixels, stored as plain integers so they can be queried
+    x1 = Column(Integer, nullable=True)
+    y1 = Column(Integer, nullable=True)
+    x2 = Column(Integer, nullable=True)
+    y2 = Column(Integer, nullable=True)
 
     timestamp = Column(DateTime, server_default=func.now())
 
     detection = relationship("Detection", back_populates="objects")
+
+    @hybrid_property
+    def bbox(self):
+        """Bounding box as an (x1, y1, x2, y2) tuple, or None if not recorded."""
+        if self.x1 is None:
+            return None
+        return (self.x1, self.y1, self.x2, self.y2)
+
+    @bbox.inplace.setter
+    def _bbox_setter(self, value):
+        self.x1, self.y1, self.x2, self.y2 = value if value else (None, None, None, None)
+
+    @bbox.inplace.expression
+    @classmethod
+    def _bbox_expression(cls):
+        return tuple_(cls.x1, cls.y1, cls.x2, cls.y2)
+
+
+# SQLite appends the rowid to every index entry, so scanning these backwards
+# serves "ORDER BY timestamp DESC, id DESC" per label without a sort step.
+Index("ix_detections_timestamp", Detection.timestamp)
+Index("ix_detection_objects_name_timestamp", DetectedObject.object_name, DetectedObject.timestamp)
+Index("ix_detection_objects_detection_id", DetectedObject.detection_id)
+Index("ix_detection_objects_timestamp", DetectedObject.timestamp)
+
+# Deduplicated images are shared by several rows; retention looks paths up
+# before deleting a file. Most objects have no crop, so that index is partial.
+Index("ix_detections_image_path", Detection.image_path)
+Index("ix_detection_objects_image_path", DetectedObject.image_path, sqlite_where=DetectedObject.image_path.is_not(None))
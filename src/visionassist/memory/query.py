@@ -0,0 +1,391 @@
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import String, func, select, tuple_, type_coerce
+from sqlalchemy.orm import aliased
+from visionassist.config import (
+    ALLOWED_LABELS, LABEL_SYNONYMS, QUERY_PAGE_SIZE, QUERY_COOCCURRENCE_FRAMES, SPEECH_LAST_SEEN, SPEECH_NOT_SEEN
+)
+from .models import Detection, DetectedObject
+
+LAST_SEEN = "last_seen"
+TIME_WINDOW = "time_window"
+NEAR = "near"
+UNKNOWN = "unknown"
+
+# timestamps are compared as stored text so SQLite can range-scan the timestamp indexes
+_TIMESTAMP = type_coerce(DetectedObject.timestamp, String)
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_NEAR = re.compile(r"\b(near|next to|beside|besides|close to|around|together with)\b")
+_LAST_N = re.compile(r"\b(?:last|past|previous)\s+(\d+|an?|one|two|three|four|five|six|seven|eight|nine|ten|few)?\s*(minute|hour|day)s?\b")
+_NUMBER_WORDS = {
+    None: 1, "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "few": 3,
+}
+
+
+def utcnow():
+    """Current time in the naive UTC form SQLite's CURRENT_TIMESTAMP stores."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass
+class Sighting:
+    label: str
+    confidence: float
+    bbox: tuple
+    timestamp: datetime
+    image_path: str
+    object_id: int
+    detection_id: int
+    source_id: str = None
+    frame_size: tuple = None  # (width, height) the bbox refers to, None if not recorded
+
+
+@dataclass
+class Cooccurrence:
+    label: str
+    frames: int  # how many of the anchor object's frames it appeared in
+    last_seen: datetime
+
+
+@dataclass
+class ParsedQuery:
+    intent: str
+    labels: list
+    since: datetime = None
+    until: datetime = None
+
+
+@dataclass
+class QueryResult:
+    intent: str
+    labels: list
+    sightings: list = field(default_factory=list)
+    related: list = field(default_factory=list)
+    cursor: tuple = None  # pass back to `QueryEngine.seen_between` for the next page
+
+    def to_speech(self, now:datetime=None):
+        """Short sentence answering the query, ready for TTS."""
+        now = now or utcnow()
+        if self.intent == UNKNOWN or (not self.labels and self.intent != TIME_WINDOW):
+            return "Sorry, I did not catch which object you are looking for."
+
+        if self.intent == LAST_SEEN:
+            latest = {s.label: s for s in self.sightings}
+            sentences = []
+            for label in self.labels:
+                if label in latest:
+                    sentences.append(SPEECH_LAST_SEEN.format(label=label, ago=time_ago(latest[label].timestamp, now)))
+                    location = describe_location(latest[label])
+                    if location:
+                        sentences.append(f"It was {location}.")
+                else:
+                    sentences.append(SPEECH_NOT_SEEN.format(label=label))
+            return " ".join(sentences)
+
+        if self.intent == NEAR:
+            anchor = join_words(self.labels, "or")
+            if not self.related:
+                return f"I have not seen anything next to your {anchor}."
+            return f"Next to your {anchor} I saw {join_words([f'your {r.label}' for r in self.related])}."
+
+        if not self.sightings:
+            return f"I did not see your {join_words(self.labels, 'or')} in that time." if self.labels else "I did not see anything in that time."
+        latest = {}
+        for sighting in self.sightings:
+            latest.setdefault(sighting.label, sighting)
+        seen = [f"your {label} {time_ago(s.timestamp, now)}" for label, s in latest.items()]
+        more = " There is more." if self.cursor else ""
+        return f"I saw {join_words(seen)}.{more}"
+
+
+def join_words(words, conjunction:str="and"):
+    words = list(words)
+    if len(words) <= 1:
+        return "".join(words)
+    return f"{', '.join(words[:-1])} {conjunction} {words[-1]}"
+
+
+def frame_region(bbox, frame_size):
+    """Coarse position of a box's center in the frame, e.g. 'on the left' or 'in the top right'."""
+    x1, y1, x2, y2 = bbox
+    width, height = frame_size
+    column = min(2, int(3 * (x1 + x2) / 2 / width))
+    row = min(2, int(3 * (y1 + y2) / 2 / height))
+    horizontal = ("left", "", "right")[column]
+    vertical = ("top", "", "bottom")[row]
+    if vertical and horizontal:
+        return f"in the {vertical} {horizontal}"
+    if horizontal:
+        return f"on the {horizontal}"
+    if vertical:
+        return f"at the {vertical}"
+    return "in the middle"
+
+
+def describe_location(sighting:Sighting):
+    """
+    Where a sighting was, e.g. 'on the left of camera kitchen', or None if
+    neither the camera nor the frame size is known.
+    """
+    region = frame_region(sighting.bbox, sighting.frame_size) if sighting.bbox and sighting.frame_size else None
+    if region and sighting.source_id:
+        return f"{region} of camera {sighting.source_id}"
+    if region:
+        return f"{region} of the camera view"
+    if sighting.source_id:
+        return f"seen by camera {sighting.source_id}"
+    return None
+
+
+def time_ago(timestamp:datetime, now:datetime=None):
+    """Spoken relative time, e.g. '5 minutes ago'."""
+    seconds = max(0, ((now or utcnow()) - timestamp).total_seconds())
+    if seconds < 60:
+        return "just now"
+    for unit, size in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= size:
+            count = int(seconds // size)
+            return f"{count} {unit}{'s' if count != 1 else ''} ago"
+
+
+def _label_pattern(labels, synonyms):
+    phrases = {}
+    for label in labels:
+        phrases[label] = [label]
+    for word, targets in synonyms.items():
+        phrases.setdefault(word, list(targets))
+    for phrase, targets in list(phrases.items()):
+        phrases.setdefault(phrase + ("es" if phrase.endswith(("s", "sh", "ch")) else "s"), targets)
+    # longest first so "cell phone" wins over "phone"
+    alternation = "|".join(re.escape(p) for p in sorted(phrases, key=len, reverse=True))
+    return re.compile(rf"\b({alternation})\b"), phrases
+
+
+_DEFAULT_PATTERN = _label_pattern(ALLOWED_LABELS, LABEL_SYNONYMS)
+
+
+def resolve_labels(text:str, labels=None, synonyms=None):
+    """
+    Map words in a transcribed request to detector labels.
+
+    Args:
+        text: Transcription, e.g. "where is my phone"
+        labels: Known labels (default: ALLOWED_LABELS)
+        synonyms: Spoken word -> list of labels (default: LABEL_SYNONYMS)
+
+    Returns:
+        list: Matching labels in the order they were mentioned
+    """
+    if labels is None and synonyms is None:
+        pattern, phrases = _DEFAULT_PATTERN
+    else:
+        pattern, phrases = _label_pattern(labels if labels is not None else ALLOWED_LABELS, synonyms if synonyms is not None else LABEL_SYNONYMS)
+
+    found = []
+    for match in pattern.finditer(text.lower()):
+        for label in phrases[match.group(1)]:
+            if label not in found:
+                found.append(label)
+    return found
+
+
+def parse_query(text:str, now:datetime=None):
+    """
+    Work out what a transcribed request asks for.
+
+    Args:
+        text: Transcription of the request
+        now: Naive UTC "now" (default: current time)
+
+    Returns:
+        ParsedQuery: intent, labels and optional [since, until) window in naive UTC
+    """
+    now = now or utcnow()
+    lowered = re.sub(r"[^\w\s]", " ", text.lower())
+    labels = resolve_labels(lowered)
+    since = until = None
+
+    # "today" and "yesterday" follow the local calendar day
+    offset = datetime.now().astimezone().utcoffset()
+    midnight = (now + offset).replace(hour=0, minute=0, second=0, microsecond=0) - offset
+
+    last_n = _LAST_N.search(lowered)
+    if last_n:
+        amount = last_n.group(1)
+        count = int(amount) if amount and amount.isdigit() else _NUMBER_WORDS[amount]
+        since = now - timedelta(**{f"{last_n.group(2)}s": count})
+    elif re.search(r"\byesterday\b", lowered):
+        since, until = midnight - timedelta(days=1), midnight
+    elif re.search(r"\btoday\b", lowered):
+        since = midnight
+
+    if labels and _NEAR.search(lowered):
+        intent = NEAR
+    elif since is not None:
+        intent = TIME_WINDOW
+    elif labels:
+        intent = LAST_SEEN
+    else:
+        intent = UNKNOWN
+
+    return ParsedQuery(intent=intent, labels=labels, since=since, until=until)
+
+
+def _stored(timestamp:datetime):
+    return timestamp.strftime(_TIMESTAMP_FORMAT)
+
+
+class QueryEngine:
+    """
+    Answers "where did I leave X" style questions from the memory database.
+
+    Every query is a bounded, indexed SQL statement: per-label lookups walk
+    ix_detection_objects_name_timestamp, time windows page through it (or
+    ix_detection_objects_timestamp when no label is given) with a keyset
+    cursor, and co-occurrence joins a handful of recent frames through
+    ix_detection_objects_detection_id.
+    """
+
+    def __init__(self, database, page_size:int=QUERY_PAGE_SIZE, cooccurrence_frames:int=QUERY_COOCCURRENCE_FRAMES):
+        self.database = database
+        self.page_size = page_size
+        self.cooccurrence_frames = cooccurrence_frames
+
+    def ask(self, text:str, now:datetime=None, cursor:tuple=None):
+        """Parse a transcribed request and answer it."""
+        parsed = parse_query(text, now=now)
+
+        if parsed.intent == LAST_SEEN:
+            return QueryResult(LAST_SEEN, parsed.labels, sightings=self.last_seen(parsed.labels))
+
+        if parsed.intent == NEAR:
+            return QueryResult(
+                NEAR, parsed.labels,
+                sightings=self.last_seen(parsed.labels),
+                related=self.co_occurring(parsed.labels, since=parsed.since),
+            )
+
+        if parsed.intent == TIME_WINDOW:
+            sightings, next_cursor = self.seen_between(parsed.labels, since=parsed.since, until=parsed.until, cursor=cursor)
+            return QueryResult(TIME_WINDOW, parsed.labels, sightings=sightings, cursor=next_cursor)
+
+        return QueryResult(UNKNOWN, parsed.labels)
+
+    def _sightings(self):
+        return select(
+            DetectedObject.id, DetectedObject.detection_id, DetectedObject.object_name, DetectedObject.confidence,
+            DetectedObject.x1, DetectedObject.y1, DetectedObject.x2, DetectedObject.y2,
+            DetectedObject.timestamp,
+            func.coalesce(DetectedObject.image_path, Detection.image_path).label("image_path"),
+            Detection.source_id, Detection.frame_width, Detection.frame_height,
+        ).join(Detection, Detection.id == DetectedObject.detection_id)
+
+    @staticmethod
+    def _to_sighting(row):
+        return Sighting(
+            label=row.object_name,
+            confidence=row.confidence,
+            bbox=(row.x1, row.y1, row.x2, row.y2) if row.x1 is not None else None,
+            timestamp=row.timestamp,
+            image_path=row.image_path,
+            object_id=row.id,
+            detection_id=row.detection_id,
+            source_id=row.source_id,
+            frame_size=(row.frame_width, row.frame_height) if row.frame_width else None,
+        )
+
+    def last_seen(self, labels, limit:int=1):
+        """
+        Latest sightings of each label, one indexed lookup per label.
+
+        Returns:
+            list[Sighting]: Up to `limit` sightings per label, newest first within a label
+        """
+        sightings = []
+        with self.database.SessionLocal() as db:
+            for label in labels:
+                stmt = (
+                    self._sightings()
+                    .where(DetectedObject.object_name == label)
+                    .order_by(DetectedObject.timestamp.desc(), DetectedObject.id.desc())
+                    .limit(limit)
+                )
+                sightings.extend(self._to_sighting(row) for row in db.execute(stmt))
+        return sightings
+
+    def seen_between(self, labels=None, since:datetime=None, until:datetime=None, cursor:tuple=None, limit:int=None):
+        """
+        Sightings inside a time window, newest first, one page at a time.
+
+        Args:
+            labels: Labels to include (default: all)
+            since, until: Naive UTC bounds of the window, `until` exclusive
+            cursor: Cursor returned with the previous page
+            limit: Page size (default: the engine's page_size)
+
+        Returns:
+            tuple: (list[Sighting], next cursor or None when this was the last page)
+        """
+        limit = limit or self.page_size
+        stmt = self._sightings().add_columns(_TIMESTAMP.label("stored_timestamp"))
+        if labels:
+            stmt = stmt.where(DetectedObject.object_name.in_(list(labels)))
+        if since is not None:
+            stmt = stmt.where(_TIMESTAMP >= _stored(since))
+        if until is not None:
+            stmt = stmt.where(_TIMESTAMP < _stored(until))
+        if cursor is not None:
+            stmt = stmt.where(tuple_(_TIMESTAMP, DetectedObject.id) < tuple_(*cursor))
+        stmt = stmt.order_by(DetectedObject.timestamp.desc(), DetectedObject.id.desc()).limit(limit + 1)
+
+        with self.database.SessionLocal() as db:
+            rows = db.execute(stmt).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1].stored_timestamp, rows[-1].id)
+        return [self._to_sighting(row) for row in rows], next_cursor
+
+    def co_occurring(self, labels, since:datetime=None, frames:int=None, limit:int=None):
+        """
+        Other objects seen in the same frames as the latest sightings of `labels`.
+
+        Args:
+            labels: Anchor labels, e.g. ["laptop"]
+            since: Only consider anchor frames after this naive UTC time
+            frames: How many recent anchor frames to search (default: cooccurrence_frames)
+            limit: Max labels returned (default: the engine's page_size)
+
+        Returns:
+            list[Cooccurrence]: Most frequent companions first
+        """
+        frames = frames or self.cooccurrence_frames
+        limit = limit or self.page_size
+        labels = list(labels)
+
+        anchor = (
+            select(DetectedObject.detection_id)
+            .where(DetectedObject.object_name.in_(labels))
+        )
+        if since is not None:
+            anchor = anchor.where(_TIMESTAMP >= _stored(since))
+        anchor = anchor.order_by(DetectedObject.timestamp.desc(), DetectedObject.id.desc()).limit(frames)
+
+        other = aliased(DetectedObject)
+        seen_in = func.count(func.distinct(other.detection_id)).label("frames")
+        last_seen = func.max(other.timestamp).label("last_seen")
+        stmt = (
+            select(other.object_name, seen_in, last_seen)
+            .where(other.detection_id.in_(anchor.scalar_subquery()))
+            .where(other.object_name.not_in(labels))
+            .group_by(other.object_name)
+            .order_by(seen_in.desc(), last_seen.desc())
+            .limit(limit)
+        )
+
+        with self.database.SessionLocal() as db:
+            return [Cooccurrence(label=row.object_name, frames=row.frames, last_seen=row.last_seen) for row in db.execute(stmt)]
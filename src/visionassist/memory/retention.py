@@ -0,0 +1,296 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from sqlalchemy import delete, exists, select, text, union
+from visionassist.config import (
+    IMAGE_DIR, MAX_OBJECT_ENTRIES, RETENTION_MAX_AGE_DAYS, RETENTION_POLICIES, RETENTION_DISK_BUDGET_MB,
+    RETENTION_INTERVAL_S, RETENTION_BATCH_SIZE, RETENTION_ORPHAN_GRACE_S, RETENTION_VACUUM_PAGES
+)
+from visionassist.logger import logger
+from .models import Detection, DetectedObject
+from .query import utcnow
+
+
+@dataclass
+class RetentionPolicy:
+    max_entries: int = MAX_OBJECT_ENTRIES  # newest sightings kept per label, None for no limit
+    max_age_days: float = RETENTION_MAX_AGE_DAYS  # None keeps sightings regardless of age
+
+
+class RetentionWorker:
+    """
+    Enforces retention on the memory database and image directory in the background.
+
+    Each pass trims every label to its policy, deletes detections left without
+    objects, deletes the oldest detections while the images they refer to exceed
+    the disk budget, removes image files nothing refers to, and hands free pages back
+    to the file system with an incremental VACUUM. Deletes run in short
+    batches so inserts from the camera are never blocked for long, and image
+    files are only removed after the rows referring to them are committed.
+    """
+
+    def __init__(
+        self,
+        database,
+        policies:dict=None,
+        default_policy:RetentionPolicy=None,
+        image_dir:str=IMAGE_DIR,
+        disk_budget_mb:float=RETENTION_DISK_BUDGET_MB,
+        interval_s:float=RETENTION_INTERVAL_S,
+        batch_size:int=RETENTION_BATCH_SIZE,
+        orphan_grace_s:float=RETENTION_ORPHAN_GRACE_S,
+        vacuum_pages:int=RETENTION_VACUUM_PAGES,
+    ):
+        """
+        Args:
+            database: The `Database` to enforce retention on
+            policies: Label -> RetentionPolicy (or dict of its fields), default: RETENTION_POLICIES
+            default_policy: Policy for labels without an entry in `policies`
+            disk_budget_mb: Max total size of the images in `image_dir` that rows refer to,
+                None for no budget; files no row refers to are left to the orphan sweep
+        """
+        self.database = database
+        self.default_policy = default_policy or RetentionPolicy()
+        self.policies = {
+            label: policy if isinstance(policy, RetentionPolicy) else RetentionPolicy(**policy)
+            for label, policy in (RETENTION_POLICIES if policies is None else policies).items()
+        }
+        self.image_dir = image_dir
+        self.disk_budget_bytes = disk_budget_mb * 1024 * 1024 if disk_budget_mb is not None else None
+        self.interval_s = interval_s
+        self.batch_size = batch_size
+        self.orphan_grace_s = orphan_grace_s
+        self.vacuum_pages = vacuum_pages
+
+        self.runs = 0
+        self.totals = {"objects": 0, "detections": 0, "images": 0, "bytes_freed": 0}
+        self._incremental_vacuum = False
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def policy_for(self, label:str):
+        return self.policies.get(label, self.default_policy)
+
+    def run_once(self, now=None):
+        """
+        Run one retention pass.
+
+        Args:
+            now: Naive UTC time the age limits are measured from (default: now)
+
+        Returns:
+            dict: Objects, detections and image files deleted, and bytes freed
+        """
+        now = now or utcnow()
+        stats = {"objects": 0, "detections": 0, "images": 0, "bytes_freed": 0}
+
+        with self.database.SessionLocal() as db:
+            labels = db.execute(select(DetectedObject.object_name).distinct()).scalars().all()
+
+        for label in labels:
+            policy = self.policy_for(label)
+            if policy.max_age_days is not None:
+                cutoff = now - timedelta(days=policy.max_age_days)
+                self._delete_objects(
+                    select(DetectedObject.id)
+                    .where(DetectedObject.object_name == label, DetectedObject.timestamp < cutoff),
+                    stats,
+                )
+            if policy.max_entries is not None:
+                # past the newest max_entries; re-evaluated after every batch
+                self._delete_objects(
+                    select(DetectedObject.id)
+                    .where(DetectedObject.object_name == label)
+                    .order_by(DetectedObject.timestamp.desc(), DetectedObject.id.desc())
+                    .offset(policy.max_entries),
+                    stats,
+                )
+
+        self._delete_detections(
+            select(Detection.id).where(~exists().where(DetectedObject.detection_id == Detection.id)),
+            stats,
+        )
+        self._enforce_disk_budget(stats)
+        self._sweep_orphan_files(stats)
+        self._vacuum()
+
+        if stats["objects"] and self.database.cache is not None:
+            self.database.cache.invalidate()
+
+        self.runs += 1
+        for key, value in stats.items():
+            self.totals[key] += value
+        if stats["objects"] or stats["detections"] or stats["images"]:
+            logger.info(f"Retention removed {stats['objects']} objects, {stats['detections']} detections, {stats['images']} images")
+        return stats
+
+    def _delete_objects(self, id_select, stats):
+        while True:
+            with self.database.SessionLocal() as db:
+                paths = db.execute(
+                    delete(DetectedObject)
+                    .where(DetectedObject.id.in_(id_select.limit(self.batch_size)))
+                    .returning(DetectedObject.image_path)
+                    .execution_options(synchronize_session=False)
+                ).scalars().all()
+                unreferenced = self._unreferenced(db, paths)
+                db.commit()
+            stats["objects"] += len(paths)
+            self._remove_files(unreferenced, stats)
+            if len(paths) < self.batch_size:
+                return
+
+    def _delete_detections(self, id_select, stats, limit:int=None):
+        """Delete detections (their objects cascade) and their images, in batches."""
+        remaining = limit
+        while remaining is None or remaining > 0:
+            batch = self.batch_size if remaining is None else min(self.batch_size, remaining)
+            with self.database.SessionLocal() as db:
+                ids = db.execute(id_select.limit(batch)).scalars().all()
+                if not ids:
+                    return
+                crop_paths = db.execute(
+                    select(DetectedObject.image_path)
+                    .where(DetectedObject.detection_id.in_(ids), DetectedObject.image_path.is_not(None))
+                ).scalars().all()
+                # explicit, since databases created before the cascade was declared lack ON DELETE CASCADE
+                stats["objects"] += db.execute(
+                    delete(DetectedObject)
+                    .where(DetectedObject.detection_id.in_(ids))
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                paths = db.execute(
+                    delete(Detection)
+                    .where(Detection.id.in_(ids))
+                    .returning(Detection.image_path)
+                    .execution_options(synchronize_session=False)
+                ).scalars().all()
+                unreferenced = self._unreferenced(db, list(paths) + list(crop_paths))
+                db.commit()
+            stats["detections"] += len(paths)
+            self._remove_files(unreferenced, stats)
+            if remaining is not None:
+                remaining -= len(ids)
+            if len(ids) < batch:
+                return
+
+    def _unreferenced(self, db, paths):
+        """The deleted rows' image paths that no remaining row shares (deduplicated images are shared)."""
+        paths = {path for path in paths if path}
+        if not paths:
+            return []
+        referenced = set(db.execute(union(
+            select(Detection.image_path).where(Detection.image_path.in_(paths)),
+            select(DetectedObject.image_path).where(DetectedObject.image_path.in_(paths)),
+        )).scalars())
+        return sorted(paths - referenced)
+
+    def _enforce_disk_budget(self, stats):
+        if self.disk_budget_bytes is None:
+            return
+        # only referenced files count: deleting rows can never free a stray file or one still being
+        # persisted, and counting them would delete every detection trying to
+        used = self._referenced_bytes()
+        while used > self.disk_budget_bytes:
+            freed = stats["bytes_freed"]
+            deleted = stats["detections"]
+            self._delete_detections(
+                select(Detection.id).order_by(Detection.timestamp, Detection.id),
+                stats,
+                limit=self.batch_size,
+            )
+            if stats["detections"] == deleted:
+                return
+            used -= stats["bytes_freed"] - freed
+
+    def _referenced_paths(self):
+        """Absolute paths of every image a detection or object refers to."""
+        with self.database.SessionLocal() as db:
+            return {
+                os.path.abspath(path)
+                for path in db.execute(union(
+                    select(Detection.image_path),
+                    select(DetectedObject.image_path).where(DetectedObject.image_path.is_not(None)),
+                )).scalars()
+            }
+
+    def _sweep_orphan_files(self, stats):
+        """Delete old image files no detection or object refers to, e.g. after a failed insert."""
+        if not os.path.isdir(self.image_dir):
+            return
+        referenced = self._referenced_paths()
+
+        cutoff = time.time() - self.orphan_grace_s
+        orphans = []
+        with os.scandir(self.image_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and os.path.abspath(entry.path) not in referenced and entry.stat().st_mtime < cutoff:
+                    orphans.append(entry.path)
+        self._remove_files(orphans, stats)
+
+    def _remove_files(self, paths, stats):
+        for path in paths:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Failed to delete image {path}: {e}")
+                continue
+            stats["images"] += 1
+            stats["bytes_freed"] += size
+
+    def _referenced_bytes(self):
+        """Total size of the files in `image_dir` that a detection or object refers to."""
+        if not os.path.isdir(self.image_dir):
+            return 0
+        referenced = self._referenced_paths()
+        with os.scandir(self.image_dir) as entries:
+            return sum(
+                entry.stat().st_size for entry in entries
+                if entry.is_file() and os.path.abspath(entry.path) in referenced
+            )
+
+    def _vacuum(self):
+        """Return free pages to the file system, switching the file to incremental auto-vacuum once."""
+        with self.database.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if not self._incremental_vacuum:
+                # 2 = INCREMENTAL; changing the mode of an existing file needs one full VACUUM
+                if conn.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+                    conn.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+                    conn.execute(text("VACUUM"))
+                self._incremental_vacuum = True
+            if conn.execute(text("PRAGMA freelist_count")).scalar():
+                # the pragma frees one page per step and the driver only steps once;
+                # executescript runs it to completion
+                conn.connection.dbapi_connection.executescript(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)});")
+
+    def get_stats(self):
+        return {"runs": self.runs, **self.totals}
+
+    def start(self):
+        """Run retention every `interval_s` in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="retention", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        # the first pass always runs, even if stop() comes right after start()
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Retention pass failed: {e}")
+            if self._stop_event.wait(self.interval_s):
+                return
+
+    def stop(self, timeout:float=None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
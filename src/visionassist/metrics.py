@@ -0,0 +1,310 @@
+import bisect
+import functools
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from visionassist.config import METRICS_ENABLED, METRICS_PORT, METRICS_RESERVOIR_SIZE, METRICS_LATENCY_BUCKETS_MS
+from visionassist.logger import logger
+
+PREFIX = "visionassist"
+
+
+class Counter:
+    def __init__(self, name:str):
+        self.name = name
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount:float=1):
+        with self._lock:
+            self.value += amount
+
+    def drain(self):
+        """Value counted since the last drain; resets the counter."""
+        with self._lock:
+            value, self.value = self.value, 0
+        return value
+
+
+class Histogram:
+    """
+    Cumulative bucket counts for Prometheus plus a reservoir of the most
+    recent samples for p50/p90/p99.
+    """
+
+    def __init__(self, name:str, buckets=METRICS_LATENCY_BUCKETS_MS, reservoir_size:int=METRICS_RESERVOIR_SIZE):
+        self.name = name
+        self.buckets = list(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._recent = deque(maxlen=reservoir_size)
+        self._lock = threading.Lock()
+
+    def observe(self, value:float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.bucket_counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+            self._recent.append(value)
+
+    def drain(self):
+        """Raw state recorded since the last drain, for `merge` in another process; resets the histogram."""
+        with self._lock:
+            state = {
+                "bucket_counts": self.bucket_counts,
+                "count": self.count,
+                "sum": self.sum,
+                "max": self.max,
+                "recent": list(self._recent),
+            }
+            self.bucket_counts = [0] * (len(self.buckets) + 1)
+            self.count, self.sum, self.max = 0, 0.0, 0.0
+            self._recent.clear()
+        return state
+
+    def merge(self, state:dict):
+        """Add the samples of a `drain` result, recorded with the same buckets."""
+        with self._lock:
+            self.bucket_counts = [a + b for a, b in zip(self.bucket_counts, state["bucket_counts"])]
+            self.count += state["count"]
+            self.sum += state["sum"]
+            self.max = max(self.max, state["max"])
+            self._recent.extend(state["recent"])
+
+    def snapshot(self):
+        with self._lock:
+            recent = sorted(self._recent)
+            count, total, maximum = self.count, self.sum, self.max
+        return {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "p50": _quantile(recent, 0.50),
+            "p90": _quantile(recent, 0.90),
+            "p99": _quantile(recent, 0.99),
+            "max": maximum,
+        }
+
+
+def _quantile(sorted_values, q:float):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class _Span:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe((time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters, histograms and span timers.
+
+    While disabled every call returns right after checking `enabled`, so the
+    instrumentation can stay in hot paths. Span durations are recorded in ms
+    under the span name, e.g. "yolo.detect".
+    """
+
+    def __init__(self, enabled:bool=METRICS_ENABLED):
+        self.enabled = enabled
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name:str):
+        counter = self.counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self.counters.setdefault(name, Counter(name))
+        return counter
+
+    def histogram(self, name:str):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram(name))
+        return histogram
+
+    def inc(self, name:str, amount:float=1):
+        if self.enabled:
+            self.counter(name).inc(amount)
+
+    def observe(self, name:str, value:float):
+        if self.enabled:
+            self.histogram(name).observe(value)
+
+    def span(self, name:str):
+        """Context manager timing its block into the `name` histogram."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self.histogram(name))
+
+    def timed(self, name:str):
+        """Decorator timing every call of the function as span `name`."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Span(self.histogram(name)):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def drain(self):
+        """
+        Everything recorded since the last drain, as plain picklable data, and
+        reset. Worker processes send this to the parent, which `merge`s it into
+        the registry it serves.
+        """
+        with self._lock:
+            counters = list(self.counters.values())
+            histograms = list(self.histograms.values())
+        drained = {"counters": {}, "histograms": {}}
+        for counter in counters:
+            value = counter.drain()
+            if value:
+                drained["counters"][counter.name] = value
+        for histogram in histograms:
+            state = histogram.drain()
+            if state["count"]:
+                drained["histograms"][histogram.name] = state
+        return drained
+
+    def merge(self, drained:dict):
+        """Add the metrics another process `drain`ed to this registry."""
+        for name, value in drained["counters"].items():
+            self.counter(name).inc(value)
+        for name, state in drained["histograms"].items():
+            self.histogram(name).merge(state)
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {"counters": {name: value}, "spans": {name: {count, sum, mean, p50, p90, p99, max}}}
+        """
+        return {
+            "counters": {name: counter.value for name, counter in sorted(self.counters.items())},
+            "spans": {name: histogram.snapshot() for name, histogram in sorted(self.histograms.items())},
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for name, counter in sorted(self.counters.items()):
+            metric = f"{PREFIX}_{_metric_name(name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {counter.value}")
+
+        metric = f"{PREFIX}_span_duration_ms"
+        if self.histograms:
+            lines.append(f"# HELP {metric} Duration of instrumented stages in milliseconds.")
+            lines.append(f"# TYPE {metric} histogram")
+        for name, histogram in sorted(self.histograms.items()):
+            with histogram._lock:
+                counts = list(histogram.bucket_counts)
+                count, total = histogram.count, histogram.sum
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets + ["+Inf"], counts):
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{span="{name}"}} {total}')
+            lines.append(f'{metric}_count{{span="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _metric_name(name:str):
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+registry = MetricsRegistry()
+
+inc = registry.inc
+observe = registry.observe
+span = registry.span
+timed = registry.timed
+snapshot = registry.snapshot
+drain = registry.drain
+merge = registry.merge
+to_json = registry.to_json
+to_prometheus = registry.to_prometheus
+
+
+def enable():
+    registry.enabled = True
+
+
+def disable():
+    registry.enabled = False
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = registry.to_prometheus(), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body, content_type = registry.to_json(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(host:str="127.0.0.1", port:int=METRICS_PORT):
+    """
+    Serve /metrics (Prometheus text) and /metrics.json from a daemon thread.
+
+    Returns:
+        ThreadingHTTPServer: call `shutdown()` to stop it; `server_address` has the bound port
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,57 @@
+import queue
+import time
+from visionassist.config import YOLO_MAX_BATCH_SIZE, YOLO_BATCH_TIMEOUT_MS
+
+
+class FrameBatcher:
+    """
+    Collects queued frames into batches for `YOLOModel.detect_batch`.
+
+    A batch is released as soon as it holds `max_batch_size` frames or
+    `timeout_ms` has elapsed since its first frame arrived, whichever comes first.
+    """
+
+    def __init__(self, max_batch_size:int=YOLO_MAX_BATCH_SIZE, timeout_ms:float=YOLO_BATCH_TIMEOUT_MS):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.max_batch_size = max_batch_size
+        self.timeout_ms = timeout_ms
+
+    def collect(self, frame_queue:queue.Queue, block:bool=True, timeout:float=None):
+        """
+        Pull the next batch of items from `frame_queue`.
+
+        Args:
+            frame_queue: Queue the frames are read from
+            block: Wait for the first frame if the queue is empty
+            timeout: Max seconds to wait for the first frame (None waits forever)
+
+        Returns:
+            list: Up to `max_batch_size` items, empty if no frame arrived in time
+        """
+        try:
+            batch = [frame_queue.get(block=block, timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.timeout_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(frame_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+
+def detect_frames(detector, frames:list):
+    """
+    Detections of every frame in `frames`, in order: one `detect_batch` call
+    when the detector has one, otherwise `detect` frame by frame.
+    """
+    if hasattr(detector, "detect_batch"):
+        return detector.detect_batch(frames)
+    return [detector.detect(frame) for frame in frames]
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from visionassist.config import IMAGE_DEDUP_HASH_SIZE, IMAGE_DEDUP_MAX_DISTANCE, IMAGE_DEDUP_CAPACITY, IMAGE_DEDUP_MAX_AGE_S
+
+
+def dhash(image:np.ndarray, hash_size:int=IMAGE_DEDUP_HASH_SIZE):
+    """
+    Difference hash: one bit per horizontally adjacent pixel pair of a
+    (hash_size + 1) x hash_size grayscale thumbnail.
+
+    Robust to JPEG noise, small brightness changes and rescaling, so frames
+    of a static scene hash within a few bits of each other.
+
+    Returns:
+        int: hash_size * hash_size bit hash
+    """
+    import cv2
+    # subsample first; averaging a 720p frame straight down to 9x8 costs ms
+    step = max(1, min(image.shape[:2]) // (hash_size * 8))
+    image = np.ascontiguousarray(image[::step, ::step])
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    thumbnail = cv2.resize(image, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = np.packbits(thumbnail[:, 1:] > thumbnail[:, :-1])
+    return int.from_bytes(bits.tobytes(), "big")
+
+
+def hamming_distance(a:int, b:int):
+    return (a ^ b).bit_count()
+
+
+class ImageDeduplicator:
+    """
+    Remembers the perceptual hashes of recently saved images so that a
+    visually identical sighting can point at the existing file instead of
+    writing a new one.
+
+    Hashes are grouped by a key (e.g. the labels in the frame) so an image is
+    only reused for the same objects. Entries expire after `max_age_s`, which
+    keeps a static scene from referring to one ancient image forever, and
+    the oldest entries are evicted beyond `capacity`. Lookups scan the
+    entries newest first, well under a millisecond for the default capacity.
+    """
+
+    def __init__(self, max_distance:int=IMAGE_DEDUP_MAX_DISTANCE, capacity:int=IMAGE_DEDUP_CAPACITY,
+                 max_age_s:float=IMAGE_DEDUP_MAX_AGE_S, hash_size:int=IMAGE_DEDUP_HASH_SIZE):
+        """
+        Args:
+            max_distance: Max differing hash bits for two images to count as the same
+            capacity: Number of saved images remembered
+            max_age_s: Saved images are not reused after this many seconds, None to reuse forever
+            hash_size: dHash grid size, the hash has hash_size ** 2 bits
+        """
+        self.max_distance = max_distance
+        self.capacity = capacity
+        self.max_age_s = max_age_s
+        self.hash_size = hash_size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()  # path -> (key, hash, saved_at), oldest first
+        self._lock = threading.Lock()
+
+    def hash(self, image:np.ndarray):
+        return dhash(image, self.hash_size)
+
+    def lookup(self, image_hash:int, key:str="", now:float=None):
+        """
+        Returns:
+            str: Path of a remembered image within `max_distance` of `image_hash`, or None
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._expire(now)
+            for path, (entry_key, entry_hash, _) in reversed(self._entries.items()):
+                if entry_key == key and hamming_distance(entry_hash, image_hash) <= self.max_distance:
+                    self.hits += 1
+                    return path
+            self.misses += 1
+            return None
+
+    def add(self, image_hash:int, path:str, key:str="", now:float=None):
+        """Remember `path` as the saved image for `image_hash`."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._entries[path] = (key, image_hash, now)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def discard(self, path:str):
+        """Forget `path`, e.g. because writing it failed or it was deleted."""
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def _expire(self, now:float):
+        if self.max_age_s is None:
+            return
+        while self._entries:
+            _, _, saved_at = next(iter(self._entries.values()))
+            if now - saved_at < self.max_age_s:
+                return
+            self._entries.popitem(last=False)
+
+    def get_stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+def frame_key(detections):
+    """Dedup key of a full frame: the labels it shows, so new objects always get a new image."""
+    return ",".join(sorted(det["label"] for det in detections))
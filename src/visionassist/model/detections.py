@@ -0,0 +1,110 @@
+import numpy as np
+
+# Compact columnar detection record: one row per box, bbox as (x1, y1, x2, y2)
+DETECTION_DTYPE = np.dtype([
+    ("class_id", np.int32),
+    ("confidence", np.float32),
+    ("bbox", np.int32, (4,)),
+])
+
+
+def empty_detections():
+    """Return an empty detection array."""
+    return np.empty(0, dtype=DETECTION_DTYPE)
+
+
+def boxes_to_array(class_ids, confidences, xyxy, min_confidence:float=0.0):
+    """
+    Build a detection array from raw model outputs using whole-array operations.
+
+    Args:
+        class_ids: (N,) class ids
+        confidences: (N,) confidence scores
+        xyxy: (N, 4) box corners in pixels
+        min_confidence: Boxes scoring below this are dropped
+
+    Returns:
+        np.ndarray: Structured array with DETECTION_DTYPE
+    """
+    confidences = np.asarray(confidences, dtype=np.float32).reshape(-1)
+    keep = confidences >= min_confidence
+
+    detections = np.empty(int(keep.sum()), dtype=DETECTION_DTYPE)
+    detections["class_id"] = np.asarray(class_ids).reshape(-1)[keep]
+    detections["confidence"] = confidences[keep]
+    # astype truncates toward zero, same as int() on each coordinate
+    detections["bbox"] = np.asarray(xyxy).reshape(-1, 4)[keep]
+
+    return detections
+
+
+def array_to_dicts(detections:np.ndarray, names:dict):
+    """
+    Convert a detection array into the list-of-dicts shape returned by `YOLOModel.detect`.
+
+    Args:
+        detections: Structured array with DETECTION_DTYPE
+        names: Mapping of class id to label
+    """
+    return [
+        {
+            "label": names[cls_id],
+            "confidence": conf,
+            "bbox": tuple(bbox),
+        }
+        for cls_id, conf, bbox in zip(
+            detections["class_id"].tolist(),
+            detections["confidence"].tolist(),
+            detections["bbox"].tolist(),
+        )
+    ]
+
+
+def offset_detections(detections:np.ndarray, dx:int, dy:int):
+    """Shift boxes detected in a crop back into the coordinates of the full frame."""
+    shifted = detections.copy()
+    shifted["bbox"] += np.array([dx, dy, dx, dy], dtype=np.int32)
+    return shifted
+
+
+def nms(detections:np.ndarray, threshold:float=0.5, metric:str="iou"):
+    """
+    Greedy per-class non-maximum suppression, highest confidence first.
+
+    Args:
+        detections: Structured array with DETECTION_DTYPE
+        threshold: Boxes overlapping a kept box of the same class by more than this are dropped
+        metric: 'iou' (intersection over union) or 'ios' (intersection over the smaller
+            box, which also merges a box cut at a tile edge into the full one)
+
+    Returns:
+        np.ndarray: The kept detections, highest confidence first
+    """
+    if metric not in ("iou", "ios"):
+        raise ValueError(f"Unknown NMS metric: {metric}")
+    if len(detections) < 2:
+        return detections.copy()
+
+    order = np.argsort(-detections["confidence"], kind="stable")
+    detections = detections[order]
+    boxes = detections["bbox"].astype(np.float32)
+    class_ids = detections["class_id"]
+    areas = np.clip(boxes[:, 2] - boxes[:, 0], 0, None) * np.clip(boxes[:, 3] - boxes[:, 1], 0, None)
+
+    suppressed = np.zeros(len(detections), dtype=bool)
+    keep = []
+    for i in range(len(detections)):
+        if suppressed[i]:
+            continue
+        keep.append(i)
+        width = np.clip(np.minimum(boxes[i, 2], boxes[:, 2]) - np.maximum(boxes[i, 0], boxes[:, 0]), 0, None)
+        height = np.clip(np.minimum(boxes[i, 3], boxes[:, 3]) - np.maximum(boxes[i, 1], boxes[:, 1]), 0, None)
+        intersection = width * height
+        if metric == "ios":
+            denominator = np.minimum(areas[i], areas)
+        else:
+            denominator = areas[i] + areas - intersection
+        overlap = intersection / np.maximum(denominator, 1e-6)
+        suppressed |= (overlap > threshold) & (class_ids == class_ids[i])
+
+    return detections[keep]
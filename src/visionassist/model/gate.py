@@ -0,0 +1,74 @@
+import time
+import numpy as np
+from visionassist.config import SCENE_CHANGE_THRESHOLD, SCENE_MAX_INTERVAL_S, SCENE_GATE_WIDTH
+
+
+class SceneChangeGate:
+    """
+    Cheap pre-filter deciding whether a frame is worth running YOLO on.
+
+    Frames are downscaled to grayscale thumbnails and compared against the
+    thumbnail of the last inferred frame. Inference is requested when the mean
+    absolute difference exceeds `threshold` or `max_interval_s` has elapsed.
+    """
+
+    def __init__(self, threshold:float=SCENE_CHANGE_THRESHOLD, max_interval_s:float=SCENE_MAX_INTERVAL_S, width:int=SCENE_GATE_WIDTH):
+        self.threshold = threshold
+        self.max_interval_s = max_interval_s
+        self.width = width
+
+        self.frames_inferred = 0
+        self.frames_skipped = 0
+        self.last_score = 0.0
+
+        self._reference = None
+        self._reference_time = None
+
+    def _thumbnail(self, frame:np.ndarray):
+        import cv2
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        height, width = frame.shape[:2]
+        size = (self.width, max(1, round(height * self.width / width)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    def should_infer(self, frame:np.ndarray, now:float=None):
+        """
+        Returns True if the frame should go through the detector.
+        The frame becomes the new reference whenever True is returned.
+        """
+        now = time.monotonic() if now is None else now
+        thumbnail = self._thumbnail(frame)
+
+        if self._reference is None or self._reference.shape != thumbnail.shape:
+            changed = True
+            self.last_score = 1.0
+        else:
+            self.last_score = float(np.mean(np.abs(thumbnail - self._reference))) / 255.0
+            changed = (
+                self.last_score >= self.threshold
+                or now - self._reference_time >= self.max_interval_s
+            )
+
+        if changed:
+            self._reference = thumbnail
+            self._reference_time = now
+            self.frames_inferred += 1
+        else:
+            self.frames_skipped += 1
+
+        return changed
+
+    def reset(self):
+        """Forget the reference frame so the next frame is always inferred."""
+        self._reference = None
+        self._reference_time = None
+
+    def get_stats(self):
+        total = self.frames_inferred + self.frames_skipped
+        return {
+            "frames_inferred": self.frames_inferred,
+            "frames_skipped": self.frames_skipped,
+            "skip_ratio": self.frames_skipped / total if total else 0.0,
+            "last_score": self.last_score,
+        }
@@ -0,0 +1,223 @@
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from visionassist.config import (
+    IMAGE_DIR, IMAGE_JPEG_QUALITY, IMAGE_MAX_SIDE, IMAGE_SAVE_CROPS, IMAGE_CROP_MARGIN,
+    IMAGE_WRITER_WORKERS, IMAGE_WRITER_QUEUE_SIZE, IMAGE_DEDUP_ENABLED
+)
+from visionassist.model.color import get_random_color
+from visionassist.model.dedup import ImageDeduplicator, frame_key
+from visionassist.logger import logger
+from visionassist import metrics
+
+_counter = itertools.count()
+
+
+def image_filename(label:str, suffix:str=""):
+    """Collision-free file name: label, millisecond timestamp, process id and a sequence number."""
+    label = label.replace(" ", "_")
+    return f"{label}_{int(time.time() * 1000)}_{os.getpid()}_{next(_counter)}{suffix}.jpg"
+
+
+def annotate(frame, detections):
+    """Draw boxes and labels onto `frame` in place."""
+    import cv2
+    for det in detections:
+        x1, y1, x2, y2 = det['bbox']
+        label = det['label']
+        cv2.rectangle(frame, (x1, y1), (x2, y2), get_random_color(), 2)
+        cv2.putText(frame, f"{label} {det['confidence']:.2f}", (x1, y1 - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0,0,0), 1)
+    return frame
+
+
+def crop(frame, bbox, margin:float=IMAGE_CROP_MARGIN):
+    """Crop `bbox` out of `frame` with some surrounding context."""
+    height, width = frame.shape[:2]
+    x1, y1, x2, y2 = bbox
+    pad_x = int((x2 - x1) * margin)
+    pad_y = int((y2 - y1) * margin)
+    return frame[max(0, y1 - pad_y):min(height, y2 + pad_y), max(0, x1 - pad_x):min(width, x2 + pad_x)]
+
+
+def write_jpeg(path:str, image, quality:int=IMAGE_JPEG_QUALITY, max_side:int=IMAGE_MAX_SIDE):
+    """Downscale `image` so its longer side is at most `max_side` and write it as JPEG."""
+    import cv2
+    height, width = image.shape[:2]
+    if max_side and max(height, width) > max_side:
+        scale = max_side / max(height, width)
+        image = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+
+    ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError(f"Failed to encode image: {path}")
+    with open(path, "wb") as f:
+        f.write(encoded.tobytes())
+
+
+class ImageStore:
+    """
+    Saves sighting images on a background thread pool.
+
+    `save` picks the file name(s) and returns immediately; drawing, resizing,
+    JPEG encoding and the disk write happen on worker threads. At most
+    `queue_size` writes are pending at once, after which `save` blocks.
+
+    With deduplication on, a sighting that looks like a recently saved one
+    (same labels, perceptual hash within a few bits) gets the existing path
+    back and nothing is written.
+    """
+
+    def __init__(
+        self,
+        image_dir:str=IMAGE_DIR,
+        jpeg_quality:int=IMAGE_JPEG_QUALITY,
+        max_side:int=IMAGE_MAX_SIDE,
+        save_crops:bool=IMAGE_SAVE_CROPS,
+        workers:int=IMAGE_WRITER_WORKERS,
+        queue_size:int=IMAGE_WRITER_QUEUE_SIZE,
+        dedup=IMAGE_DEDUP_ENABLED,
+    ):
+        """
+        Args:
+            dedup: True to reuse near-duplicate images with a default
+                ImageDeduplicator, a configured ImageDeduplicator, or False
+        """
+        if dedup is True:
+            dedup = ImageDeduplicator()
+        self.dedup = dedup or None
+        self.image_dir = image_dir
+        self.jpeg_quality = jpeg_quality
+        self.max_side = max_side
+        self.save_crops = save_crops
+
+        self.written = 0
+        self.deduplicated = 0
+        self.errors = 0
+        self.write_seconds = 0.0
+
+        os.makedirs(image_dir, exist_ok=True)
+        self._queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-store")
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._lock = threading.Lock()
+        self._pending = set()
+
+    def save(self, frame, detections):
+        """
+        Queue the sighting image(s) for writing.
+
+        In crop mode every detection dict gets an "image_path" key pointing at
+        its own crop, and the first crop's path is returned.
+
+        Returns:
+            str: Path the image will be written to, "" if there is nothing to save
+        """
+        if not detections:
+            return ""
+
+        if self.save_crops:
+            jobs = []
+            for i, det in enumerate(detections):
+                image = crop(frame, det["bbox"])
+                image_hash, det["image_path"] = self._find_duplicate(image, det["label"])
+                if det["image_path"] is None:
+                    det["image_path"] = os.path.join(self.image_dir, image_filename(det["label"], suffix=f"_{i}"))
+                    jobs.append((det["image_path"], image.copy(), image_hash, det["label"]))
+            first_path = detections[0]["image_path"]
+        else:
+            key = frame_key(detections)
+            image_hash, first_path = self._find_duplicate(frame, key)
+            jobs = []
+            if first_path is None:
+                first_path = os.path.join(self.image_dir, image_filename(detections[-1]["label"]))
+                jobs.append((first_path, (frame.copy(), list(detections)), image_hash, key))
+
+        for path, payload, image_hash, key in jobs:
+            self._slots.acquire()
+            # registered before submit, a fast write would otherwise finish before it is marked
+            # pending; rolled back if the write is never queued so lookups don't return a missing file
+            with self._lock:
+                self._pending.add(path)
+            if image_hash is not None:
+                self.dedup.add(image_hash, path, key)
+            try:
+                future = self._executor.submit(self._write, path, payload)
+            except Exception:
+                with self._lock:
+                    self._pending.discard(path)
+                if image_hash is not None:
+                    self.dedup.discard(path)
+                self._slots.release()
+                raise
+            future.add_done_callback(lambda _: self._slots.release())
+
+        return first_path
+
+    def _find_duplicate(self, image, key:str):
+        """
+        Returns:
+            tuple: (perceptual hash or None with dedup off, path of a saved look-alike or None)
+        """
+        if self.dedup is None:
+            return None, None
+        image_hash = self.dedup.hash(image)
+        path = self.dedup.lookup(image_hash, key)
+        if path is None:
+            return image_hash, None
+        with self._lock:
+            pending = path in self._pending
+        if not pending and not os.path.exists(path):
+            # deleted by retention since it was saved
+            self.dedup.discard(path)
+            return image_hash, None
+        with self._lock:
+            self.deduplicated += 1
+        metrics.inc("image_store.deduplicated")
+        return image_hash, path
+
+    def _write(self, path, payload):
+        start = time.perf_counter()
+        try:
+            if self.save_crops:
+                image = payload
+            else:
+                image, detections = payload
+                annotate(image, detections)
+            write_jpeg(path, image, quality=self.jpeg_quality, max_side=self.max_side)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.written += 1
+                self.write_seconds += elapsed
+            metrics.observe("image_store.write", elapsed * 1000)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            if self.dedup is not None:
+                self.dedup.discard(path)
+            logger.error(f"Failed to write image {path}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(path)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "written": self.written,
+                "deduplicated": self.deduplicated,
+                "errors": self.errors,
+                "avg_write_ms": self.write_seconds * 1000 / self.written if self.written else 0.0,
+            }
+
+    def flush(self):
+        """Block until every queued write has finished."""
+        for _ in range(self._queue_size):
+            self._slots.acquire()
+        for _ in range(self._queue_size):
+            self._slots.release()
+
+    def close(self, wait:bool=True):
+        """Stop accepting work; by default wait for pending writes to finish."""
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from visionassist.config import (
+    YOLO_TILE_SIZE, YOLO_TILE_OVERLAP, YOLO_TILE_FULL_FRAME, YOLO_MERGE_NMS_THRESHOLD, YOLO_MERGE_NMS_METRIC,
+    YOLO_SOURCE_MODES
+)
+
+
+def resolve_region(region, height:int, width:int):
+    """
+    Pixel box of a region given as (x1, y1, x2, y2) fractions of the frame,
+    clipped to the frame and at least one pixel wide and high, so a region on
+    the frame's edge still yields a non-empty crop.
+    """
+    x1, y1, x2, y2 = (min(max(value, 0.0), 1.0) for value in region)
+    left, top = min(int(min(x1, x2) * width), width - 1), min(int(min(y1, y2) * height), height - 1)
+    right, bottom = round(max(x1, x2) * width), round(max(y1, y2) * height)
+    return (left, top, min(max(right, left + 1), width), min(max(bottom, top + 1), height))
+
+
+def _tile_starts(start:int, end:int, size:int, stride:int):
+    if end - start <= size:
+        return [start]
+    starts = list(range(start, end - size, stride))
+    starts.append(end - size)  # last tile flush with the edge instead of sticking out
+    return starts
+
+
+def make_tiles(window, tile_size:int=YOLO_TILE_SIZE, overlap:float=YOLO_TILE_OVERLAP):
+    """
+    Split a pixel box into overlapping tiles of `tile_size`, all inside the box.
+
+    Args:
+        window: (x1, y1, x2, y2) box to cover
+        tile_size: Tile side; a box smaller than this is a single tile
+        overlap: Overlap of neighbouring tiles, relative to the tile size
+
+    Returns:
+        list: (x1, y1, x2, y2) tiles, row by row
+    """
+    x1, y1, x2, y2 = window
+    stride = max(1, int(tile_size * (1 - overlap)))
+    return [
+        (x, y, min(x + tile_size, x2), min(y + tile_size, y2))
+        for y in _tile_starts(y1, y2, tile_size, stride)
+        for x in _tile_starts(x1, x2, tile_size, stride)
+    ]
+
+
+@dataclass
+class InferenceMode:
+    """
+    Which parts of a frame YOLOModel runs on.
+
+    The default runs on the whole frame. With `rois`, only those named
+    regions are cropped out and inferred. With `tile_size`, the frame (or
+    every ROI) is split into overlapping tiles at native resolution so small
+    objects are not lost to downscaling. Detections of all windows are
+    shifted back to frame coordinates and merged with per-class NMS.
+    """
+
+    rois: dict = None  # name -> (x1, y1, x2, y2) fractions of the frame, None for the whole frame
+    tile_size: int = None  # tile side in pixels, None to infer every region in one piece
+    tile_overlap: float = YOLO_TILE_OVERLAP
+    full_frame: bool = YOLO_TILE_FULL_FRAME  # tiled mode also infers every region in one piece
+    nms_threshold: float = YOLO_MERGE_NMS_THRESHOLD
+    nms_metric: str = YOLO_MERGE_NMS_METRIC
+
+    @property
+    def is_whole_frame(self):
+        return not self.rois and not self.tile_size
+
+    def regions(self, height:int, width:int):
+        """Pixel boxes of the ROIs, or of the whole frame."""
+        if not self.rois:
+            return [(0, 0, width, height)]
+        return [resolve_region(region, height, width) for region in self.rois.values()]
+
+    def windows(self, height:int, width:int):
+        """Every (x1, y1, x2, y2) crop the model has to run on for a frame of this size."""
+        windows = []
+        for region in self.regions(height, width):
+            if not self.tile_size:
+                windows.append(region)
+                continue
+            tiles = make_tiles(region, self.tile_size, self.tile_overlap)
+            windows.extend(tiles)
+            if self.full_frame and len(tiles) > 1:
+                windows.append(region)
+        return windows
+
+
+def inference_mode(mode=None):
+    """An InferenceMode from an instance, a dict of its fields, or None (whole frame)."""
+    if mode is None or isinstance(mode, InferenceMode):
+        return mode
+    return InferenceMode(**mode)
+
+
+def mode_for_source(source_id:str):
+    """The configured YOLO_SOURCE_MODES entry of a camera, None for whole-frame inference."""
+    return inference_mode(YOLO_SOURCE_MODES.get(source_id))
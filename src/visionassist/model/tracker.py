@@ -0,0 +1,132 @@
+import itertools
+import numpy as np
+from visionassist.config import TRACKER_IOU_THRESHOLD, TRACKER_MOVE_THRESHOLD, TRACKER_MAX_MISSED
+
+APPEARED = "appeared"
+MOVED = "moved"
+DISAPPEARED = "disappeared"
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """Pairwise IoU between two (N, 4) and (M, 4) xyxy box arrays."""
+    a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)[:, None, :]
+    b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)[None, :, :]
+
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - inter
+
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+class Track:
+    """A single tracked object."""
+
+    def __init__(self, track_id:int, detection:dict):
+        self.track_id = track_id
+        self.label = detection["label"]
+        self.confidence = detection["confidence"]
+        self.bbox = tuple(detection["bbox"])
+        self.anchor_bbox = self.bbox  # location last reported to the memory layer
+        self.missed = 0
+
+    def has_moved(self, move_threshold:float):
+        ax1, ay1, ax2, ay2 = self.anchor_bbox
+        x1, y1, x2, y2 = self.bbox
+        shift = np.hypot((x1 + x2 - ax1 - ax2) / 2, (y1 + y2 - ay1 - ay2) / 2)
+        diagonal = max(np.hypot(ax2 - ax1, ay2 - ay1), 1.0)
+        return shift / diagonal >= move_threshold
+
+    def to_event(self, event:str):
+        return {
+            "event": event,
+            "track_id": self.track_id,
+            "label": self.label,
+            "confidence": self.confidence,
+            "bbox": self.bbox,
+        }
+
+
+class ObjectTracker:
+    """
+    IoU tracker layered on `YOLOModel.detect` output.
+
+    Assigns stable track ids to detections across frames and reports only
+    state changes: an object appeared, moved noticeably, or disappeared.
+    """
+
+    def __init__(self, iou_threshold:float=TRACKER_IOU_THRESHOLD, move_threshold:float=TRACKER_MOVE_THRESHOLD, max_missed:int=TRACKER_MAX_MISSED):
+        self.iou_threshold = iou_threshold
+        self.move_threshold = move_threshold
+        self.max_missed = max_missed
+
+        self.tracks = {}
+        self._ids = itertools.count(1)
+
+    def update(self, detections):
+        """
+        Match a frame's detections against the live tracks.
+
+        Args:
+            detections: List of detection dicts as returned by `YOLOModel.detect`
+
+        Returns:
+            list: Event dicts with keys event, track_id, label, confidence, bbox
+        """
+        events = []
+        matched_tracks = set()
+        matched_detections = set()
+
+        tracks = list(self.tracks.values())
+        if tracks and detections:
+            ious = iou_matrix([t.bbox for t in tracks], [d["bbox"] for d in detections])
+            same_label = np.array([[t.label == d["label"] for d in detections] for t in tracks])
+            ious = np.where(same_label, ious, 0.0)
+
+            # greedy assignment, best overlap first
+            for flat in np.argsort(ious, axis=None)[::-1]:
+                t_idx, d_idx = np.unravel_index(flat, ious.shape)
+                if ious[t_idx, d_idx] < self.iou_threshold:
+                    break
+                if t_idx in matched_tracks or d_idx in matched_detections:
+                    continue
+                matched_tracks.add(t_idx)
+                matched_detections.add(d_idx)
+
+                track = tracks[t_idx]
+                track.bbox = tuple(detections[d_idx]["bbox"])
+                track.confidence = detections[d_idx]["confidence"]
+                track.missed = 0
+                if track.has_moved(self.move_threshold):
+                    track.anchor_bbox = track.bbox
+                    events.append(track.to_event(MOVED))
+
+        for t_idx, track in enumerate(tracks):
+            if t_idx in matched_tracks:
+                continue
+            track.missed += 1
+            if track.missed > self.max_missed:
+                del self.tracks[track.track_id]
+                events.append(track.to_event(DISAPPEARED))
+
+        for d_idx, detection in enumerate(detections):
+            if d_idx in matched_detections:
+                continue
+            track = Track(next(self._ids), detection)
+            self.tracks[track.track_id] = track
+            events.append(track.to_event(APPEARED))
+
+        return events
+
+
+def events_to_objects(events):
+    """Detection dicts for the events that carry a new location (appeared / moved)."""
+    return [
+        {"label": e["label"], "confidence": e["confidence"], "bbox": e["bbox"], "track_id": e["track_id"]}
+        for e in events
+        if e["event"] in (APPEARED, MOVED)
+    ]
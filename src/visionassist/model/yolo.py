@@ -1,61 +1,218 @@
-import cv2
 import os
-import time
 import numpy as np
-from ultralytics import YOLO
-from visionassist.config import ALLOWED_LABELS, MIN_CONFIDENCE, IMAGE_DIR, YOLO_MODEL_NAME
-from visionassist.model.color import get_random_color
+from visionassist.config import ALLOWED_LABELS, MIN_CONFIDENCE, IMAGE_DIR, YOLO_MODEL_NAME, YOLO_MAX_BATCH_SIZE, SCENE_GATE_ENABLED, MODEL_LOAD_MODE, IMAGE_DEDUP_ENABLED
+from visionassist.model.detections import boxes_to_array, array_to_dicts, empty_detections, offset_detections, nms
+from visionassist.model.dedup import ImageDeduplicator, frame_key
+from visionassist.model.gate import SceneChangeGate
+from visionassist.model.image_store import annotate, image_filename, write_jpeg
+from visionassist.model.regions import inference_mode
+from visionassist.loader import ModelLoader
+from visionassist import metrics
 from visionassist.logger import logger
 
+def load_yolo_model(model_name:str=YOLO_MODEL_NAME):
+    """Import ultralytics (and torch) only when weights are actually needed."""
+    from ultralytics import YOLO
+    return YOLO(model_name)
+
 class YOLOModel:
-    def __init__(self):
+    def __init__(self, scene_gate=SCENE_GATE_ENABLED, image_store=None, load_mode:str=MODEL_LOAD_MODE, dedup=IMAGE_DEDUP_ENABLED, inference=None):
+        """
+        Args:
+            scene_gate: True to skip inference on unchanged frames with a default
+                SceneChangeGate, or a configured SceneChangeGate instance
+            image_store: Optional ImageStore; when set, `save_with_bbox` queues the
+                write on its thread pool instead of encoding on the caller's thread
+            load_mode: 'eager', 'background' or 'lazy' (see ModelLoader); until
+                the weights are in, `is_ready()` is False and `detect` blocks
+            dedup: True to reuse the saved image of a look-alike frame with a default
+                ImageDeduplicator, a configured ImageDeduplicator, or False; only used
+                without an image_store, which deduplicates itself
+            inference: InferenceMode (or dict of its fields) restricting detection to
+                ROIs and/or running it on tiles; None infers the whole frame
+        """
         logger.info(f"Initializing YOLO model : {YOLO_MODEL_NAME}")
-        self.model = YOLO(YOLO_MODEL_NAME)
-        self.class_ids =  [class_info[0] for class_info in self.model.names.items() if class_info[1].lower() in ALLOWED_LABELS]
         os.makedirs(IMAGE_DIR, exist_ok=True)
-        logger.info(f"YOLO model initialized with allowed class ids: {self.class_ids}")
 
-    def detect(self, frame:np.ndarray):
-        """Run YOLO detection and filter by allowed class ids + confidence."""
-        results = self.model(frame, classes=self.class_ids, verbose=False)[0]
+        if scene_gate is True:
+            scene_gate = SceneChangeGate()
+        self.scene_gate = scene_gate or None
+        self.image_store = image_store
+        if dedup is True:
+            dedup = ImageDeduplicator()
+        self.dedup = dedup or None
+        self.inference = inference_mode(inference)
+        self._last_detections = empty_detections()
+        self._last_mode = None  # mode that produced _last_detections
+        self._class_ids = None
+        self.loader = ModelLoader(self._load, name=f"YOLO model {YOLO_MODEL_NAME}", mode=load_mode)
 
-        detections = []
+    def _load(self):
+        model = load_yolo_model(YOLO_MODEL_NAME)
+        self._class_ids = [class_info[0] for class_info in model.names.items() if class_info[1].lower() in ALLOWED_LABELS]
+        logger.info(f"YOLO model initialized with allowed class ids: {self._class_ids}")
+        return model
+
+    @property
+    def model(self):
+        """The Ultralytics model; blocks until it is loaded."""
+        return self.loader.get()
+
+    @property
+    def class_ids(self):
+        self.loader.get()
+        return self._class_ids
+
+    def is_ready(self):
+        """True once the weights are loaded and `detect` will not block on loading."""
+        return self.loader.is_ready()
+
+    def wait_ready(self, timeout:float=None):
+        return self.loader.wait_ready(timeout)
+
+    @metrics.timed("yolo.detect")
+    def detect(self, frame:np.ndarray, as_array:bool=False, inference=None):
+        """
+        Run YOLO detection and filter by allowed class ids + confidence.
+        With a scene gate, unchanged frames reuse the last detections, as long
+        as they were inferred in the same mode.
 
-        for box in results.boxes:
-            cls_id = int(box.cls[0])
-            conf = float(box.conf[0])
+        Args:
+            frame: BGR frame
+            as_array: Return a structured DETECTION_DTYPE array instead of a list of dicts
+            inference: InferenceMode for this call only, default: the model's
+        """
+        mode = inference_mode(inference) or self.inference
+        if self._should_infer(frame, mode):
+            self._last_mode = mode
+            with metrics.span("yolo.inference"):
+                if mode is None or mode.is_whole_frame:
+                    results = self.model(frame, classes=self.class_ids, verbose=False)[0]
+                    self._last_detections = self._parse_result(results, as_array=True)
+                else:
+                    self._last_detections = self._detect_windows(frame, mode)
+        else:
+            metrics.inc("yolo.frames_skipped")
 
-            if conf < MIN_CONFIDENCE:
-                continue
+        if as_array:
+            return self._last_detections.copy()
 
-            label = results.names[cls_id]
-            
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
+        return self.to_dicts(self._last_detections)
 
-            detections.append({
-                "label": label,
-                "confidence": conf,
-                "bbox": (x1, y1, x2, y2),
-            })
+    @metrics.timed("yolo.detect_batch")
+    def detect_batch(self, frames, batch_size:int=None, as_array:bool=False):
+        """
+        Run YOLO detection on several frames, pushing up to `batch_size` frames
+        through a single model call. With a scene gate, unchanged frames reuse
+        the detections of the frame before them instead of joining the batch.
+        ROI and tiled modes run frame by frame, their windows are batched already.
+
+        Args:
+            frames: Sequence of BGR frames (np.ndarray)
+            batch_size: Max frames per model call (default: YOLO_MAX_BATCH_SIZE)
+            as_array: Return structured DETECTION_DTYPE arrays instead of lists of dicts
+
+        Returns:
+            list: One detection list per input frame, in input order
+        """
+        if self.inference is not None and not self.inference.is_whole_frame:
+            return [self.detect(frame, as_array=as_array) for frame in frames]
+
+        batch_size = batch_size or YOLO_MAX_BATCH_SIZE
+        frames = list(frames)
+
+        to_infer = []
+        for i, frame in enumerate(frames):
+            if self._should_infer(frame, self.inference):
+                self._last_mode = self.inference
+                to_infer.append(i)
+            else:
+                metrics.inc("yolo.frames_skipped")
+
+        inferred = {}
+        for start in range(0, len(to_infer), batch_size):
+            chunk = to_infer[start:start + batch_size]
+            with metrics.span("yolo.inference"):
+                results = self.model([frames[i] for i in chunk], classes=self.class_ids, verbose=False)
+            inferred.update(zip(chunk, (self._parse_result(result, as_array=True) for result in results)))
+
+        detections = []
+        for i in range(len(frames)):
+            self._last_detections = inferred.get(i, self._last_detections)
+            detections.append(self._last_detections.copy() if as_array else self.to_dicts(self._last_detections))
 
         return detections
 
+    def _should_infer(self, frame:np.ndarray, mode):
+        """
+        False if the scene gate lets `frame` reuse the last detections. They are
+        only reused if they were inferred in `mode`, a crop or tiling of another
+        mode would return the wrong objects.
+        """
+        if self.scene_gate is None:
+            return True
+        if mode != self._last_mode:
+            self.scene_gate.reset()
+        return self.scene_gate.should_infer(frame)
+
+    def _detect_windows(self, frame:np.ndarray, mode):
+        """
+        Infer every ROI/tile crop of `mode` in batches and merge the detections
+        back into frame coordinates.
+        """
+        windows = mode.windows(*frame.shape[:2])
+        crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in windows]
+
+        parsed = []
+        for start in range(0, len(crops), YOLO_MAX_BATCH_SIZE):
+            results = self.model(crops[start:start + YOLO_MAX_BATCH_SIZE], classes=self.class_ids, verbose=False)
+            parsed.extend(self._parse_result(result, as_array=True) for result in results)
+        metrics.inc("yolo.windows_inferred", len(windows))
+
+        detections = np.concatenate([
+            offset_detections(window_detections, x1, y1)
+            for window_detections, (x1, y1, _, _) in zip(parsed, windows)
+        ])
+        return nms(detections, mode.nms_threshold, mode.nms_metric)
+
+    def _parse_result(self, results, as_array:bool=False):
+        """Convert a single Ultralytics result into detections."""
+        boxes = results.boxes.cpu().numpy()
+        detections = boxes_to_array(boxes.cls, boxes.conf, boxes.xyxy, min_confidence=MIN_CONFIDENCE)
+
+        if as_array:
+            return detections
+
+        return array_to_dicts(detections, results.names)
+
+    def to_dicts(self, detections:np.ndarray):
+        """Convert a detection array into the list-of-dicts shape returned by `detect`."""
+        return array_to_dicts(detections, self.model.names)
+
+    @metrics.timed("yolo.save_with_bbox")
     def save_with_bbox(self, frame, detections):
-        """Save cropped object image."""
+        """Save the frame annotated with its detections and return the image path."""
         if not detections:
             return ""
-        
-        for det in detections:
-            x1, y1, x2, y2 = det['bbox']
-            label = det['label']
-            cv2.rectangle(frame, (x1, y1), (x2, y2), get_random_color(), 2)
-            cv2.putText(frame, f"{label} {det['confidence']:.2f}", (x1, y1 - 10),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0,0,0), 1)
-            
-        timestamp = int(time.time())
-        filename = f"{label}_{timestamp}.jpg"
-        filepath = os.path.join(IMAGE_DIR, filename)
-
-        cv2.imwrite(filepath, frame)
+
+        if self.image_store is not None:
+            return self.image_store.save(frame, detections)
+
+        image_hash = None
+        if self.dedup is not None:
+            key = frame_key(detections)
+            image_hash = self.dedup.hash(frame)
+            existing = self.dedup.lookup(image_hash, key)
+            if existing is not None:
+                if os.path.exists(existing):
+                    metrics.inc("yolo.images_deduplicated")
+                    return existing
+                self.dedup.discard(existing)
+
+        annotate(frame, detections)
+        filepath = os.path.join(IMAGE_DIR, image_filename(detections[-1]['label']))
+        write_jpeg(filepath, frame)
+        if image_hash is not None:
+            self.dedup.add(image_hash, filepath, key)
 
         return filepath
@@ -0,0 +1 @@
+# The streaming pipeline component of the visionassist
@@ -0,0 +1,412 @@
+import functools
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from visionassist import metrics
+from visionassist.config import MULTI_CAMERA_RING_SLOTS, MULTI_CAMERA_WRITE_BATCH, MULTI_CAMERA_MAX_RESTARTS, MULTI_CAMERA_METRICS_INTERVAL_S, RETENTION_ENABLED
+from visionassist.logger import logger
+from visionassist.memory.retention import RetentionWorker
+from visionassist.model.batcher import FrameBatcher, detect_frames
+
+
+def load_yolo_detector(source_id:str=None):
+    """Default detector factory: a YOLOModel loaded inside the worker process, in the camera's YOLO_SOURCE_MODES mode."""
+    from visionassist.model.regions import mode_for_source
+    from visionassist.model.yolo import YOLOModel
+    return YOLOModel(load_mode="eager", inference=mode_for_source(source_id))
+
+
+class SharedFrameRing:
+    """
+    Fixed number of frame-sized slots in one shared memory block.
+
+    The capture side copies a frame into a free slot and only sends the slot
+    index to the worker, which reads the frame in place instead of unpickling it.
+    """
+
+    def __init__(self, slots:int, shape:tuple, dtype="uint8", name:str=None, create:bool=True):
+        """
+        Args:
+            slots: Number of frames the ring holds
+            shape: Shape of every frame, e.g. (480, 640, 3)
+            dtype: Frame dtype
+            name: Name of an existing block to attach to (create=False)
+            create: Allocate a new block instead of attaching to `name`
+        """
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        size = slots * int(np.prod(self.shape)) * self.dtype.itemsize
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.frames = np.ndarray((slots,) + self.shape, dtype=self.dtype, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, slot:int, frame:np.ndarray):
+        np.copyto(self.frames[slot], frame)
+
+    def view(self, slot:int):
+        """The frame in `slot`, without copying. Only valid until the slot is released."""
+        return self.frames[slot]
+
+    def close(self):
+        self.frames = None
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def _detect_worker(source_id, ring_name, slots, shape, dtype, detector_factory, tasks, free_slots, results, batcher=None,
+                   metrics_enabled:bool=False):
+    """
+    Entry point of a camera's worker process: detect and save every frame slot sent until None arrives.
+
+    The worker records metrics in its own process's registry; with `metrics_enabled`
+    it drains them onto `results` every MULTI_CAMERA_METRICS_INTERVAL_S for the parent to merge.
+    """
+    metrics.registry.enabled = metrics_enabled
+    last_report = time.monotonic()
+    ring = SharedFrameRing(slots, shape, dtype, name=ring_name, create=False)
+    try:
+        detector = detector_factory()
+        if batcher is None or not hasattr(detector, "detect_batch"):
+            batcher = FrameBatcher(max_batch_size=1)
+        while True:
+            batch = batcher.collect(tasks)
+            last = None in batch
+            if last:
+                batch = batch[:batch.index(None)]
+            if batch:
+                _detect_slots(source_id, ring, detector, batch, free_slots, results)
+            if metrics_enabled and time.monotonic() - last_report >= MULTI_CAMERA_METRICS_INTERVAL_S:
+                results.put(("metrics", source_id, None, None, metrics.drain()))
+                last_report = time.monotonic()
+            if last:
+                break
+    except Exception as e:
+        results.put(("error", source_id, None, None, str(e)))
+    finally:
+        ring.close()
+        if metrics_enabled:
+            results.put(("metrics", source_id, None, None, metrics.drain()))
+        results.put(("done", source_id, None, None, None))
+
+
+def _detect_slots(source_id, ring, detector, batch, free_slots, results):
+    """Detect and save the frames of `batch` [(slot, frame_no)], then hand their slots back."""
+    try:
+        frames = [ring.view(slot) for slot, _ in batch]
+        try:
+            batch_detections = detect_frames(detector, frames)
+        except Exception as e:
+            for _, frame_no in batch:
+                results.put(("error", source_id, frame_no, None, str(e)))
+            return
+
+        for (_, frame_no), frame, detections in zip(batch, frames, batch_detections):
+            try:
+                image_path = detector.save_with_bbox(frame, detections) if detections else None
+                results.put(("result", source_id, frame_no, image_path, detections))
+            except Exception as e:
+                results.put(("error", source_id, frame_no, None, str(e)))
+    finally:
+        for slot, _ in batch:
+            free_slots.put(slot)
+
+
+class SourceStats:
+    """Counters of a single camera."""
+
+    def __init__(self):
+        self.captured = 0
+        self.dropped = 0
+        self.processed = 0
+        self.errors = 0
+        self.written = 0
+        self.restarts = 0
+        self.started_at = None
+        self.stopped_at = None
+
+    def snapshot(self):
+        end = self.stopped_at or time.monotonic()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            "captured": self.captured,
+            "dropped": self.dropped,
+            "processed": self.processed,
+            "errors": self.errors,
+            "written": self.written,
+            "restarts": self.restarts,
+            "throughput_fps": self.processed / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+class MultiCameraRunner:
+    """
+    Runs detection for several cameras, one worker process per camera.
+
+    A capture thread per camera copies frames into that camera's
+    `SharedFrameRing` and hands the slot index to its worker process, so
+    detection runs outside this process's GIL. Every worker reports back on one
+    results queue, and a single writer thread stores the detections tagged with
+    the camera's source id and merges the workers' metrics into this process's
+    registry, so /metrics covers detection on every camera.
+    """
+
+    def __init__(self, sources:dict, database=None, detector_factory=None,
+                 ring_slots:int=MULTI_CAMERA_RING_SLOTS, write_batch:int=MULTI_CAMERA_WRITE_BATCH, drop_when_busy:bool=True,
+                 retention=RETENTION_ENABLED, max_restarts:int=MULTI_CAMERA_MAX_RESTARTS, batcher=True):
+        """
+        Args:
+            sources: {source_id: iterable of BGR frames}; all frames of a source must share one shape
+            database: Object exposing `insert_detections(detections, source_id, frame_size)`, optional
+            detector_factory: Picklable callable () -> object exposing `detect(frame)`
+                and `save_with_bbox(frame, detections)`; called inside every worker.
+                Default: a YOLOModel per camera in its YOLO_SOURCE_MODES mode
+            ring_slots: Frame slots per camera, i.e. frames in flight per worker
+            write_batch: Detections per source written in one transaction
+            drop_when_busy: Drop new frames while every slot is in use (live cameras);
+                when False, capture waits for a free slot (video files, tests)
+            retention: True to trim `database` with a default RetentionWorker while
+                the runner runs, a configured RetentionWorker, or False
+            max_restarts: Times a camera's worker is respawned after it died; the
+                camera stops with an error once they are used up
+            batcher: True to batch a camera's queued frames with a default FrameBatcher
+                when its detector has `detect_batch`, a configured FrameBatcher, or False
+        """
+        self.sources = dict(sources)
+        self.database = database
+        self.detector_factory = detector_factory
+        self.ring_slots = ring_slots
+        self.write_batch = write_batch
+        self.drop_when_busy = drop_when_busy
+        self.max_restarts = max_restarts
+        if batcher is True:
+            batcher = FrameBatcher()
+        self.batcher = batcher or None
+        if retention is True:
+            retention = RetentionWorker(database) if database is not None else None
+        self.retention = retention or None
+
+        self.stats = {source_id: SourceStats() for source_id in self.sources}
+        self._ctx = mp.get_context("spawn")
+        self._results = self._ctx.Queue()
+        self._processes = {}
+        self._rings = {}
+        self._queues = {}  # kept referenced until cleanup, the workers may still be attaching to them
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._capture_done = threading.Event()
+        self._captures_left = len(self.sources)
+        self._threads = []
+        self._writer = None
+
+    def start(self):
+        """Start a capture thread per source and the writer thread."""
+        if self._threads:
+            raise RuntimeError("Runner already started.")
+
+        if not self.sources:
+            self._capture_done.set()
+        for source_id in self.sources:
+            thread = threading.Thread(target=self._capture, args=(source_id,), name=f"camera-{source_id}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._writer = threading.Thread(target=self._write, name="camera-writer", daemon=True)
+        self._writer.start()
+        if self.retention is not None:
+            self.retention.start()
+        logger.info(f"Multi-camera runner started with {len(self.sources)} sources.")
+
+    def stop(self):
+        """Stop reading new frames; frames already handed to workers are still processed."""
+        self._stop.set()
+
+    def join(self, timeout:float=None):
+        """Wait for every camera and the writer to finish. Returns True if they all finished."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads + [self._writer]:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+        finished = not self._writer.is_alive()
+        if finished:
+            self._cleanup()
+        return finished
+
+    def run(self):
+        """Run until every source is exhausted and return the stats."""
+        self.start()
+        self.join()
+        return self.get_stats()
+
+    def get_stats(self):
+        """Per-source counters plus their totals under "total"."""
+        stats = {source_id: self.stats[source_id].snapshot() for source_id in self.sources}
+        stats["total"] = {
+            key: sum(source[key] for source in stats.values())
+            for key in ("captured", "dropped", "processed", "errors", "written", "restarts", "throughput_fps")
+        }
+        return stats
+
+    def _start_worker(self, source_id, frame):
+        ring = SharedFrameRing(self.ring_slots, frame.shape, frame.dtype)
+        with self._lock:
+            self._rings[source_id] = ring
+        self._spawn_worker(source_id)
+        return ring
+
+    def _spawn_worker(self, source_id):
+        """Start a worker for `source_id` on its ring, with every slot free."""
+        ring = self._rings[source_id]
+        tasks = self._ctx.Queue()
+        free_slots = self._ctx.Queue()
+        for slot in range(self.ring_slots):
+            free_slots.put(slot)
+
+        process = self._ctx.Process(
+            target=_detect_worker,
+            args=(source_id, ring.name, self.ring_slots, ring.shape, ring.dtype.str,
+                  self.detector_factory or functools.partial(load_yolo_detector, source_id), tasks, free_slots, self._results, self.batcher,
+                  metrics.registry.enabled),
+            name=f"camera-worker-{source_id}",
+            daemon=True,
+        )
+        process.start()
+        with self._lock:
+            self._processes[source_id] = process
+            self._queues[source_id] = (tasks, free_slots)
+
+    def _restart_worker(self, source_id):
+        """Respawn the dead worker of `source_id`; the frames it held are lost."""
+        stats = self.stats[source_id]
+        exitcode = self._processes[source_id].exitcode
+        metrics.inc("multi.worker_died")
+        if stats.restarts >= self.max_restarts:
+            raise RuntimeError(f"worker process exited with code {exitcode}, giving up after {stats.restarts} restarts")
+
+        stats.restarts += 1
+        self._queues[source_id][0].cancel_join_thread()  # nobody reads the dead worker's tasks any more
+        logger.error(f"Camera worker '{source_id}' exited with code {exitcode}, restarting it ({stats.restarts}/{self.max_restarts}).")
+        self._spawn_worker(source_id)
+
+    def _acquire_slot(self, source_id):
+        """A free slot index, or None if the frame has to be dropped."""
+        while not self._stop.is_set():
+            free_slots = self._queues[source_id][1]
+            try:
+                if self.drop_when_busy:
+                    return free_slots.get_nowait()
+                return free_slots.get(timeout=0.1)
+            except queue.Empty:
+                # a dead worker never hands its slots back, so running out of them is when to notice
+                if not self._processes[source_id].is_alive():
+                    self._restart_worker(source_id)
+                elif self.drop_when_busy:
+                    return None
+        return None
+
+    def _capture(self, source_id):
+        stats = self.stats[source_id]
+        stats.started_at = time.monotonic()
+        ring = None
+        try:
+            for frame_no, frame in enumerate(self.sources[source_id]):
+                if self._stop.is_set():
+                    break
+                if ring is None:
+                    ring = self._start_worker(source_id, frame)
+                if frame.shape != ring.shape:
+                    stats.errors += 1
+                    logger.error(f"Camera '{source_id}' frame shape changed from {ring.shape} to {frame.shape}.")
+                    continue
+
+                slot = self._acquire_slot(source_id)
+                if slot is None:
+                    stats.dropped += 1
+                    metrics.inc("multi.frames_dropped")
+                    continue
+                ring.write(slot, frame)
+                self._queues[source_id][0].put((slot, frame_no))
+                stats.captured += 1
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"Frame capture failed for camera '{source_id}': {e}")
+        finally:
+            queues = self._queues.get(source_id)
+            if queues is not None:
+                queues[0].put(None)
+            with self._lock:
+                self._captures_left -= 1
+                if self._captures_left == 0:
+                    self._capture_done.set()
+
+    def _workers_finished(self, done):
+        """True once every started worker has reported done or died, and no more workers can start."""
+        if not self._capture_done.is_set():
+            return False
+        with self._lock:
+            return all(source_id in done or not process.is_alive() for source_id, process in self._processes.items())
+
+    def _write(self):
+        pending = {}
+        done = set()
+        while True:
+            try:
+                kind, source_id, frame_no, image_path, payload = self._results.get(timeout=0.05)
+            except queue.Empty:
+                self._flush(pending)
+                if self._workers_finished(done) and self._results.empty():
+                    break
+                continue
+
+            stats = self.stats[source_id]
+            if kind == "result":
+                stats.processed += 1
+                if payload:
+                    pending.setdefault(source_id, []).append((image_path, payload))
+                    if len(pending[source_id]) >= self.write_batch:
+                        self._flush({source_id: pending.pop(source_id)})
+            elif kind == "error":
+                stats.errors += 1
+                logger.error(f"Detection failed for camera '{source_id}' frame {frame_no}: {payload}")
+            elif kind == "metrics":
+                metrics.merge(payload)
+            elif kind == "done":
+                done.add(source_id)
+                stats.stopped_at = time.monotonic()
+        self._flush(pending)
+
+    def _flush(self, pending):
+        for source_id, detections in pending.items():
+            if self.database is None or not detections:
+                continue
+            try:
+                with metrics.span("multi.write"):
+                    height, width = self._rings[source_id].shape[:2]
+                    self.database.insert_detections(detections, source_id=source_id, frame_size=(width, height))
+                self.stats[source_id].written += len(detections)
+            except Exception as e:
+                self.stats[source_id].errors += 1
+                logger.error(f"Writing detections for camera '{source_id}' failed: {e}")
+        pending.clear()
+
+    def _cleanup(self):
+        if self.retention is not None:
+            self.retention.stop()
+        with self._lock:
+            for source_id, process in self._processes.items():
+                process.join(timeout=5)
+                if process.is_alive():
+                    logger.error(f"Camera worker '{source_id}' did not exit, terminating it.")
+                    process.terminate()
+            for ring in self._rings.values():
+                ring.close()
+                ring.unlink()
+            self._rings.clear()
+            self._queues.clear()
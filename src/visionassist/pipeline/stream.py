@@ -0,0 +1,260 @@
+import queue
+import threading
+import time
+from visionassist.config import PIPELINE_QUEUE_SIZE, RETENTION_ENABLED
+from visionassist.logger import logger
+from visionassist.memory.retention import RetentionWorker
+from visionassist.model.batcher import FrameBatcher, detect_frames
+from visionassist.model.tracker import events_to_objects
+
+
+def video_frames(source=0):
+    """
+    Yield frames from a camera index or video file until the stream ends.
+
+    Args:
+        source: Camera index or path to a video file
+    """
+    import cv2
+    capture = cv2.VideoCapture(source)
+    if not capture.isOpened():
+        raise ValueError(f"Unable to open video source: {source}")
+    try:
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            yield frame
+    finally:
+        capture.release()
+
+
+class LatestQueue(queue.Queue):
+    """Bounded queue that drops its oldest item instead of blocking the producer."""
+
+    def __init__(self, maxsize:int=PIPELINE_QUEUE_SIZE):
+        super().__init__(maxsize=maxsize)
+        self.dropped = 0
+
+    def put_latest(self, item):
+        """Enqueue `item`, evicting the oldest entries if the queue is full."""
+        while True:
+            try:
+                self.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+
+class StageStats:
+    """Throughput counters for a single pipeline stage."""
+
+    def __init__(self, name:str):
+        self.name = name
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.started_at = None
+        self.stopped_at = None
+
+    def snapshot(self, input_queue:LatestQueue=None):
+        end = self.stopped_at or time.monotonic()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            "processed": self.processed,
+            "errors": self.errors,
+            "dropped": input_queue.dropped if input_queue is not None else 0,
+            "queue_depth": input_queue.qsize() if input_queue is not None else 0,
+            "throughput_fps": self.processed / elapsed if elapsed > 0 else 0.0,
+            "busy_ms": self.busy_seconds * 1000,
+        }
+
+
+class StreamingPipeline:
+    """
+    Capture -> detect -> annotate/save -> persist pipeline.
+
+    Every stage runs on its own thread and hands work to the next one through a
+    bounded `LatestQueue`. Capture and detect drop the oldest queued frame when
+    the next stage falls behind, so a slow disk or database drops stale frames
+    instead of stalling detection. Saved images are never dropped: save blocks
+    until persist has room, so every saved image gets its database row.
+    Detect pulls the queued frames in batches, so a detector with
+    `detect_batch` runs them through one model call.
+    """
+
+    STAGES = ("capture", "detect", "save", "persist")
+
+    def __init__(self, frames, detector, database=None, queue_size:int=PIPELINE_QUEUE_SIZE, tracker=None, retention=RETENTION_ENABLED,
+                 batcher=True):
+        """
+        Args:
+            frames: Any iterable of BGR frames (camera, video file, synthetic frames)
+            detector: Object exposing `detect(frame)` and `save_with_bbox(frame, detections)`
+            database: Object exposing `insert_detection(image_path, objects, frame_size=None)`, optional
+            queue_size: Bound of every inter-stage queue
+            tracker: Optional ObjectTracker; when set, only objects that appeared or
+                moved are saved and persisted instead of every detection of every frame
+            retention: True to trim `database` with a default RetentionWorker while
+                the pipeline runs, a configured RetentionWorker, or False
+            batcher: True to batch frames with a default FrameBatcher when the
+                detector has `detect_batch`, a configured FrameBatcher, or False
+        """
+        self.frames = frames
+        self.detector = detector
+        self.database = database
+        self.tracker = tracker
+        if retention is True:
+            retention = RetentionWorker(database) if database is not None else None
+        self.retention = retention or None
+        if batcher is True:
+            batcher = FrameBatcher() if hasattr(detector, "detect_batch") else None
+        self.batcher = batcher or None
+
+        self.queues = {
+            "detect": LatestQueue(queue_size),
+            "save": LatestQueue(queue_size),
+            "persist": LatestQueue(queue_size),
+        }
+        self.stats = {name: StageStats(name) for name in self.STAGES}
+        self._done = {name: threading.Event() for name in self.STAGES}
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Start all stage workers."""
+        if self._threads:
+            raise RuntimeError("Pipeline already started.")
+
+        targets = {
+            "capture": self._capture,
+            "detect": self._detect,
+            "save": self._save,
+            "persist": self._persist,
+        }
+        for name in self.STAGES:
+            self.stats[name].started_at = time.monotonic()
+            thread = threading.Thread(target=targets[name], name=f"pipeline-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self.retention is not None:
+            self.retention.start()
+
+        logger.info("Streaming pipeline started.")
+
+    def stop(self):
+        """Stop reading new frames; queued work is still drained."""
+        self._stop.set()
+
+    def join(self, timeout:float=None):
+        """Wait for every stage to finish. Returns True if all stages finished."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+        finished = all(not thread.is_alive() for thread in self._threads)
+        if finished and self.retention is not None:
+            self.retention.stop()
+        return finished
+
+    def run(self):
+        """Run the pipeline until the frame source is exhausted and return the stats."""
+        self.start()
+        self.join()
+        return self.get_stats()
+
+    def get_stats(self):
+        """Per-stage throughput, drop counts and current queue depth."""
+        return {
+            name: self.stats[name].snapshot(self.queues.get(name))
+            for name in self.STAGES
+        }
+
+    def _capture(self):
+        stats = self.stats["capture"]
+        try:
+            for frame in self.frames:
+                if self._stop.is_set():
+                    break
+                self.queues["detect"].put_latest(frame)
+                stats.processed += 1
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"Frame capture failed: {e}")
+        finally:
+            stats.stopped_at = time.monotonic()
+            self._done["capture"].set()
+
+    def _consume(self, name:str, upstream:str, handler, batcher:FrameBatcher=None):
+        """
+        Drain this stage's queue until the upstream stage is done and the queue is empty.
+
+        With a `batcher`, `handler` gets a list of queued items instead of one item.
+        """
+        stats = self.stats[name]
+        input_queue = self.queues[name]
+        try:
+            while True:
+                if batcher is not None:
+                    items = batcher.collect(input_queue, timeout=0.05)
+                else:
+                    try:
+                        items = [input_queue.get(timeout=0.05)]
+                    except queue.Empty:
+                        items = []
+                if not items:
+                    if self._done[upstream].is_set() and input_queue.empty():
+                        break
+                    continue
+
+                start = time.monotonic()
+                try:
+                    handler(items if batcher is not None else items[0])
+                    stats.processed += len(items)
+                except Exception as e:
+                    stats.errors += len(items)
+                    logger.error(f"Pipeline stage '{name}' failed: {e}")
+                stats.busy_seconds += time.monotonic() - start
+        finally:
+            stats.stopped_at = time.monotonic()
+            self._done[name].set()
+
+    def _detect(self):
+        def handle(frame):
+            track(frame, self.detector.detect(frame))
+
+        def handle_batch(frames):
+            for frame, detections in zip(frames, detect_frames(self.detector, frames)):
+                track(frame, detections)
+
+        def track(frame, detections):
+            if self.tracker is not None:
+                detections = events_to_objects(self.tracker.update(detections))
+            if detections:
+                self.queues["save"].put_latest((frame, detections))
+
+        if self.batcher is not None:
+            self._consume("detect", "capture", handle_batch, self.batcher)
+        else:
+            self._consume("detect", "capture", handle)
+
+    def _save(self):
+        def handle(item):
+            frame, detections = item
+            image_path = self.detector.save_with_bbox(frame, detections)
+            if self.database is not None:
+                # blocking put: the image is already on disk, dropping its row would orphan it
+                self.queues["persist"].put((image_path, detections, (frame.shape[1], frame.shape[0])))
+
+        self._consume("save", "detect", handle)
+
+    def _persist(self):
+        def handle(item):
+            image_path, detections, frame_size = item
+            self.database.insert_detection(image_path, detections, frame_size=frame_size)
+
+        self._consume("persist", "save", handle)
@@ -0,0 +1,50 @@
+import io
+from math import gcd
+import numpy as np
+import soundfile as sf
+
+# Whisper models expect 16 kHz mono float32 audio in [-1, 1]
+WHISPER_SAMPLE_RATE = 16000
+
+
+def to_whisper_audio(audio:np.ndarray, samplerate:int):
+    """
+    Convert a PCM buffer into Whisper's input format without touching disk.
+
+    Args:
+        audio: (samples,) or (samples, channels) array, float or integer PCM
+        samplerate: Sample rate of `audio`
+
+    Returns:
+        np.ndarray: 16 kHz mono float32 audio
+    """
+    audio = np.asarray(audio)
+
+    if np.issubdtype(audio.dtype, np.integer):
+        audio = audio.astype(np.float32) / np.iinfo(audio.dtype).max
+    else:
+        audio = audio.astype(np.float32, copy=False)
+
+    if audio.ndim == 2:
+        audio = audio.mean(axis=1, dtype=np.float32)
+
+    if samplerate != WHISPER_SAMPLE_RATE:
+        from scipy.signal import resample_poly  # scipy.signal takes about a second to import
+        divisor = gcd(int(samplerate), WHISPER_SAMPLE_RATE)
+        audio = resample_poly(audio, WHISPER_SAMPLE_RATE // divisor, int(samplerate) // divisor).astype(np.float32)
+
+    return np.ascontiguousarray(audio)
+
+
+def decode_audio_bytes(audio_bytes:bytes):
+    """Decode an in-memory WAV/FLAC/OGG file into Whisper's input format."""
+    audio, samplerate = sf.read(io.BytesIO(audio_bytes), dtype="float32", always_2d=False)
+    return to_whisper_audio(audio, samplerate)
+
+
+def decode_pcm_bytes(pcm_bytes:bytes, samplerate:int, channels:int=1, dtype=np.int16):
+    """Decode headerless interleaved PCM into Whisper's input format."""
+    audio = np.frombuffer(pcm_bytes, dtype=dtype)
+    if channels > 1:
+        audio = audio.reshape(-1, channels)
+    return to_whisper_audio(audio, samplerate)
@@ -0,0 +1,158 @@
+import asyncio
+import io
+import os
+import threading
+import requests
+import soundfile as sf
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from visionassist.config import (
+    WHISPER_API_TIMEOUT_S, WHISPER_API_RETRIES, WHISPER_API_BACKOFF_S, WHISPER_API_POOL_SIZE,
+    WHISPER_API_MAX_CONCURRENCY, WHISPER_API_UPLOAD_FORMAT
+)
+from visionassist.stt.audio import WHISPER_SAMPLE_RATE, to_whisper_audio
+from visionassist.logger import logger
+
+_UPLOAD_TYPES = {
+    "FLAC": ("audio.flac", "audio/flac"),
+    "WAV": ("audio.wav", "audio/wav"),
+}
+
+
+def encode_upload(audio, samplerate:int, upload_format:str=WHISPER_API_UPLOAD_FORMAT):
+    """Encode a PCM buffer as 16 kHz mono FLAC or 16-bit WAV for upload."""
+    buffer = io.BytesIO()
+    sf.write(buffer, to_whisper_audio(audio, samplerate), WHISPER_SAMPLE_RATE, format=upload_format, subtype="PCM_16")
+    filename, mime = _UPLOAD_TYPES[upload_format]
+    return filename, buffer.getvalue(), mime
+
+
+class WhisperAPIClient:
+    """
+    Pooled keep-alive HTTP client for the online Whisper API.
+
+    Requests share one `requests.Session`, time out, are retried with
+    exponential backoff on connection errors and 429/5xx responses, and at most
+    `max_concurrency` are in flight at once. Audio is downsampled to 16 kHz mono
+    and compressed before upload when `upload_format` is set.
+    """
+
+    def __init__(
+        self,
+        url:str,
+        api_key:str,
+        timeout=WHISPER_API_TIMEOUT_S,
+        retries:int=WHISPER_API_RETRIES,
+        backoff:float=WHISPER_API_BACKOFF_S,
+        pool_size:int=WHISPER_API_POOL_SIZE,
+        max_concurrency:int=WHISPER_API_MAX_CONCURRENCY,
+        upload_format:str=WHISPER_API_UPLOAD_FORMAT,
+    ):
+        if not url or not api_key:
+            raise ValueError("API URL and API key must be set for online mode.")
+        if upload_format is not None and upload_format not in _UPLOAD_TYPES:
+            raise ValueError(f"upload_format must be one of {list(_UPLOAD_TYPES)} or None")
+
+        self.url = url
+        self.timeout = timeout
+        self.upload_format = upload_format
+        self.max_concurrency = max_concurrency
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {api_key}"
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def prepare_upload(self, audio_path:str=None, audio_bytes:bytes=None, audio=None, samplerate:int=None):
+        """
+        Build the (filename, bytes, mime) file tuple to upload.
+        Input that soundfile cannot decode is uploaded unchanged.
+        """
+        if audio is not None:
+            if samplerate is None:
+                raise ValueError("samplerate is required with audio arrays.")
+            return encode_upload(audio, samplerate, self.upload_format or "WAV")
+
+        if audio_bytes:
+            filename, data, mime = "audio.wav", audio_bytes, "audio/wav"
+        elif audio_path:
+            if not isinstance(audio_path, str) or not os.path.isfile(audio_path):
+                raise ValueError("audio_path must be a string representing the file path.")
+            filename, mime = os.path.basename(audio_path), None
+            with open(audio_path, 'rb') as f:
+                data = f.read()
+        else:
+            raise ValueError("Either audio_path, audio_bytes or audio must be provided.")
+
+        if self.upload_format is not None:
+            try:
+                decoded, source_rate = sf.read(io.BytesIO(data), dtype="float32")
+                return encode_upload(decoded, source_rate, self.upload_format)
+            except Exception as e:
+                logger.debug(f"Uploading audio unchanged, could not re-encode it: {e}")
+
+        return filename, data, mime
+
+    def transcribe(self, audio_path:str=None, audio_bytes:bytes=None, audio=None, samplerate:int=None):
+        """
+        Send audio to the API and return its JSON response.
+        Raises on network errors and non-200 responses (after retries).
+        """
+        upload = self.prepare_upload(audio_path=audio_path, audio_bytes=audio_bytes, audio=audio, samplerate=samplerate)
+
+        with self._slots:
+            response = self.session.post(self.url, files={"file": upload}, timeout=self.timeout)
+
+        if response.status_code != 200:
+            raise Exception(f"API request failed with status code {response.status_code}: {response.text}")
+
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncWhisperAPIClient:
+    """
+    asyncio front end for `WhisperAPIClient`.
+
+    Uploads run on worker threads over the same pooled session, with an
+    `asyncio.Semaphore` bounding the requests in flight.
+    """
+
+    def __init__(self, url:str, api_key:str, max_concurrency:int=WHISPER_API_MAX_CONCURRENCY, **client_kwargs):
+        self.client = WhisperAPIClient(url, api_key, max_concurrency=max_concurrency, **client_kwargs)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def transcribe(self, audio_path:str=None, audio_bytes:bytes=None, audio=None, samplerate:int=None):
+        async with self._semaphore:
+            return await asyncio.to_thread(
+                self.client.transcribe,
+                audio_path=audio_path, audio_bytes=audio_bytes, audio=audio, samplerate=samplerate,
+            )
+
+    async def close(self):
+        self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -1,27 +1,55 @@
 import os
 import time
-import whisper
-import requests
-import io
+import tempfile
+import numpy as np
+from visionassist.config import MODEL_LOAD_MODE
+from visionassist.loader import ModelLoader
+from visionassist import metrics
+from visionassist.stt.audio import WHISPER_SAMPLE_RATE, to_whisper_audio, decode_audio_bytes
+from visionassist.stt.client import WhisperAPIClient
 from visionassist.logger import logger
 
+def load_whisper(model_size:str):
+    """Import whisper (and torch) only when the offline model is actually loaded."""
+    import whisper
+    return whisper.load_model(model_size)
+
 class SpeechToTextModel:
-    def __init__(self, url:str=None, api_key:str=None, model_size:str="base.en", mode:str="offline"):
-        self.model = None
+    def __init__(self, url:str=None, api_key:str=None, model_size:str="base.en", mode:str="offline", load_mode:str=MODEL_LOAD_MODE):
+        """
+        Args:
+            load_mode: How the offline model is loaded: 'eager', 'background' or
+                'lazy' (see ModelLoader)
+        """
+        self.loader = None
         self.mode = mode
         if mode not in ["offline", "online"]:
             raise ValueError("Mode must be either 'offline' or 'online'")
         if mode == "online":
             self.url = url
             self.api_key = api_key
+            self.client = WhisperAPIClient(url, api_key) if url and api_key else None
             logger.info("Whisper initialized for online transcription.")
         else:
-            self.model = whisper.load_model(model_size, )
-            logger.info(f"Whisper model '{model_size}' loaded for offline transcription.")
+            self.loader = ModelLoader(lambda: load_whisper(model_size), name=f"Whisper model '{model_size}'", mode=load_mode)
+
+    @property
+    def model(self):
+        """The offline whisper model (None in online mode); blocks until it is loaded."""
+        return self.loader.get() if self.loader is not None else None
+
+    def is_ready(self):
+        """True once transcription will not wait on model loading."""
+        return self.loader is None or self.loader.is_ready()
+
+    def wait_ready(self, timeout:float=None):
+        return self.loader is None or self.loader.wait_ready(timeout)
 
     def transcribe_from_file(self, audio_path:str=None, audio_bytes:bytes=None):
         """
         Transcribe audio using offline model from file path or bytes.
+        Bytes are decoded in memory; only formats libsndfile cannot read
+        fall back to a private temporary file.
         
         Args:
             audio_path: Path to audio file (optional if audio_bytes provided)
@@ -31,43 +59,66 @@ class SpeechToTextModel:
             if not self.model:
                 raise ValueError("Whisper model is not loaded for offline transcription.")
             
-            # Create temp file if using bytes
-            temp_file = None
             if audio_bytes:
-                temp_file = "temp_offline_audio.wav"
-                with open(temp_file, 'wb') as f:
-                    f.write(audio_bytes)
-                audio_path = temp_file
+                try:
+                    audio = decode_audio_bytes(audio_bytes)
+                except Exception as decode_error:
+                    logger.warning(f"In-memory decode failed, falling back to a temporary file: {decode_error}")
+                    return self._transcribe_via_temp_file(audio_bytes)
+                return self.transcribe_from_array(audio)
             elif audio_path:
                 if not isinstance(audio_path, str) or not os.path.isfile(audio_path):
                     raise ValueError("audio_path must be a string representing the file path.")
             else:
                 raise ValueError("Either audio_path or audio_bytes must be provided.")
             
-            start_time = time.time()
-            result = self.model.transcribe(audio_path)
-            end_time = time.time()
-            
-            # Clean up temp file if created
-            if temp_file:
-                try:
-                    os.remove(temp_file)
-                except Exception as cleanup_error:
-                    logger.warning(f"Failed to remove temporary file: {cleanup_error}")
-            
-            transcription = result['text']
-            processing_time = end_time - start_time
-            
-            return {
-                "transcription": { "text" : transcription },
-                "timing":{
-                    "transcribe_ms": processing_time * 1000
-                }
-            }
+            return self._transcribe(audio_path)
         except Exception as e:
             logger.error(e)
             return None
 
+    def transcribe_from_array(self, audio:np.ndarray, samplerate:int=WHISPER_SAMPLE_RATE):
+        """
+        Transcribe a PCM buffer (e.g. from `AudioRecorder.get_audio_array`) with the offline model.
+
+        Args:
+            audio: (samples,) or (samples, channels) float or integer PCM
+            samplerate: Sample rate of `audio`; resampled to 16 kHz if needed
+        """
+        try:
+            if not self.model:
+                raise ValueError("Whisper model is not loaded for offline transcription.")
+
+            return self._transcribe(to_whisper_audio(audio, samplerate))
+        except Exception as e:
+            logger.error(e)
+            return None
+
+    def _transcribe_via_temp_file(self, audio_bytes:bytes):
+        """Let whisper/ffmpeg decode formats soundfile cannot read."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_file = os.path.join(temp_dir, "audio")
+            with open(temp_file, 'wb') as f:
+                f.write(audio_bytes)
+            return self._transcribe(temp_file)
+
+    @metrics.timed("stt.transcribe")
+    def _transcribe(self, audio):
+        start_time = time.time()
+        result = self.model.transcribe(audio)
+        end_time = time.time()
+        
+        transcription = result['text']
+        processing_time = end_time - start_time
+        
+        return {
+            "transcription": { "text" : transcription },
+            "timing":{
+                "transcribe_ms": processing_time * 1000
+            }
+        }
+
+    @metrics.timed("stt.transcribe_api")
     def transcribe_from_api(self, audio_path:str=None, audio_bytes:bytes=None):
         """
         Transcribe audio using online API from file path or bytes.
@@ -77,38 +128,10 @@ class SpeechToTextModel:
             audio_bytes: Audio data as bytes (optional if audio_path provided)
         """
         try:
-            if not hasattr(self, 'url') or not hasattr(self, 'api_key') or not self.url or not self.api_key:
+            if not getattr(self, 'client', None):
                 raise ValueError("API URL and API key must be set for online mode.")
             
-            headers = { "Authorization": f"Bearer {self.api_key}" }
-            
-            if audio_bytes:
-                # Use bytes directly with io.BytesIO
-                audio_file = io.BytesIO(audio_bytes)
-                response = requests.post(
-                    self.url, 
-                    headers=headers, 
-                    files={"file": ("audio.wav", audio_file, "audio/wav")}
-                )
-            elif audio_path:
-                # Use file path
-                if not isinstance(audio_path, str) or not os.path.isfile(audio_path):
-                    raise ValueError("audio_path must be a string representing the file path.")
-                
-                with open(audio_path, 'rb') as f:
-                    response = requests.post(
-                        self.url, 
-                        headers=headers, 
-                        files={"file": f}
-                    )
-            else:
-                raise ValueError("Either audio_path or audio_bytes must be provided.")
-            
-            if response.status_code != 200:
-                raise Exception(f"API request failed with status code {response.status_code}: {response.text}")
-            
-            data = response.json()
-            return data
+            return self.client.transcribe(audio_path=audio_path, audio_bytes=audio_bytes)
             
         except Exception as e:
             logger.error(e)
@@ -117,7 +140,7 @@ class SpeechToTextModel:
     def transcribe_from_bytes(self, audio_bytes: bytes):
         """
         Transcribe audio from bytes for both online and offline modes.
-        Uses in-memory processing for online mode, creates temp file only for offline.
+        Both modes process the bytes in memory.
         
         Args:
             audio_bytes: Audio data as bytes in WAV format
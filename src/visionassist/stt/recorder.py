@@ -1,11 +1,13 @@
 import threading
+import time
 import sounddevice as sd
 import soundfile as sf
-import queue
 import inquirer
 import io
 import numpy as np
 
+from visionassist.config import AUDIO_MAX_SECONDS, AUDIO_PREROLL_SECONDS
+from visionassist.stt.ring_buffer import AudioRingBuffer
 from visionassist.logger import logger
 
 def pick_audio_input():
@@ -81,9 +83,19 @@ def pick_audio_input():
 
 class AudioRecorder:
     
-    def __init__(self, output_file="recorded_audio.wav", samplerate=44100):
+    def __init__(self, output_file="recorded_audio.wav", samplerate=44100, max_seconds=AUDIO_MAX_SECONDS, preroll_seconds=AUDIO_PREROLL_SECONDS, write_file=True):
+        """
+        Args:
+            output_file: WAV file written while recording (if write_file is True)
+            samplerate: Recording sample rate
+            max_seconds: Length of the preallocated ring buffer; caps memory use
+            preroll_seconds: Audio from before `start_recording` kept while armed
+            write_file: Stream the recording to `output_file` from the ring buffer
+        """
         self.output_file = output_file
         self.samplerate = samplerate
+        self.write_file = write_file
+        self.preroll_samples = int(preroll_seconds * samplerate)
         
         # Select device once during initialization
         self.device = pick_audio_input()
@@ -95,28 +107,72 @@ class AudioRecorder:
         
         # Recording state
         self.recording = False
-        self.audio_queue = queue.Queue()
-        self.audio_data = []  # Store audio chunks for in-memory processing
+        self.armed = False
+        self.ring = AudioRingBuffer(int(max_seconds * samplerate) + self.preroll_samples, self.channels)
+        self.start_position = 0  # ring position where the current recording starts
+        self._file_position = 0  # ring position the file writer has reached
         self.writer = None
         self.stream = None
         self.write_thread = None
+        self.chunk_listeners = []  # called with every recorded chunk, e.g. StreamingTranscriber.push
         
         logger.info(f"AudioRecorder initialized with: {self.device_info['name']}")
     
     def _audio_callback(self, indata, frames, time, status):
-        """Callback function for audio stream."""
+        """Callback function for audio stream: one copy, straight into the ring buffer."""
+        self.ring.write(indata)
         if self.recording:
-            self.audio_queue.put(indata.copy())
-            self.audio_data.append(indata.copy())  # Also store for in-memory access
+            for listener in self.chunk_listeners:
+                listener(indata[:, 0].copy())
     
+    def add_chunk_listener(self, listener):
+        """
+        Register a callable receiving every recorded mono chunk while recording.
+        It runs on the audio callback thread, so it must return quickly.
+        """
+        self.chunk_listeners.append(listener)
+
+    def _open_stream(self):
+        if self.stream is None:
+            self.stream = sd.InputStream(
+                samplerate=self.samplerate,
+                channels=self.channels,
+                device=self.device,
+                callback=self._audio_callback
+            )
+            self.stream.start()
+
+    def _close_stream(self):
+        # stop() waits for pending callbacks, so the ring is complete afterwards
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+        self.armed = False
+
+    def arm(self):
+        """
+        Start listening without recording, so `start_recording` can include
+        `preroll_seconds` of audio captured just before it was called.
+        """
+        self._open_stream()
+        self.armed = True
+
     def _write_audio(self):
-        """Background thread that writes audio data to file."""
+        """Background thread that streams new ring buffer samples to the file."""
+        position = self.start_position
         while self.recording:
-            try:
-                data = self.audio_queue.get(timeout=0.1)
-                self.writer.write(data)
-            except queue.Empty:
-                pass
+            position = self._drain_to_file(position)
+            time.sleep(0.1)
+        self._file_position = position
+
+    def _drain_to_file(self, position):
+        data, actual_start = self.ring.read(position)
+        if actual_start > position:
+            logger.warning(f"Audio file writer fell behind; {actual_start - position} samples lost.")
+        if len(data):
+            self.writer.write(data)
+        return actual_start + len(data)
     
     def start_recording(self):
         """Start audio recording."""
@@ -124,29 +180,23 @@ class AudioRecorder:
             logger.info("Already recording!")
             return
         
-        # Clear previous audio data
-        self.audio_data = []
+        preroll = self.preroll_samples if self.armed else 0
+        self.start_position = max(self.ring.written - preroll, self.ring.oldest())
         
+        self._open_stream()
         self.recording = True
-        self.writer = sf.SoundFile(
-            self.output_file,
-            mode='w',
-            samplerate=self.samplerate,
-            channels=self.channels
-        )
-        
-        self.stream = sd.InputStream(
-            samplerate=self.samplerate,
-            channels=self.channels,
-            device=self.device,
-            callback=self._audio_callback
-        )
-        self.stream.start()
         
         logger.info(f"Recording started ... ")
         
-        self.write_thread = threading.Thread(target=self._write_audio, daemon=True)
-        self.write_thread.start()
+        if self.write_file:
+            self.writer = sf.SoundFile(
+                self.output_file,
+                mode='w',
+                samplerate=self.samplerate,
+                channels=self.channels
+            )
+            self.write_thread = threading.Thread(target=self._write_audio, daemon=True)
+            self.write_thread.start()
     
     def stop_recording(self, return_bytes=False):
         """
@@ -162,20 +212,11 @@ class AudioRecorder:
             logger.info("Not recording currently!")
             return None
         
-        self.recording = False
-        logger.info("Stopping recording...")
+        if not self.write_file:
+            all_audio = self._stop_in_memory()
+            return self._encode_wav(all_audio) if return_bytes else None
         
-        if self.stream is not None:
-            self.stream.stop()
-            self.stream.close()
-            self.stream = None
-        
-        # Flush any remaining audio
-        while not self.audio_queue.empty():
-            self.writer.write(self.audio_queue.get())
-        
-        self.writer.close()
-        self.writer = None
+        self._stop_in_memory()
         
         logger.info(f"Recording saved to: {self.output_file}")
         
@@ -187,6 +228,26 @@ class AudioRecorder:
         
         return None
     
+    def get_audio_array(self):
+        """
+        Stop recording and hand over the recorded samples without any WAV encoding.
+        Feed the result to `SpeechToTextModel.transcribe_from_array`.
+
+        Returns:
+            tuple: (np.ndarray of shape (samples, channels), samplerate), or None if not recording
+        """
+        if not self.recording:
+            logger.info("Not recording currently!")
+            return None
+
+        all_audio = self._stop_in_memory()
+        if all_audio is None:
+            all_audio = np.zeros((0, self.channels), dtype=np.float32)
+
+        logger.info(f"Recording completed. Audio samples: {len(all_audio)}")
+
+        return all_audio, self.samplerate
+
     def get_audio_bytes_in_memory(self):
         """
         Stop recording and return audio bytes without saving to disk.
@@ -199,25 +260,17 @@ class AudioRecorder:
             logger.info("Not recording currently!")
             return None
         
-        self.recording = False
-        logger.info("Stopping recording...")
+        audio_bytes = self._encode_wav(self._stop_in_memory())
         
-        if self.stream is not None:
-            self.stream.stop()
-            self.stream.close()
-            self.stream = None
-        
-        # Wait a bit for any remaining callbacks
-        import time as time_module
-        time_module.sleep(0.1)
+        logger.info(f"Recording completed. Audio size: {len(audio_bytes)} bytes")
         
-        # Create in-memory buffer
+        return audio_bytes
+
+    def _encode_wav(self, all_audio):
+        """Encode recorded samples as WAV bytes in memory."""
         audio_buffer = io.BytesIO()
         
-        # Write all collected audio data to in-memory buffer
-        if self.audio_data:
-            all_audio = np.concatenate(self.audio_data, axis=0)
-            
+        if all_audio is not None:
             with sf.SoundFile(
                 audio_buffer,
                 mode='w',
@@ -227,22 +280,29 @@ class AudioRecorder:
             ) as writer_mem:
                 writer_mem.write(all_audio)
         
-        # Close the file writer if it was open
-        if self.writer is not None:
-            self.writer.close()
-            self.writer = None
-        
-        # Clear the queue
-        while not self.audio_queue.empty():
-            self.audio_queue.get()
-        
-        # Get bytes from buffer
         audio_bytes = audio_buffer.getvalue()
         audio_buffer.close()
+        return audio_bytes
+
+    def _stop_in_memory(self):
+        """Stop the stream and return the recording from the ring buffer (None if empty)."""
+        self.recording = False
+        logger.info("Stopping recording...")
         
-        logger.info(f"Recording completed. Audio size: {len(audio_bytes)} bytes")
+        self._close_stream()
         
-        return audio_bytes
+        all_audio, actual_start = self.ring.read(self.start_position)
+        if actual_start > self.start_position:
+            logger.warning(f"Recording exceeded the ring buffer; the first {(actual_start - self.start_position) / self.samplerate:.1f} s were dropped.")
+        
+        # Finish the file from the same buffer
+        if self.writer is not None:
+            self.write_thread.join()
+            self._drain_to_file(self._file_position)
+            self.writer.close()
+            self.writer = None
+        
+        return all_audio if len(all_audio) else None
     
     def is_recording(self):
         """Check if currently recording."""
@@ -251,4 +311,5 @@ class AudioRecorder:
     def cleanup(self):
         """Cleanup resources."""
         if self.recording:
-            self.stop_recording()
\ No newline at end of file
+            self.stop_recording()
+        self._close_stream()
\ No newline at end of file
@@ -0,0 +1,68 @@
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Preallocated single-producer ring buffer for audio samples.
+
+    The audio callback is the only writer: it copies each block straight into
+    the preallocated array and then advances `written`, the total number of
+    samples ever written. Readers address samples by that absolute position,
+    so no lock is shared with the callback; a reader only has to notice when
+    the span it asks for was already overwritten.
+    """
+
+    def __init__(self, capacity:int, channels:int=1, dtype=np.float32):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1 sample")
+        self.capacity = capacity
+        self.channels = channels
+        self._buffer = np.zeros((capacity, channels), dtype=dtype)
+        self.written = 0
+
+    def write(self, block:np.ndarray):
+        """Copy a (samples, channels) block in, overwriting the oldest samples when full."""
+        n = len(block)
+        if n == 0:
+            return
+        if n > self.capacity:
+            block = block[-self.capacity:]
+
+        start = (self.written + n - len(block)) % self.capacity
+        first = min(len(block), self.capacity - start)
+        self._buffer[start:start + first] = block[:first]
+        if first < len(block):
+            self._buffer[:len(block) - first] = block[first:]
+
+        # publish only after the samples are in place
+        self.written += n
+
+    def oldest(self):
+        """Absolute position of the oldest sample still held."""
+        return max(0, self.written - self.capacity)
+
+    def read(self, start:int, end:int=None):
+        """
+        Copy samples in the absolute range [start, end).
+
+        Returns:
+            tuple: (samples, actual_start); actual_start is later than `start`
+                if part of the range was already overwritten
+        """
+        end = self.written if end is None else min(end, self.written)
+        start = max(start, self.oldest())
+        if end <= start:
+            return np.zeros((0, self.channels), dtype=self._buffer.dtype), start
+
+        first_idx = start % self.capacity
+        n = end - start
+        if first_idx + n <= self.capacity:
+            data = self._buffer[first_idx:first_idx + n].copy()
+        else:
+            data = np.concatenate([self._buffer[first_idx:], self._buffer[:first_idx + n - self.capacity]])
+
+        # the writer may have lapped us while copying; drop whatever got overwritten
+        overwritten = self.oldest() - start
+        if overwritten > 0:
+            return data[overwritten:], start + overwritten
+        return data, start
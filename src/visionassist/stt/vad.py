@@ -0,0 +1,236 @@
+import queue
+import threading
+from collections import deque
+import numpy as np
+import soundfile as sf
+from visionassist.config import (
+    VAD_FRAME_MS, VAD_ENERGY_THRESHOLD, VAD_MIN_SILENCE_MS, VAD_MIN_SPEECH_MS,
+    VAD_PREROLL_MS, VAD_MAX_UTTERANCE_S, VAD_PARTIAL_INTERVAL_S
+)
+from visionassist.logger import logger
+
+PARTIAL = "partial"
+FINAL = "final"
+
+
+def iter_audio_chunks(audio_path:str, blocksize:int=1024):
+    """
+    Yield mono float32 chunks from an audio file, mimicking the recorder callback.
+    Use `sf.info(audio_path).samplerate` for the matching sample rate.
+    """
+    for block in sf.blocks(audio_path, blocksize=blocksize, dtype="float32", always_2d=True):
+        yield block.mean(axis=1, dtype=np.float32)
+
+
+class UtteranceSegmenter:
+    """
+    Energy-based voice-activity segmenter over arbitrary-sized audio chunks.
+
+    Audio is analysed in `frame_ms` frames; a frame whose RMS exceeds
+    `threshold` is speech. An utterance starts at the first speech frame
+    (plus some pre-roll) and ends after `min_silence_ms` of silence or when it
+    reaches `max_utterance_s`.
+    """
+
+    def __init__(
+        self,
+        samplerate:int,
+        threshold:float=VAD_ENERGY_THRESHOLD,
+        frame_ms:int=VAD_FRAME_MS,
+        min_silence_ms:int=VAD_MIN_SILENCE_MS,
+        min_speech_ms:int=VAD_MIN_SPEECH_MS,
+        preroll_ms:int=VAD_PREROLL_MS,
+        max_utterance_s:float=VAD_MAX_UTTERANCE_S,
+        partial_interval_s:float=VAD_PARTIAL_INTERVAL_S,
+    ):
+        self.samplerate = samplerate
+        self.threshold = threshold
+        self.frame_ms = frame_ms
+        self.frame_size = max(1, int(samplerate * frame_ms / 1000))
+        self.min_silence_ms = min_silence_ms
+        self.min_speech_ms = min_speech_ms
+        self.max_utterance_ms = max_utterance_s * 1000
+        self.partial_interval_ms = partial_interval_s * 1000 if partial_interval_s else None
+
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._preroll = deque(maxlen=max(1, preroll_ms // frame_ms))
+        self._position = 0  # samples analysed so far
+        self._reset_utterance()
+
+    def _reset_utterance(self):
+        self._speech = None
+        self._start = 0
+        self._speech_ms = 0
+        self._silence_ms = 0
+        self._since_partial_ms = 0
+
+    def feed(self, chunk:np.ndarray):
+        """
+        Analyse a chunk of mono audio.
+
+        Returns:
+            list: (kind, audio, start_s, end_s) tuples, kind being "partial" or "final"
+        """
+        samples = np.concatenate([self._remainder, np.asarray(chunk, dtype=np.float32).reshape(-1)])
+        n_frames = len(samples) // self.frame_size
+        self._remainder = samples[n_frames * self.frame_size:]
+
+        events = []
+        for i in range(n_frames):
+            frame = samples[i * self.frame_size:(i + 1) * self.frame_size]
+            event = self._process_frame(frame)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def flush(self):
+        """End of stream: close any open utterance. Returns the same tuples as `feed`."""
+        events = []
+        if len(self._remainder):
+            frame = np.pad(self._remainder, (0, self.frame_size - len(self._remainder)))
+            self._remainder = np.zeros(0, dtype=np.float32)
+            event = self._process_frame(frame)
+            if event is not None:
+                events.append(event)
+        if self._speech is not None:
+            event = self._finish()
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _process_frame(self, frame):
+        voiced = float(np.sqrt(np.mean(frame * frame))) >= self.threshold
+        self._position += len(frame)
+
+        if self._speech is None:
+            self._preroll.append(frame)
+            if voiced:
+                self._speech = list(self._preroll)
+                self._start = self._position - len(self._speech) * self.frame_size
+                self._speech_ms = self.frame_ms
+                self._preroll.clear()
+            return None
+
+        self._speech.append(frame)
+        self._since_partial_ms += self.frame_ms
+        if voiced:
+            self._speech_ms += self.frame_ms
+            self._silence_ms = 0
+        else:
+            self._silence_ms += self.frame_ms
+
+        duration_ms = len(self._speech) * self.frame_ms
+        if self._silence_ms >= self.min_silence_ms or duration_ms >= self.max_utterance_ms:
+            return self._finish()
+
+        if self.partial_interval_ms and self._since_partial_ms >= self.partial_interval_ms:
+            self._since_partial_ms = 0
+            return (PARTIAL, np.concatenate(self._speech), self._start / self.samplerate, self._position / self.samplerate)
+
+        return None
+
+    def _finish(self):
+        speech, speech_ms, start = self._speech, self._speech_ms, self._start
+        self._reset_utterance()
+        if speech_ms < self.min_speech_ms:
+            return None
+        return (FINAL, np.concatenate(speech), start / self.samplerate, self._position / self.samplerate)
+
+
+class StreamingTranscriber:
+    """
+    Cuts a live chunk stream into utterances and transcribes each one as it is spoken.
+
+    `feed` does the work on the caller's thread (handy for files and tests);
+    `start` + `push` move it to a worker thread so it can be attached to
+    `AudioRecorder.add_chunk_listener` without blocking the audio callback.
+    """
+
+    def __init__(self, transcribe, samplerate:int, segmenter:UtteranceSegmenter=None, on_result=None):
+        """
+        Args:
+            transcribe: Callable (audio, samplerate) -> str or a transcription dict, e.g.
+                `SpeechToTextModel.transcribe_from_array`
+            samplerate: Sample rate of the fed chunks
+            segmenter: Custom UtteranceSegmenter (defaults are taken from config)
+            on_result: Optional callable receiving every result dict
+        """
+        self.transcribe = transcribe
+        self.samplerate = samplerate
+        self.segmenter = segmenter or UtteranceSegmenter(samplerate)
+        self.on_result = on_result
+        self.results = queue.Queue()
+
+        self._chunks = queue.Queue()
+        self._thread = None
+
+    def feed(self, chunk:np.ndarray):
+        """Process one chunk synchronously and return the results it produced."""
+        return self._handle(self.segmenter.feed(chunk))
+
+    def flush(self):
+        """Close the open utterance (end of stream) and return its final result."""
+        return self._handle(self.segmenter.flush())
+
+    def transcribe_stream(self, chunks):
+        """Run a whole chunk iterator (e.g. `iter_audio_chunks`) and return every result."""
+        results = []
+        for chunk in chunks:
+            results.extend(self.feed(chunk))
+        results.extend(self.flush())
+        return results
+
+    def start(self):
+        """Process chunks passed to `push` on a background thread."""
+        self._thread = threading.Thread(target=self._run, name="streaming-stt", daemon=True)
+        self._thread.start()
+
+    def push(self, chunk:np.ndarray):
+        """Non-blocking hand-off of a chunk to the worker thread."""
+        self._chunks.put(chunk)
+
+    def stop(self, timeout:float=None):
+        """Flush the open utterance and stop the worker thread."""
+        self._chunks.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            chunk = self._chunks.get()
+            if chunk is None:
+                self.flush()
+                return
+            # coalesce backlog so a slow transcription doesn't fall further behind
+            chunks = [chunk]
+            while True:
+                try:
+                    chunk = self._chunks.get_nowait()
+                except queue.Empty:
+                    break
+                if chunk is None:
+                    self._chunks.put(None)
+                    break
+                chunks.append(chunk)
+            self.feed(np.concatenate(chunks))
+
+    def _handle(self, events):
+        results = []
+        for kind, audio, start_s, end_s in events:
+            try:
+                output = self.transcribe(audio, self.samplerate)
+            except Exception as e:
+                logger.error(f"Streaming transcription failed: {e}")
+                continue
+            if isinstance(output, dict):
+                output = output.get("transcription", {}).get("text", "")
+            if output is None:
+                continue
+
+            result = {"text": output, "final": kind == FINAL, "start_s": start_s, "end_s": end_s}
+            results.append(result)
+            self.results.put(result)
+            if self.on_result is not None:
+                self.on_result(result)
+        return results
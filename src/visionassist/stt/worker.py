@@ -0,0 +1,265 @@
+import itertools
+import multiprocessing as mp
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+from visionassist.config import WHISPER_MODEL_NAME, STT_WORKER_MAX_RESTARTS, STT_WORKER_RESTART_BACKOFF_S
+from visionassist.stt.audio import WHISPER_SAMPLE_RATE, to_whisper_audio
+from visionassist.logger import logger
+
+
+def load_whisper_model(model_size:str):
+    """Default model factory: an offline SpeechToTextModel (imports whisper in the worker only)."""
+    from visionassist.stt.model import SpeechToTextModel
+    return SpeechToTextModel(model_size=model_size, mode="offline", load_mode="eager")
+
+
+def _worker_main(model_factory, model_size, requests, responses, warmup):
+    """Entry point of the worker process: load once, then serve requests until None arrives."""
+    start = time.time()
+    try:
+        model = model_factory(model_size)
+        if warmup:
+            model.transcribe_from_array(np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32), WHISPER_SAMPLE_RATE)
+    except Exception as e:
+        responses.put(("failed", None, f"{type(e).__name__}: {e}", None))
+        return
+    responses.put(("ready", None, None, {"load_ms": (time.time() - start) * 1000}))
+
+    while True:
+        item = requests.get()
+        if item is None:
+            break
+
+        request_id, audio, submitted_at = item
+        started_at = time.time()
+        result = model.transcribe_from_array(audio, WHISPER_SAMPLE_RATE)
+        finished_at = time.time()
+
+        responses.put(("result", request_id, result, {
+            "queue_wait_ms": (started_at - submitted_at) * 1000,
+            "decode_ms": (finished_at - started_at) * 1000,
+        }))
+
+
+class SpeechToTextWorker:
+    """
+    Long-lived transcription process with a preloaded model.
+
+    Callers `submit` audio and get a `concurrent.futures.Future` back, so the
+    camera pipeline and voice loop never block on decoding. If the worker
+    process dies, pending requests fail and the worker is restarted after a
+    growing backoff, up to `max_restarts` times. If the model cannot be
+    loaded at all, every pending and later request fails with that error.
+    """
+
+    def __init__(self, model_size:str=WHISPER_MODEL_NAME, model_factory=load_whisper_model, warmup:bool=True, auto_restart:bool=True,
+                 max_restarts:int=STT_WORKER_MAX_RESTARTS, restart_backoff_s:float=STT_WORKER_RESTART_BACKOFF_S):
+        """
+        Args:
+            model_size: Whisper model name loaded in the worker
+            model_factory: Picklable callable (model_size) -> object exposing
+                `transcribe_from_array(audio, samplerate)`; called inside the worker
+            warmup: Run one silent transcription after loading so the first request is fast
+            auto_restart: Restart the worker process if it crashes
+            max_restarts: Crashes restarted before the worker gives up
+            restart_backoff_s: Wait before the first restart, doubled for every further one
+        """
+        self.model_size = model_size
+        self.model_factory = model_factory
+        self.warmup = warmup
+        self.auto_restart = auto_restart
+        self.max_restarts = max_restarts
+        self.restart_backoff_s = restart_backoff_s
+
+        self._ctx = mp.get_context("spawn")
+        self._process = None
+        self._requests = None
+        self._responses = None
+        self._dispatcher = None
+        self._pending = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stopping = threading.Event()
+        self._error = None  # set once the worker cannot serve requests any more
+
+        self.restarts = 0
+        self._metrics = {"requests": 0, "completed": 0, "failed": 0, "queue_wait_ms": 0.0, "decode_ms": 0.0, "max_queue_wait_ms": 0.0, "load_ms": None}
+
+    def start(self):
+        """Spawn the worker process; the model loads in the background."""
+        self._stopping.clear()
+        self._error = None
+        with self._lock:
+            self._requests = self._ctx.Queue()
+        self._spawn()
+        return self
+
+    def _spawn(self):
+        self._ready.clear()
+        self._responses = self._ctx.Queue()
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=(self.model_factory, self.model_size, self._requests, self._responses, self.warmup),
+            name="stt-worker",
+            daemon=True,
+        )
+        self._process.start()
+
+        self._dispatcher = threading.Thread(target=self._dispatch, args=(self._process, self._responses), name="stt-dispatcher", daemon=True)
+        self._dispatcher.start()
+        logger.info(f"STT worker process started (pid {self._process.pid}) for model '{self.model_size}'.")
+
+    def is_ready(self):
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout:float=None):
+        """
+        Block until the model is loaded (and warmed up). Returns False on timeout.
+        Raises the worker's error if it failed to start or crashed too often.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._ready.wait(0.05):
+            if self._error is not None:
+                raise self._error
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+        return True
+
+    def submit(self, audio:np.ndarray, samplerate:int=WHISPER_SAMPLE_RATE):
+        """
+        Queue audio for transcription.
+
+        Returns:
+            Future: resolves to the same dict as `SpeechToTextModel.transcribe_from_array`,
+                with queue_wait_ms added to its timing
+        """
+        if self._process is None:
+            raise RuntimeError("STT worker is not running; call start() first.")
+
+        future = Future()
+        request_id = next(self._ids)
+        audio = to_whisper_audio(audio, samplerate)
+        # under the lock so a restart cannot swap the queue between registering and enqueueing
+        with self._lock:
+            self._metrics["requests"] += 1
+            if self._error is not None:
+                self._metrics["failed"] += 1
+                future.set_exception(self._error)
+                return future
+            self._pending[request_id] = future
+            self._requests.put((request_id, audio, time.time()))
+        return future
+
+    def transcribe(self, audio:np.ndarray, samplerate:int=WHISPER_SAMPLE_RATE, timeout:float=None):
+        """Blocking convenience wrapper around `submit`."""
+        return self.submit(audio, samplerate).result(timeout)
+
+    def get_metrics(self):
+        """Request counts and average queue wait vs decode time."""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["pending"] = len(self._pending)
+        completed = metrics["completed"] or 1
+        metrics["avg_queue_wait_ms"] = metrics.pop("queue_wait_ms") / completed
+        metrics["avg_decode_ms"] = metrics.pop("decode_ms") / completed
+        metrics["restarts"] = self.restarts
+        return metrics
+
+    def stop(self, timeout:float=5.0):
+        """Finish queued requests and shut the worker down."""
+        self._stopping.set()
+        if self._process is None:
+            return
+        self._requests.put(None)
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._dispatcher.join(timeout)
+        self._fail_pending(RuntimeError("STT worker stopped."))
+        self._process = None
+
+    def _dispatch(self, process, responses):
+        """Resolve futures from worker responses; detect and recover from crashes."""
+        while True:
+            try:
+                kind, request_id, result, timing = responses.get(timeout=0.2)
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+                if self._stopping.is_set():
+                    return
+                if not self._ready.is_set():
+                    self._fail(RuntimeError(f"STT worker process exited while loading the model (code {process.exitcode})."))
+                    return
+                logger.error(f"STT worker process exited unexpectedly (code {process.exitcode}).")
+                self._restart()
+                return
+
+            if kind == "failed":
+                process.join()
+                self._fail(RuntimeError(f"STT worker failed to load the model: {result}"))
+                return
+
+            if kind == "ready":
+                with self._lock:
+                    self._metrics["load_ms"] = timing["load_ms"]
+                self._ready.set()
+                logger.info(f"STT worker ready in {timing['load_ms']:.0f} ms.")
+                continue
+
+            with self._lock:
+                future = self._pending.pop(request_id, None)
+                self._metrics["completed"] += 1
+                self._metrics["queue_wait_ms"] += timing["queue_wait_ms"]
+                self._metrics["decode_ms"] += timing["decode_ms"]
+                self._metrics["max_queue_wait_ms"] = max(self._metrics["max_queue_wait_ms"], timing["queue_wait_ms"])
+                if result is None:
+                    self._metrics["failed"] += 1
+
+            if isinstance(result, dict):
+                result.setdefault("timing", {})["queue_wait_ms"] = timing["queue_wait_ms"]
+            if future is not None:
+                future.set_result(result)
+
+    def _restart(self):
+        """Fail the requests the crashed process had, then respawn it after a backoff."""
+        if not self.auto_restart or self.restarts >= self.max_restarts:
+            self._fail(RuntimeError(f"STT worker process crashed {self.restarts + 1} times, giving up."))
+            return
+
+        self._ready.clear()
+        # swap the queue under the lock: requests submitted from here on wait for the new process
+        with self._lock:
+            lost, self._pending = self._pending, {}
+            self._metrics["failed"] += len(lost)
+            self._requests = self._ctx.Queue()
+        self._fail_pending(RuntimeError("STT worker process crashed."), lost)
+
+        backoff = self.restart_backoff_s * 2 ** self.restarts
+        self.restarts += 1
+        if self._stopping.wait(backoff):
+            return
+        self._spawn()
+
+    def _fail(self, error:Exception):
+        """Give up: fail every pending request, and every later one, with `error`."""
+        logger.error(str(error))
+        self._ready.clear()
+        with self._lock:
+            self._error = error
+            lost, self._pending = self._pending, {}
+            self._metrics["failed"] += len(lost)
+        self._fail_pending(error, lost)
+
+    def _fail_pending(self, error:Exception, pending:dict=None):
+        if pending is None:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
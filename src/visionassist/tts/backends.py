@@ -0,0 +1,74 @@
+import io
+import shutil
+import subprocess
+from visionassist.config import ESPEAK_BINARY, ESPEAK_WORDS_PER_MINUTE
+
+
+class TTSBackend:
+    """
+    Speech synthesis engine used by `TextToSpeechModel`.
+
+    Subclasses set `name` (part of the cache key) and `extension` (audio file
+    type) and implement `synthesize`.
+    """
+
+    name = "base"
+    extension = "mp3"
+
+    def synthesize(self, text:str, lang:str):
+        """Return the encoded audio for `text` as bytes."""
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    """Google TTS; needs network access."""
+
+    name = "gtts"
+    extension = "mp3"
+
+    def synthesize(self, text:str, lang:str):
+        from gtts import gTTS
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class EspeakBackend(TTSBackend):
+    """Offline synthesis through the espeak-ng command line tool; returns WAV audio."""
+
+    name = "espeak"
+    extension = "wav"
+
+    def __init__(self, binary:str=ESPEAK_BINARY, words_per_minute:int=ESPEAK_WORDS_PER_MINUTE, timeout:float=30):
+        self.binary = shutil.which(binary) or binary
+        self.words_per_minute = words_per_minute
+        self.timeout = timeout
+        # speed changes the audio, so it is part of the cache key
+        self.name = f"espeak-{words_per_minute}"
+
+    def synthesize(self, text:str, lang:str):
+        # text goes through stdin so it is never parsed as an option
+        result = subprocess.run(
+            [self.binary, "-v", lang, "-s", str(self.words_per_minute), "--stdout", "--stdin"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            timeout=self.timeout,
+            check=False,
+        )
+        if result.returncode != 0 or not result.stdout:
+            raise RuntimeError(f"espeak-ng failed ({result.returncode}): {result.stderr.decode(errors='replace').strip()}")
+        return result.stdout
+
+
+BACKENDS = {
+    "gtts": GTTSBackend,
+    "espeak": EspeakBackend,
+}
+
+
+def get_backend(name:str):
+    """Instantiate a backend by its config name."""
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown TTS backend '{name}', options: {', '.join(BACKENDS)}")
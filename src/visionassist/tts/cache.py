@@ -0,0 +1,142 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from visionassist.config import TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES, TTS_CACHE_MEMORY_ENTRIES
+from visionassist.logger import logger
+
+
+def phrase_key(text:str, lang:str, engine:str):
+    """Content address of a synthesized phrase."""
+    return hashlib.sha256(f"{engine}\0{lang}\0{text}".encode("utf-8")).hexdigest()
+
+
+class PhraseCache:
+    """
+    Content-addressed store of synthesized phrases.
+
+    Audio lives on disk under its key, bounded to `max_bytes` with least
+    recently used eviction, and the hottest `memory_entries` phrases are also
+    kept in memory.
+    """
+
+    def __init__(self, cache_dir:str=TTS_CACHE_DIR, max_bytes:int=TTS_CACHE_MAX_BYTES, memory_entries:int=TTS_CACHE_MEMORY_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()  # key -> bytes
+        self._disk = OrderedDict()  # key -> (path, size), least recently used first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, filename)
+            key, _, extension = filename.partition(".")
+            if len(key) != 64 or extension.endswith("tmp") or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, key, path, stat.st_size))
+
+        for _, key, path, size in sorted(entries):
+            self._disk[key] = (path, size)
+            self._disk_bytes += size
+
+    def get(self, key:str):
+        """Return the cached audio bytes for `key`, or None."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+                self.memory_hits += 1
+                return data
+
+            entry = self._disk.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            path = entry[0]
+
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._drop(key)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self._remember(key, data)
+            self.disk_hits += 1
+        return data
+
+    def path(self, key:str):
+        """Path of the cached audio file for `key`, or None."""
+        with self._lock:
+            entry = self._disk.get(key)
+            return entry[0] if entry else None
+
+    def put(self, key:str, data:bytes, extension:str="mp3"):
+        """Store audio for `key` and evict least recently used phrases over the disk budget."""
+        path = os.path.join(self.cache_dir, f"{key}.{extension}")
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self._drop(key)
+            self._disk[key] = (path, len(data))
+            self._disk_bytes += len(data)
+            self._remember(key, data)
+            self._evict()
+        return path
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def _remember(self, key, data):
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _drop(self, key):
+        entry = self._disk.pop(key, None)
+        if entry is not None:
+            self._disk_bytes -= entry[1]
+        self._memory.pop(key, None)
+        return entry
+
+    def _evict(self):
+        while self._disk_bytes > self.max_bytes and len(self._disk) > 1:
+            key = next(iter(self._disk))
+            path, _ = self._drop(key)
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Failed to evict cached phrase {path}: {e}")
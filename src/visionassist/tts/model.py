@@ -1,27 +1,157 @@
-from gtts import gTTS
 import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from visionassist.config import ALLOWED_LABELS, TTS_BACKEND, TTS_CACHE_ENABLED, TTS_PREWARM_TEMPLATES, TTS_STREAM_LOOKAHEAD
+from visionassist.logger import logger
+from visionassist import metrics
+from visionassist.tts.backends import TTSBackend, get_backend
+from visionassist.tts.cache import PhraseCache, phrase_key
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+|\n+")
+
+def split_sentences(text:str):
+    """Split text into sentences, the unit synthesized and played one at a time"""
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text) if sentence and sentence.strip()]
 
 class TextToSpeechModel:
-    """Text-to-Speech model using Google TTS"""
-    
-    def __init__(self, lang="en"):
+    """Text-to-Speech model over a pluggable backend, with repeated phrases served from a cache"""
+
+    def __init__(self, lang="en", backend:TTSBackend=None, cache=TTS_CACHE_ENABLED):
+        """
+        Args:
+            backend: TTSBackend to synthesize with (default: the TTS_BACKEND engine)
+            cache: True for a default PhraseCache, a configured PhraseCache
+                instance, or False to synthesize every request
+        """
         self.lang = lang
-    
-    def generate_audio(self, text, output_path="output.mp3"):
+        self.backend = backend if backend is not None else get_backend(TTS_BACKEND)
+        if cache is True:
+            cache = PhraseCache()
+        self.cache = cache or None
+
+    @metrics.timed("tts.synthesize")
+    def synthesize(self, text):
+        """
+        Convert text to speech without touching the output file
+
+        Args:
+            text (str): The text to convert to speech
+
+        Returns:
+            bytes: Encoded audio in the backend's format
+        """
+        if not text:
+            raise ValueError("Text cannot be empty")
+
+        if self.cache is None:
+            return self._synthesize_uncached(text)
+
+        key = phrase_key(text, self.lang, self.backend.name)
+        audio = self.cache.get(key)
+        if audio is None:
+            metrics.inc("tts.cache_misses")
+            audio = self._synthesize_uncached(text)
+            self.cache.put(key, audio, self.backend.extension)
+        else:
+            metrics.inc("tts.cache_hits")
+        return audio
+
+    def _synthesize_uncached(self, text):
+        with metrics.span(f"tts.backend.{self.backend.name}"):
+            return self.backend.synthesize(text, self.lang)
+
+    def generate_audio(self, text, output_path=None):
         """
         Convert text to speech and save as audio file
-        
+
         Args:
             text (str): The text to convert to speech
-            output_path (str): Path where the audio file will be saved (default: "output.mp3")
-            
+            output_path (str): Path where the audio file will be saved; its extension must
+                match the backend's format (default: "output.<backend extension>")
+
         Returns:
             str: Absolute path to the saved audio file
         """
-        if not text:
+        extension = self.backend.extension
+        if output_path is None:
+            output_path = f"output.{extension}"
+        elif os.path.splitext(output_path)[1].lower() != f".{extension}":
+            raise ValueError(f"The {self.backend.name} backend writes .{extension} audio, not {output_path}")
+
+        audio = self.synthesize(text)
+        with open(output_path, "wb") as f:
+            f.write(audio)
+
+        return os.path.abspath(output_path)
+
+    def stream(self, text, lookahead=TTS_STREAM_LOOKAHEAD):
+        """
+        Synthesize text sentence by sentence so playback can start after the first one
+
+        Args:
+            text (str): The text to convert to speech
+            lookahead (int): Sentences synthesized in the background while the current one plays
+
+        Yields:
+            tuple: (sentence, audio bytes) in reading order
+        """
+        sentences = split_sentences(text)
+        if not sentences:
             raise ValueError("Text cannot be empty")
-        
-        tts = gTTS(text=text, lang=self.lang)
-        tts.save(output_path)
-        
-        return os.path.abspath(output_path)
\ No newline at end of file
+
+        if lookahead <= 0 or len(sentences) == 1:
+            for sentence in sentences:
+                yield sentence, self.synthesize(sentence)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=lookahead + 1, thread_name_prefix="tts-stream")
+        pending = deque()
+        try:
+            remaining = iter(sentences)
+            for sentence in remaining:
+                pending.append((sentence, executor.submit(self.synthesize, sentence)))
+                if len(pending) > lookahead:
+                    break
+            while pending:
+                sentence, future = pending.popleft()
+                audio = future.result()
+                next_sentence = next(remaining, None)
+                if next_sentence is not None:
+                    pending.append((next_sentence, executor.submit(self.synthesize, next_sentence)))
+                yield sentence, audio
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def prewarm(self, phrases=None, background=False):
+        """
+        Synthesize phrases ahead of time so they are answered from the cache
+
+        Args:
+            phrases (list): Phrases to synthesize (default: TTS_PREWARM_TEMPLATES expanded over ALLOWED_LABELS)
+            background (bool): Run in a daemon thread and return it instead of blocking
+
+        Returns:
+            int | threading.Thread: Number of phrases warmed, or the worker thread
+        """
+        if self.cache is None:
+            return 0
+        if phrases is None:
+            phrases = [template.format(label=label) for template in TTS_PREWARM_TEMPLATES for label in ALLOWED_LABELS]
+
+        if background:
+            thread = threading.Thread(target=self.prewarm, args=(phrases,), name="tts-prewarm", daemon=True)
+            thread.start()
+            return thread
+
+        warmed = 0
+        for phrase in phrases:
+            try:
+                self.synthesize(phrase)
+                warmed += 1
+            except Exception as e:
+                logger.error(f"Failed to pre-warm phrase '{phrase}': {e}")
+        return warmed
@@ -0,0 +1,124 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+import pytest
+
+DEFAULT_TOLERANCE = 0.25
+
+
+def pytest_generate_tests(metafunc):
+    if "db_rows" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("--bench-db-rows").split(",") if size.strip()]
+        metafunc.parametrize("db_rows", sizes, ids=[f"{size:,}rows".replace(",", "_") for size in sizes])
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class BenchRecorder:
+    """
+    Collects benchmark metrics for the session and compares them to a baseline.
+
+    Each metric is a single number with a unit and a direction; a metric
+    regresses when it is worse than the baseline value by more than the
+    tolerance (relative).
+    """
+
+    def __init__(self, baseline:dict=None, tolerance:float=DEFAULT_TOLERANCE):
+        self.results = {}
+        self.baseline = baseline or {}
+        self.tolerance = tolerance
+        self.regressions = []
+
+    def record(self, name:str, value:float, unit:str="ms", higher_is_better:bool=False):
+        """Store a metric and fail the calling test if it regressed against the baseline."""
+        self.results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+        previous = self.baseline.get(name)
+        if previous is None or not previous["value"]:
+            return
+        change = (value - previous["value"]) / previous["value"]
+        worse = -change if higher_is_better else change
+        self.results[name]["baseline"] = previous["value"]
+        self.results[name]["change"] = change
+        if worse > self.tolerance:
+            message = f"{name}: {value:,.3f} {unit} vs baseline {previous['value']:,.3f} {unit} ({change:+.0%})"
+            self.regressions.append(message)
+            pytest.fail(f"Benchmark regression, {message}")
+
+    def measure(self, name:str, fn, repeats:int=10, warmup:int=1):
+        """
+        Time `fn` and record its median wall time in ms.
+
+        Returns:
+            dict: median, min and max in ms
+        """
+        for _ in range(warmup):
+            fn()
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(timings)
+        self.record(name, median, unit="ms")
+        return {"median": median, "min": min(timings), "max": max(timings)}
+
+    def to_json(self):
+        return {
+            "meta": {
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "commit": _git_commit(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "machine": platform.machine(),
+                "cpu_count": os.cpu_count(),
+            },
+            "results": self.results,
+        }
+
+
+def pytest_configure(config):
+    baseline = None
+    path = config.getoption("--bench-baseline")
+    if path:
+        with open(path) as f:
+            baseline = json.load(f)["results"]
+    tolerance = config.getoption("--bench-tolerance")
+    config._bench = BenchRecorder(baseline=baseline, tolerance=DEFAULT_TOLERANCE if tolerance is None else tolerance)
+
+
+@pytest.fixture(scope="session")
+def bench(request):
+    return request.config._bench
+
+
+def pytest_sessionfinish(session):
+    recorder = session.config._bench
+    path = session.config.getoption("--bench-json")
+    if path and recorder.results:
+        with open(path, "w") as f:
+            json.dump(recorder.to_json(), f, indent=2, sort_keys=True)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    recorder = config._bench
+    if not recorder.results:
+        return
+    terminalreporter.section("benchmarks")
+    for name, result in sorted(recorder.results.items()):
+        line = f"{name:<55} {result['value']:>14,.3f} {result['unit']}"
+        if "change" in result:
+            line += f"  ({result['change']:+.1%} vs baseline)"
+        terminalreporter.write_line(line)
+    if config.getoption("--bench-json"):
+        terminalreporter.write_line(f"results written to {config.getoption('--bench-json')}")
@@ -0,0 +1,93 @@
+import time
+from sqlalchemy import select, delete
+from visionassist.memory.database import Database
+from visionassist.memory.models import Detection, DetectedObject
+from visionassist.config import MAX_OBJECT_ENTRIES
+from visionassist.logger import logger
+
+N_IMAGES = 500
+LABELS = ["backpack", "umbrella", "handbag", "book", "scissors", "mouse"]
+
+
+def generate_test_data(n_images):
+    objects = [{"label": label, "confidence": 0.9, "bbox": (10, 20, 30, 40)} for label in LABELS]
+    return [(f"test_image_{i}.jpg", objects) for i in range(n_images)]
+
+
+def legacy_insert_detection(db, image_path, objects):
+    """Row-by-row insert with per-object pruning, as Database.insert_detection used to do."""
+    with db.SessionLocal() as session:
+        detection = Detection(image_path=image_path)
+        session.add(detection)
+        session.flush()
+
+        for obj in objects:
+            session.add(
+                DetectedObject(
+                    detection_id=detection.id,
+                    object_name=obj.get("label"),
+                    confidence=obj.get("confidence"),
+                    bbox=obj.get("bbox")
+                )
+            )
+            keep_ids = session.execute(
+                select(DetectedObject.id)
+                .where(DetectedObject.object_name == obj["label"])
+                .order_by(DetectedObject.timestamp.desc())
+                .limit(MAX_OBJECT_ENTRIES)
+            ).scalars().all()
+            session.execute(
+                delete(DetectedObject)
+                .where(DetectedObject.object_name == obj["label"])
+                .where(DetectedObject.id.not_in(keep_ids))
+            )
+
+        session.commit()
+
+
+def rows_per_second(n_rows, seconds):
+    return n_rows / seconds if seconds > 0 else float("inf")
+
+
+def test_bench_db_bulk_insert_vs_loop(tmp_path, bench):
+    test_data = generate_test_data(N_IMAGES)
+    n_rows = N_IMAGES * len(LABELS)
+
+    legacy_db = Database(db_path=str(tmp_path / "legacy.db"), prune_inline=True)
+    start = time.perf_counter()
+    for image_path, objects in test_data:
+        legacy_insert_detection(legacy_db, image_path, objects)
+    legacy_rate = rows_per_second(n_rows, time.perf_counter() - start)
+
+    frame_db = Database(db_path=str(tmp_path / "frame.db"), prune_inline=True)
+    start = time.perf_counter()
+    for image_path, objects in test_data:
+        frame_db.insert_detection(image_path, objects)
+    frame_rate = rows_per_second(n_rows, time.perf_counter() - start)
+
+    bulk_db = Database(db_path=str(tmp_path / "bulk.db"), prune_inline=True)
+    start = time.perf_counter()
+    bulk_db.insert_detections(test_data)
+    bulk_rate = rows_per_second(n_rows, time.perf_counter() - start)
+
+    logger.info(
+        f"DB insert: loop {legacy_rate:,.0f} rows/s, "
+        f"per-frame {frame_rate:,.0f} rows/s ({frame_rate / legacy_rate:.1f}x), "
+        f"bulk {bulk_rate:,.0f} rows/s ({bulk_rate / legacy_rate:.1f}x)"
+    )
+
+    bench.record("db.insert.loop", legacy_rate, unit="rows/s", higher_is_better=True)
+    bench.record("db.insert.per_frame", frame_rate, unit="rows/s", higher_is_better=True)
+    bench.record("db.insert.bulk", bulk_rate, unit="rows/s", higher_is_better=True)
+
+    expected = MAX_OBJECT_ENTRIES * len(LABELS)
+    for db in (legacy_db, frame_db, bulk_db):
+        assert db.get_detected_object_count() == expected
+    assert frame_rate > legacy_rate
+    assert bulk_rate > legacy_rate
+
+
+if __name__ == "__main__":
+    import pathlib, tempfile
+    from conftest import BenchRecorder
+    test_bench_db_bulk_insert_vs_loop(pathlib.Path(tempfile.mkdtemp()), BenchRecorder())
@@ -0,0 +1,50 @@
+import os
+import numpy as np
+from visionassist.model.dedup import ImageDeduplicator
+from visionassist.model.image_store import ImageStore
+
+N_FRAMES = 100
+DETECTIONS = [{"label": "cup", "confidence": 0.9, "bbox": (400, 200, 600, 400)}]
+
+
+def static_camera(n_frames, seed=0):
+    """A fixed scene with per-frame sensor noise."""
+    rng = np.random.default_rng(seed)
+    scene = np.kron(rng.integers(0, 255, (18, 32, 3), dtype=np.uint8), np.ones((40, 40, 1), dtype=np.uint8))
+    for _ in range(n_frames):
+        yield np.clip(scene.astype(np.int16) + rng.integers(-4, 5, scene.shape), 0, 255).astype(np.uint8)
+
+
+def save_all(image_dir, dedup):
+    store = ImageStore(image_dir=str(image_dir), dedup=dedup)
+    for frame in static_camera(N_FRAMES):
+        store.save(frame, [dict(det) for det in DETECTIONS])
+    store.close()
+    with os.scandir(image_dir) as entries:
+        return store.get_stats()["written"], sum(entry.stat().st_size for entry in entries)
+
+
+def test_bench_dedup_static_camera(bench, tmp_path):
+    frame = next(static_camera(1))
+    dedup = ImageDeduplicator()
+    bench.measure("dedup.dhash_720p", lambda: dedup.hash(frame), repeats=50)
+    for i in range(dedup.capacity):
+        dedup.add(i * 0x9E3779B97F4A7C15 % (1 << 64), f"{i}.jpg")
+    bench.measure("dedup.lookup_full_index", lambda: dedup.lookup(1), repeats=50)
+
+    written, size = save_all(tmp_path / "plain", dedup=False)
+    bench.record("dedup.off.images_written", written, unit="images")
+    bench.record("dedup.off.disk_bytes", size, unit="bytes")
+    written, size = save_all(tmp_path / "dedup", dedup=True)
+    bench.record("dedup.on.images_written", written, unit="images")
+    bench.record("dedup.on.disk_bytes", size, unit="bytes")
+    assert written < N_FRAMES / 10
+
+
+if __name__ == "__main__":
+    import pathlib, tempfile
+    from conftest import BenchRecorder
+    recorder = BenchRecorder()
+    test_bench_dedup_static_camera(recorder, pathlib.Path(tempfile.mkdtemp()))
+    for name, result in recorder.results.items():
+        print(f"{name}: {result['value']:,.3f} {result['unit']}")
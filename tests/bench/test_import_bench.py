@@ -0,0 +1,42 @@
+import subprocess
+import sys
+from visionassist.logger import logger
+
+MODULES = [
+    "visionassist.memory.database",
+    "visionassist.model.yolo",
+    "visionassist.stt.model",
+    "visionassist.tts.model",
+    "visionassist.pipeline.stream",
+]
+REPEATS = 3
+# what a module-level `from ultralytics import YOLO` used to cost every entry point
+EAGER_BASELINE = "ultralytics"
+
+
+def import_ms(module):
+    """Best-of-REPEATS wall time to import `module` in a fresh interpreter."""
+    code = f"import time; t = time.perf_counter(); import {module}; print((time.perf_counter() - t) * 1000)"
+    timings = []
+    for _ in range(REPEATS):
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def test_bench_import_time(bench):
+    baseline_ms = import_ms(EAGER_BASELINE)
+    timings = {module: import_ms(module) for module in MODULES}
+
+    logger.info(f"Import {EAGER_BASELINE}: {baseline_ms:,.0f} ms")
+    for module, ms in timings.items():
+        logger.info(f"Import {module}: {ms:,.0f} ms")
+
+    for module, ms in timings.items():
+        bench.record(f"import.{module}", ms)
+        assert ms < baseline_ms, module
+
+
+if __name__ == "__main__":
+    from conftest import BenchRecorder
+    test_bench_import_time(BenchRecorder())
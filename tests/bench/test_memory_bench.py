@@ -0,0 +1,96 @@
+import random
+import sqlite3
+import time
+from datetime import timedelta
+from visionassist.config import ALLOWED_LABELS
+from visionassist.memory.database import Database
+from visionassist.memory.query import QueryEngine, utcnow
+from visionassist.memory.retention import RetentionPolicy, RetentionWorker
+from visionassist.logger import logger
+
+OBJECTS_PER_FRAME = 3
+DAYS = 30
+PRUNE_DAYS = 3  # the retention pass deletes the oldest PRUNE_DAYS of data
+INSERT_FRAMES = 2000
+REPEATS = 20
+
+
+def populate(db_path, n_rows, now):
+    """Fill the database directly, bypassing the insert path, with frames spread over DAYS."""
+    Database(db_path=db_path, cache_size=0)
+    rng = random.Random(0)
+    n_frames = n_rows // OBJECTS_PER_FRAME
+    step = DAYS * 86400 / n_frames
+    start = now - timedelta(days=DAYS)
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA synchronous=OFF")
+        timestamps = [(start + timedelta(seconds=i * step)).strftime("%Y-%m-%d %H:%M:%S") for i in range(n_frames)]
+        conn.executemany(
+            "INSERT INTO detections (id, image_path, timestamp) VALUES (?, ?, ?)",
+            ((i + 1, f"frame_{i}.jpg", ts) for i, ts in enumerate(timestamps)),
+        )
+        conn.executemany(
+            "INSERT INTO detection_objects (detection_id, object_name, confidence, x1, y1, x2, y2, timestamp) "
+            "VALUES (?, ?, 0.9, 10, 10, 50, 50, ?)",
+            (
+                (i + 1, label, ts)
+                for i, ts in enumerate(timestamps)
+                for label in rng.sample(ALLOWED_LABELS, OBJECTS_PER_FRAME)
+            ),
+        )
+        conn.execute("ANALYZE")
+
+
+def test_bench_memory_store(tmp_path, bench, db_rows):
+    now = utcnow()
+    db_path = str(tmp_path / "memory_bench.db")
+    start = time.perf_counter()
+    populate(db_path, db_rows, now)
+    logger.info(f"Memory bench: populated {db_rows:,} rows in {time.perf_counter() - start:.1f} s")
+    prefix = f"memory.{db_rows}"
+
+    db = Database(db_path=db_path, cache_size=0)
+    engine = QueryEngine(db)
+
+    # insert cost on a populated database, one transaction per frame as the pipeline does
+    objects = [{"label": label, "confidence": 0.9, "bbox": (10, 20, 30, 40)} for label in ALLOWED_LABELS[:OBJECTS_PER_FRAME]]
+    start = time.perf_counter()
+    for i in range(INSERT_FRAMES):
+        db.insert_detection(f"bench_{i}.jpg", objects)
+    insert_rate = INSERT_FRAMES * OBJECTS_PER_FRAME / (time.perf_counter() - start)
+    bench.record(f"{prefix}.insert", insert_rate, unit="rows/s", higher_is_better=True)
+
+    for name, question in (
+        ("last_seen", "where is my laptop"),
+        ("last_seen_synonyms", "where is my bag"),
+        ("time_window", "did you see my phone in the last hour"),
+        ("time_window_all_labels", "what did you see today"),
+        ("cooccurrence", "what was near my laptop"),
+    ):
+        bench.measure(f"{prefix}.query.{name}", lambda: engine.ask(question, now=now), repeats=REPEATS)
+
+    _, cursor = engine.seen_between(since=now - timedelta(days=1))
+    bench.measure(f"{prefix}.query.next_page", lambda: engine.seen_between(since=now - timedelta(days=1), cursor=cursor), repeats=REPEATS)
+    assert engine.ask("where is my laptop", now=now).sightings
+
+    worker = RetentionWorker(
+        db,
+        policies={},
+        default_policy=RetentionPolicy(max_entries=None, max_age_days=DAYS - PRUNE_DAYS),
+        image_dir=str(tmp_path / "images"),
+        disk_budget_mb=None,
+    )
+    start = time.perf_counter()
+    stats = worker.run_once(now=now)
+    prune_seconds = time.perf_counter() - start
+    bench.record(f"{prefix}.prune", stats["objects"] / prune_seconds, unit="rows/s", higher_is_better=True)
+
+    expected = db_rows * PRUNE_DAYS / DAYS
+    assert abs(stats["objects"] - expected) < expected * 0.05 + OBJECTS_PER_FRAME
+
+
+if __name__ == "__main__":
+    import pathlib, tempfile
+    from conftest import BenchRecorder
+    test_bench_memory_store(pathlib.Path(tempfile.mkdtemp()), BenchRecorder(), 100_000)
@@ -0,0 +1,34 @@
+from visionassist.metrics import MetricsRegistry
+
+CALLS = 200_000
+
+
+def test_bench_metrics_overhead(bench):
+    disabled = MetricsRegistry(enabled=False)
+    enabled = MetricsRegistry(enabled=True)
+
+    def work():
+        return None
+
+    disabled_work = disabled.timed("work")(work)
+    enabled_work = enabled.timed("work")(work)
+
+    def calls(fn):
+        return lambda: [fn() for _ in range(CALLS)]
+
+    plain = bench.measure("metrics.plain_call_x200k", calls(work), repeats=5)
+    off = bench.measure("metrics.timed_disabled_x200k", calls(disabled_work), repeats=5)
+    on = bench.measure("metrics.timed_enabled_x200k", calls(enabled_work), repeats=5)
+
+    overhead_off_ns = (off["median"] - plain["median"]) * 1e6 / CALLS
+    overhead_on_ns = (on["median"] - plain["median"]) * 1e6 / CALLS
+    bench.record("metrics.overhead_disabled", overhead_off_ns, unit="ns/call")
+    bench.record("metrics.overhead_enabled", overhead_on_ns, unit="ns/call")
+
+    # a YOLO frame takes tens of ms; disabled instrumentation must stay well under a microsecond
+    assert overhead_off_ns < 1000
+
+
+if __name__ == "__main__":
+    from conftest import BenchRecorder
+    test_bench_metrics_overhead(BenchRecorder())
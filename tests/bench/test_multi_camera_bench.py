@@ -0,0 +1,68 @@
+import os
+import threading
+import time
+import numpy as np
+from visionassist.pipeline.multi import MultiCameraRunner
+from visionassist.pipeline.stream import StreamingPipeline
+
+FRAMES_PER_CAMERA = 200
+FRAME_SHAPE = (480, 640, 3)
+DETECT_WORK = 40000  # pure-Python loop iterations per frame, a few ms holding the GIL
+
+
+class CPUBoundDetector:
+    """Spends its time in Python bytecode like YOLO's pre/post-processing, so threads cannot overlap it."""
+
+    def detect(self, frame):
+        total = 0
+        for i in range(DETECT_WORK):
+            total += i
+        return [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}]
+
+    def save_with_bbox(self, frame, detections):
+        return "frame.jpg"
+
+
+def camera_frames(n_frames=FRAMES_PER_CAMERA):
+    frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    for _ in range(n_frames):
+        yield frame
+
+
+def run_threaded(n_cameras):
+    """One in-process StreamingPipeline per camera, the way several cameras share one YOLOModel today."""
+    pipelines = [StreamingPipeline(camera_frames(), CPUBoundDetector(), queue_size=FRAMES_PER_CAMERA) for _ in range(n_cameras)]
+    start = time.perf_counter()
+    threads = [threading.Thread(target=pipeline.run) for pipeline in pipelines]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(pipeline.get_stats()["detect"]["processed"] for pipeline in pipelines) / (time.perf_counter() - start)
+
+
+def run_processes(n_cameras, n_frames=FRAMES_PER_CAMERA):
+    sources = {f"camera{i}": camera_frames(n_frames) for i in range(n_cameras)}
+    runner = MultiCameraRunner(sources, detector_factory=CPUBoundDetector, drop_when_busy=False)
+    start = time.perf_counter()
+    stats = runner.run()
+    return stats["total"]["processed"] / (time.perf_counter() - start)
+
+
+def test_bench_multi_camera_scaling(bench):
+    cameras = [1, max(2, os.cpu_count() or 1)]
+    bench.record("multi.cpu_count", os.cpu_count() or 1, unit="cores", higher_is_better=True)
+    start = time.perf_counter()
+    run_processes(1, n_frames=1)
+    bench.record("multi.processes.startup", (time.perf_counter() - start) * 1000)
+    for n_cameras in cameras:
+        bench.record(f"multi.threads.{n_cameras}_cameras", run_threaded(n_cameras), unit="frames/s", higher_is_better=True)
+        bench.record(f"multi.processes.{n_cameras}_cameras", run_processes(n_cameras), unit="frames/s", higher_is_better=True)
+
+
+if __name__ == "__main__":
+    from conftest import BenchRecorder
+    recorder = BenchRecorder()
+    test_bench_multi_camera_scaling(recorder)
+    for name, result in recorder.results.items():
+        print(f"{name}: {result['value']:.1f} {result['unit']}")
@@ -0,0 +1,67 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import soundfile as sf
+from visionassist.config import WHISPER_MODEL_NAME
+from visionassist.stt.audio import WHISPER_SAMPLE_RATE, to_whisper_audio
+from visionassist.stt.client import WhisperAPIClient
+
+AUDIO = "tests/assets/audio.mp3"
+API_KEY = "bench-key"
+REPEATS = 20
+
+
+class StandInWhisperAPI(BaseHTTPRequestHandler):
+    """Reads the whole upload and answers like the transcription API, so only client and transport are timed."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        data = json.dumps({"transcription": {"text": "hello world"}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def api_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInWhisperAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/transcribe"
+    server.shutdown()
+    server.server_close()
+
+
+def test_bench_stt_online(bench, api_url):
+    audio, samplerate = sf.read(AUDIO, dtype="float32")
+    with open(AUDIO, "rb") as f:
+        audio_bytes = f.read()
+
+    with WhisperAPIClient(api_url, API_KEY) as client:
+        bench.measure("stt.online.prepare_upload", lambda: client.prepare_upload(audio=audio, samplerate=samplerate), repeats=REPEATS)
+        bench.measure("stt.online.transcribe_array", lambda: client.transcribe(audio=audio, samplerate=samplerate), repeats=REPEATS)
+        bench.measure("stt.online.transcribe_bytes", lambda: client.transcribe(audio_bytes=audio_bytes), repeats=REPEATS)
+        assert client.transcribe(audio_bytes=audio_bytes)["transcription"]["text"] == "hello world"
+
+
+def test_bench_stt_offline(bench):
+    pytest.importorskip("whisper")
+    from visionassist.stt.model import SpeechToTextModel
+
+    model = SpeechToTextModel(model_size=WHISPER_MODEL_NAME, mode="offline", load_mode="eager")
+    bench.record("stt.offline.load", model.loader.load_ms)
+
+    audio, samplerate = sf.read(AUDIO, dtype="float32")
+    whisper_audio = to_whisper_audio(audio, samplerate)
+    timing = bench.measure("stt.offline.decode", lambda: model.transcribe_from_array(whisper_audio, WHISPER_SAMPLE_RATE), repeats=3)
+    bench.record("stt.offline.real_time_factor", timing["median"] / 1000 / (len(whisper_audio) / WHISPER_SAMPLE_RATE), unit="x")
+
+
+if __name__ == "__main__":
+    from conftest import BenchRecorder
+    test_bench_stt_offline(BenchRecorder())
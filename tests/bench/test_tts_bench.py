@@ -0,0 +1,82 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from visionassist.tts.backends import TTSBackend
+from visionassist.tts.cache import PhraseCache
+from visionassist.tts.model import TextToSpeechModel
+
+# stand-in for an online engine: a fixed round trip plus time proportional to the text
+SYNTHESIS_ROUND_TRIP_S = 0.03
+SYNTHESIS_PER_CHAR_S = 0.0005
+AUDIO_BYTES_PER_CHAR = 400
+ANSWER = "Your laptop was last seen 5 minutes ago. Next to it I saw your cup and your mouse. Your phone was on the table."
+REPEATS = 5
+
+
+class StandInTTSServer(BaseHTTPRequestHandler):
+    """Answers every POSTed text with fake audio after a length-dependent delay."""
+
+    def do_POST(self):
+        text = self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(SYNTHESIS_ROUND_TRIP_S + len(text) * SYNTHESIS_PER_CHAR_S)
+        data = b"\0" * (len(text) * AUDIO_BYTES_PER_CHAR)
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class HTTPBackend(TTSBackend):
+    """Online engine talking to the stand-in server."""
+
+    name = "bench-http"
+    extension = "mp3"
+
+    def __init__(self, url):
+        self.url = url
+        self.session = requests.Session()
+
+    def synthesize(self, text, lang):
+        response = self.session.post(self.url, data=text.encode("utf-8"), timeout=10)
+        response.raise_for_status()
+        return response.content
+
+
+@pytest.fixture(scope="module")
+def tts_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInTTSServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/synthesize"
+    server.shutdown()
+    server.server_close()
+
+
+def test_bench_tts_online(bench, tts_url, tmp_path):
+    uncached = TextToSpeechModel(backend=HTTPBackend(tts_url), cache=False)
+    bench.measure("tts.online.whole_answer", lambda: uncached.synthesize(ANSWER), repeats=REPEATS)
+    bench.measure("tts.online.first_sentence_streamed", lambda: next(uncached.stream(ANSWER)), repeats=REPEATS)
+    bench.measure("tts.online.all_sentences_streamed", lambda: list(uncached.stream(ANSWER)), repeats=REPEATS)
+
+    cached = TextToSpeechModel(backend=HTTPBackend(tts_url), cache=PhraseCache(str(tmp_path / "cache")))
+    cached.synthesize(ANSWER)
+    bench.measure("tts.online.cached_memory", lambda: cached.synthesize(ANSWER), repeats=REPEATS * 10)
+
+    cold = PhraseCache(str(tmp_path / "cache"), memory_entries=0)
+    from_disk = TextToSpeechModel(backend=HTTPBackend(tts_url), cache=cold)
+    bench.measure("tts.online.cached_disk", lambda: from_disk.synthesize(ANSWER), repeats=REPEATS * 10)
+    assert cold.get_stats()["misses"] == 0
+
+
+if __name__ == "__main__":
+    import pathlib, tempfile
+    from conftest import BenchRecorder
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInTTSServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test_bench_tts_online(BenchRecorder(), f"http://127.0.0.1:{server.server_address[1]}/synthesize", pathlib.Path(tempfile.mkdtemp()))
+    server.shutdown()
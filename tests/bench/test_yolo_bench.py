@@ -0,0 +1,110 @@
+import cv2
+import numpy as np
+import pytest
+from visionassist.model.detections import boxes_to_array, nms, offset_detections
+from visionassist.model.regions import InferenceMode
+from visionassist.model.yolo import YOLOModel
+
+ASSETS = ["tests/assets/truck.jpg", "tests/assets/trucks.jpg"]
+REPEATS = 20
+CAMERA_SHAPE = (2160, 3840, 3)  # 4K camera
+MOSAIC_GRID = (4, 6)  # rows, columns of test assets spread over the camera frame
+MATCH_IOU = 0.5
+MODES = {
+    "whole_frame": None,
+    "tiled": InferenceMode(tile_size=640),
+    "tiled_no_full_frame": InferenceMode(tile_size=640, full_frame=False),
+    "roi_left_half": InferenceMode(rois={"left": (0.0, 0.0, 0.5, 1.0)}),
+    "roi_left_half_tiled": InferenceMode(rois={"left": (0.0, 0.0, 0.5, 1.0)}, tile_size=640),
+}
+
+
+@pytest.fixture(scope="module")
+def model(bench):
+    yolo = YOLOModel(scene_gate=False, load_mode="eager")
+    bench.record("yolo.load", yolo.loader.load_ms)
+    return yolo
+
+
+def test_bench_yolo_per_frame(bench, model):
+    for path in ASSETS:
+        frame = cv2.imread(path)
+        name = path.rsplit("/", 1)[-1].split(".")[0]
+        bench.measure(f"yolo.detect.{name}", lambda: model.detect(frame), repeats=REPEATS, warmup=3)
+
+
+def test_bench_yolo_batch(bench, model):
+    frames = [cv2.imread(path) for path in ASSETS] * 4
+    timing = bench.measure("yolo.detect_batch.8_frames", lambda: model.detect_batch(frames, batch_size=len(frames)), repeats=REPEATS // 2, warmup=1)
+    bench.record("yolo.detect_batch.throughput", len(frames) * 1000 / timing["median"], unit="frames/s", higher_is_better=True)
+
+
+def small_object_scene(model):
+    """
+    A 4K frame with the test assets at native size spread over it, so every
+    object is small relative to the frame, plus the ground truth: each
+    asset's own whole-image detections shifted to where it was placed.
+    """
+    frame = np.full(CAMERA_SHAPE, 114, dtype=np.uint8)
+    rows, columns = MOSAIC_GRID
+    cell_h, cell_w = CAMERA_SHAPE[0] // rows, CAMERA_SHAPE[1] // columns
+    truth = []
+    for i in range(rows * columns):
+        asset = cv2.imread(ASSETS[i % len(ASSETS)])
+        y, x = (i // columns) * cell_h + 40, (i % columns) * cell_w + 40
+        frame[y:y + asset.shape[0], x:x + asset.shape[1]] = asset
+        truth.append(offset_detections(model.detect(asset, as_array=True), x, y))
+    return frame, np.concatenate(truth)
+
+
+def iou_matrix(a, b):
+    a = a["bbox"].astype(np.float32)[:, None]
+    b = b["bbox"].astype(np.float32)[None]
+    width = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    height = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    intersection = width * height
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return intersection / np.maximum(area_a + area_b - intersection, 1e-6)
+
+
+def recall(truth, detections):
+    """Share of ground-truth boxes matched by a detection of the same class."""
+    if len(truth) == 0:
+        return 1.0
+    if len(detections) == 0:
+        return 0.0
+    overlap = iou_matrix(truth, detections) >= MATCH_IOU
+    same_class = truth["class_id"][:, None] == detections["class_id"][None]
+    return float((overlap & same_class).any(axis=1).mean())
+
+
+def test_bench_yolo_inference_modes(bench, model):
+    frame, truth = small_object_scene(model)
+    width = frame.shape[1]
+    for name, mode in MODES.items():
+        timing = bench.measure(f"yolo.mode.{name}", lambda: model.detect(frame, inference=mode), repeats=3, warmup=1)
+        detections = model.detect(frame, as_array=True, inference=mode)
+        expected = truth
+        if mode is not None and mode.rois:
+            expected = truth[truth["bbox"][:, 2] <= width / 2]
+        bench.record(f"yolo.mode.{name}.recall", recall(expected, detections), unit="ratio", higher_is_better=True)
+        bench.record(f"yolo.mode.{name}.windows", len(mode.windows(*frame.shape[:2])) if mode else 1, unit="crops")
+
+
+def test_bench_merge_nms(bench):
+    rng = np.random.default_rng(0)
+    corners = rng.integers(0, 3000, (300, 2))
+    sizes = rng.integers(20, 400, (300, 2))
+    detections = boxes_to_array(rng.integers(0, 5, 300), rng.random(300), np.hstack([corners, corners + sizes]))
+    bench.measure("yolo.merge_nms.300_boxes", lambda: nms(detections, 0.5, metric="ios"), repeats=REPEATS)
+
+
+if __name__ == "__main__":
+    from conftest import BenchRecorder
+    recorder = BenchRecorder()
+    yolo = YOLOModel(scene_gate=False, load_mode="eager")
+    test_bench_yolo_per_frame(recorder, yolo)
+    test_bench_yolo_batch(recorder, yolo)
+    test_bench_yolo_inference_modes(recorder, yolo)
+    test_bench_merge_nms(recorder)
@@ -0,0 +1,10 @@
+def pytest_addoption(parser):
+    # registered here rather than in tests/bench/ so that one runtest.py call can
+    # pass them to every namespace without the others rejecting them
+    group = parser.getgroup("bench", "visionassist benchmarks")
+    group.addoption("--bench-json", default=None, help="write benchmark results to this JSON file")
+    group.addoption("--bench-baseline", default=None, help="JSON results of a previous run to compare against")
+    group.addoption("--bench-tolerance", type=float, default=None,
+                    help="allowed relative regression against the baseline (default: 0.25)")
+    group.addoption("--bench-db-rows", default="10000,1000000",
+                    help="comma separated database sizes for the memory store benchmarks, up to 10000000")
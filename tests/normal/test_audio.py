@@ -0,0 +1,38 @@
+import io
+import numpy as np
+import soundfile as sf
+from visionassist.stt.audio import WHISPER_SAMPLE_RATE, to_whisper_audio, decode_audio_bytes, decode_pcm_bytes
+
+def make_tone(samplerate, seconds=1.0, channels=1):
+    t = np.arange(int(samplerate * seconds)) / samplerate
+    tone = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    return np.repeat(tone[:, None], channels, axis=1) if channels > 1 else tone
+
+def test_to_whisper_audio_resamples_and_downmixes():
+    audio = to_whisper_audio(make_tone(44100, channels=2), 44100)
+
+    assert audio.dtype == np.float32
+    assert audio.ndim == 1
+    assert len(audio) == WHISPER_SAMPLE_RATE
+
+def test_decode_wav_bytes_in_memory():
+    buffer = io.BytesIO()
+    sf.write(buffer, make_tone(44100), 44100, format="WAV", subtype="PCM_16")
+
+    audio = decode_audio_bytes(buffer.getvalue())
+
+    assert len(audio) == WHISPER_SAMPLE_RATE
+    assert 0.4 < np.abs(audio).max() < 0.6
+
+def test_decode_pcm_bytes():
+    pcm = (make_tone(16000) * 32767).astype(np.int16).tobytes()
+
+    audio = decode_pcm_bytes(pcm, samplerate=16000)
+
+    assert len(audio) == 16000
+    assert 0.4 < np.abs(audio).max() < 0.6
+
+if __name__ == "__main__":
+    test_to_whisper_audio_resamples_and_downmixes()
+    test_decode_wav_bytes_in_memory()
+    test_decode_pcm_bytes()
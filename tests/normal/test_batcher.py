@@ -0,0 +1,48 @@
+import queue
+import time
+from visionassist.model.batcher import FrameBatcher, detect_frames
+
+def test_batcher_fills_to_max_batch_size():
+    frames = queue.Queue()
+    for i in range(10):
+        frames.put(i)
+
+    batcher = FrameBatcher(max_batch_size=4, timeout_ms=1000)
+
+    assert batcher.collect(frames) == [0, 1, 2, 3]
+    assert batcher.collect(frames) == [4, 5, 6, 7]
+
+def test_batcher_releases_partial_batch_after_timeout():
+    frames = queue.Queue()
+    frames.put("frame")
+
+    batcher = FrameBatcher(max_batch_size=8, timeout_ms=20)
+
+    start = time.monotonic()
+    batch = batcher.collect(frames)
+    elapsed = time.monotonic() - start
+
+    assert batch == ["frame"]
+    assert elapsed < 0.5
+
+def test_batcher_empty_queue():
+    batcher = FrameBatcher()
+    assert batcher.collect(queue.Queue(), timeout=0.01) == []
+
+def test_detect_frames_uses_detect_batch_when_available():
+    class FrameDetector:
+        def detect(self, frame):
+            return [frame]
+
+    class BatchDetector(FrameDetector):
+        def detect_batch(self, frames):
+            return [["batch", frame] for frame in frames]
+
+    assert detect_frames(FrameDetector(), [1, 2]) == [[1], [2]]
+    assert detect_frames(BatchDetector(), [1, 2]) == [["batch", 1], ["batch", 2]]
+
+if __name__ == "__main__":
+    test_batcher_fills_to_max_batch_size()
+    test_batcher_releases_partial_batch_after_timeout()
+    test_batcher_empty_queue()
+    test_detect_frames_uses_detect_batch_when_available()
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+from visionassist.memory.cache import LastSeenCache
+from visionassist.memory.database import Database
+
+def test_cache_lru_eviction():
+    cache = LastSeenCache(per_label=3, max_labels=2)
+    cache.load("cup", [1])
+    cache.load("book", [2])
+    cache.get("cup", 1)
+    cache.load("mouse", [3])
+
+    assert cache.get("book", 1) is None
+    assert cache.get("cup", 1) == [1]
+    assert cache.get("mouse", 1) == [3]
+
+def test_cache_push_and_trim():
+    cache = LastSeenCache(per_label=3)
+    cache.push("cup", ["ignored"])
+    assert cache.get("cup", 1) is None
+
+    cache.load("cup", ["b", "a"])
+    cache.push("cup", ["d", "c"])
+    assert cache.get("cup", 3) == ["d", "c", "b"]
+
+    cache.trim("cup", 1)
+    assert cache.get("cup", 3) == ["d"]
+
+def test_cache_skips_stale_load():
+    cache = LastSeenCache()
+    generation = cache.generation("cup")
+    cache.push("cup", ["new"])
+    cache.load("cup", ["stale"], generation)
+
+    assert cache.get("cup", 1) is None
+
+def test_cache_push_skips_objects_a_racing_read_loaded():
+    cache = LastSeenCache(per_label=5)
+    old, new = SimpleNamespace(id=1), SimpleNamespace(id=2)
+    # the read ran after the insert committed but before it pushed to the cache
+    generation = cache.generation("cup")
+    cache.load("cup", [new, old], generation)
+    cache.push("cup", [SimpleNamespace(id=2)])
+
+    assert [obj.id for obj in cache.get("cup", 5)] == [2, 1]
+
+def test_db_serves_latest_objects_from_cache(tmp_path):
+    db = Database(db_path=str(tmp_path / "cache.db"), cache_size=5)
+    db.insert_detection("first.jpg", [{"label": "umbrella", "confidence": 0.8, "bbox": (1, 2, 3, 4)}])
+
+    first = db.get_latest_objects("umbrella", limit=5)
+    db.insert_detection("second.jpg", [{"label": "umbrella", "confidence": 0.9, "bbox": (5, 6, 7, 8)}])
+    second = db.get_latest_objects("umbrella", limit=5)
+
+    assert len(first) == 1
+    assert [obj.confidence for obj in second] == [0.9, 0.8]
+    assert db.cache.get_stats()["hits"] == 1
+    assert db.cache.get_stats()["misses"] == 1
+
+    # larger requests than the cache holds go to the database
+    assert len(db.get_latest_objects("umbrella", limit=20)) == 2
+
+if __name__ == "__main__":
+    test_cache_lru_eviction()
+    test_cache_push_and_trim()
+    test_cache_skips_stale_load()
+    test_cache_push_skips_objects_a_racing_read_loaded()
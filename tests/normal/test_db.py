@@ -1,7 +1,9 @@
+import sqlite3
 from visionassist.memory.database import Database
+from visionassist.memory.migrations import SCHEMA_VERSION
 from visionassist.config import MAX_OBJECT_ENTRIES
 
-db = Database()
+db = Database(prune_inline=True)
 
 def generate_test_data(n_images:50):
     data = []
@@ -29,6 +31,54 @@ def test_db_insert_objects():
     total = MAX_OBJECT_ENTRIES * len(test_data[0][1])
     assert total == db.get_detected_object_count()
 
+def test_db_insert_detections_bulk(tmp_path):
+    bulk_db = Database(db_path=str(tmp_path / "bulk.db"), prune_inline=True)
+    test_data = generate_test_data(120)
+
+    bulk_db.insert_detections(test_data)
+
+    assert bulk_db.get_detected_object_count() == MAX_OBJECT_ENTRIES * len(test_data[0][1])
+    latest = bulk_db.get_latest_objects("backpack", limit=1)[0]
+    assert latest.detection_id == len(test_data)
+
+def test_db_migrates_existing_database(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE detections (id INTEGER PRIMARY KEY AUTOINCREMENT, image_path VARCHAR NOT NULL, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)")
+        conn.execute("CREATE TABLE detection_objects (id INTEGER PRIMARY KEY AUTOINCREMENT, detection_id INTEGER NOT NULL REFERENCES detections (id), object_name VARCHAR NOT NULL, confidence FLOAT, bbox TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)")
+        conn.execute("INSERT INTO detections (image_path) VALUES ('old_image.jpg')")
+        conn.execute("INSERT INTO detection_objects (detection_id, object_name, confidence, bbox) VALUES (1, 'cup', 0.8, '[10, 20, 30, 40]')")
+
+    migrated = Database(db_path=db_path)
+    migrated.insert_detection("test_image.jpg", [{"label": "book", "confidence": 0.9, "bbox": (1, 2, 3, 4)}])
+
+    with sqlite3.connect(db_path) as conn:
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        detection_columns = {row[1] for row in conn.execute("PRAGMA table_info(detections)")}
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    assert "ix_detection_objects_name_timestamp" in indexes
+    assert "ix_detection_objects_detection_id" in indexes
+    assert "ix_detection_objects_timestamp" in indexes
+    assert {"source_id", "frame_width", "frame_height"} <= detection_columns
+    assert "ix_detection_objects_image_path" in indexes
+    assert migrated.get_detected_object_count() == 2
+    assert migrated.get_latest_objects("cup")[0].bbox == (10, 20, 30, 40)
+    assert migrated.get_latest_objects("book")[0].bbox == (1, 2, 3, 4)
+
+def test_db_region_query(tmp_path):
+    region_db = Database(db_path=str(tmp_path / "region.db"))
+    region_db.insert_detection("table.jpg", [
+        {"label": "cup", "confidence": 0.9, "bbox": (10, 10, 50, 50)},
+        {"label": "book", "confidence": 0.9, "bbox": (400, 10, 500, 80)},
+    ])
+
+    left_side = region_db.get_objects_in_region(0, 0, 320, 480)
+
+    assert [obj.object_name for obj in left_side] == ["cup"]
+    assert region_db.get_objects_in_region(0, 0, 640, 480, object_name="book")[0].bbox == (400, 10, 500, 80)
+
 
 if __name__ == "__main__":
     test_db_insert_objects()
\ No newline at end of file
@@ -0,0 +1,38 @@
+import numpy as np
+from visionassist.model.dedup import ImageDeduplicator, dhash, hamming_distance
+
+def make_scene(seed=0):
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 255, (18, 32, 3), dtype=np.uint8)
+    return np.kron(small, np.ones((40, 40, 1), dtype=np.uint8))
+
+def test_dhash_tolerates_noise_and_scale():
+    scene = make_scene()
+    noisy = np.clip(scene.astype(np.int16) + np.random.default_rng(1).integers(-5, 6, scene.shape), 0, 255).astype(np.uint8)
+    half = scene[::2, ::2]
+
+    assert dhash(scene).bit_length() <= 64
+    assert hamming_distance(dhash(scene), dhash(noisy)) <= 4
+    assert hamming_distance(dhash(scene), dhash(half)) <= 4
+    assert hamming_distance(dhash(scene), dhash(make_scene(seed=2))) > 16
+
+def test_deduplicator_lookup_keys_and_expiry():
+    dedup = ImageDeduplicator(max_distance=2, capacity=2, max_age_s=10)
+    dedup.add(0b1111, "a.jpg", key="cup", now=0)
+
+    assert dedup.lookup(0b1110, key="cup", now=1) == "a.jpg"
+    assert dedup.lookup(0b0000, key="cup", now=1) is None
+    assert dedup.lookup(0b1111, key="book", now=1) is None
+    assert dedup.lookup(0b1111, key="cup", now=11) is None
+
+    dedup.add(1, "b.jpg", now=20)
+    dedup.add(2, "c.jpg", now=20)
+    dedup.add(4, "d.jpg", now=20)
+    assert dedup.get_stats()["entries"] == 2
+    dedup.discard("d.jpg")
+    assert dedup.lookup(4, now=20) == "c.jpg"
+    assert dedup.get_stats()["hits"] == 2
+
+if __name__ == "__main__":
+    test_dhash_tolerates_noise_and_scale()
+    test_deduplicator_lookup_keys_and_expiry()
@@ -0,0 +1,51 @@
+import numpy as np
+from visionassist.model.detections import DETECTION_DTYPE, boxes_to_array, array_to_dicts, empty_detections, offset_detections, nms
+
+NAMES = {0: "backpack", 1: "cup"}
+
+def test_boxes_to_array_filters_confidence():
+    detections = boxes_to_array(
+        class_ids=np.array([0.0, 1.0, 1.0]),
+        confidences=np.array([0.95, 0.3, 0.7]),
+        xyxy=np.array([[10.7, 20.2, 30.9, 40.1], [0, 0, 5, 5], [50, 60, 70, 80]]),
+        min_confidence=0.6,
+    )
+
+    assert detections.dtype == DETECTION_DTYPE
+    assert detections["class_id"].tolist() == [0, 1]
+    assert detections["bbox"].tolist() == [[10, 20, 30, 40], [50, 60, 70, 80]]
+
+def test_array_to_dicts_matches_detect_shape():
+    detections = boxes_to_array([0], [0.9], [[1, 2, 3, 4]])
+    dicts = array_to_dicts(detections, NAMES)
+
+    assert dicts == [{"label": "backpack", "confidence": float(np.float32(0.9)), "bbox": (1, 2, 3, 4)}]
+
+def test_empty_detections():
+    assert array_to_dicts(empty_detections(), NAMES) == []
+    assert len(boxes_to_array(np.empty(0), np.empty(0), np.empty((0, 4)))) == 0
+
+def test_offset_detections():
+    detections = boxes_to_array([0], [0.9], [[1, 2, 3, 4]])
+    assert offset_detections(detections, 100, 50)["bbox"].tolist() == [[101, 52, 103, 54]]
+    assert detections["bbox"].tolist() == [[1, 2, 3, 4]]
+
+def test_nms_merges_per_class():
+    detections = boxes_to_array(
+        class_ids=[1, 1, 0, 1],
+        confidences=[0.7, 0.9, 0.8, 0.95],
+        # a cup cut at a tile edge, the full cup, a backpack on top of it, and a far away cup
+        xyxy=[[100, 100, 150, 200], [100, 100, 200, 200], [100, 100, 200, 200], [500, 500, 550, 550]],
+    )
+
+    assert nms(detections, 0.5, metric="ios")["confidence"].tolist() == np.float32([0.95, 0.9, 0.8]).tolist()
+    # the cut box only overlaps the full one by IoU 0.5, so IoU keeps both
+    assert len(nms(detections, 0.5, metric="iou")) == 4
+    assert len(nms(empty_detections())) == 0
+
+if __name__ == "__main__":
+    test_boxes_to_array_filters_confidence()
+    test_array_to_dicts_matches_detect_shape()
+    test_empty_detections()
+    test_offset_detections()
+    test_nms_merges_per_class()
@@ -0,0 +1,94 @@
+import os
+import cv2
+import numpy as np
+from visionassist.model.dedup import ImageDeduplicator
+from visionassist.model.image_store import ImageStore, image_filename
+
+DETECTIONS = [
+    {"label": "cell phone", "confidence": 0.9, "bbox": (100, 100, 200, 300)},
+    {"label": "cup", "confidence": 0.8, "bbox": (400, 50, 600, 250)},
+]
+
+def make_frame():
+    return np.random.default_rng(0).integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+
+def test_image_filename_is_unique():
+    names = {image_filename("cell phone") for _ in range(1000)}
+    assert len(names) == 1000
+    assert all(" " not in name for name in names)
+
+def test_image_store_full_frame(tmp_path):
+    store = ImageStore(image_dir=str(tmp_path), max_side=640, jpeg_quality=70, dedup=False)
+    frame = make_frame()
+
+    paths = [store.save(frame, DETECTIONS) for _ in range(5)]
+    store.flush()
+
+    assert len(set(paths)) == 5
+    image = cv2.imread(paths[0])
+    assert max(image.shape[:2]) == 640
+    assert store.get_stats()["written"] == 5
+    # the caller's frame is not drawn on
+    assert np.array_equal(frame, make_frame())
+    store.close()
+
+def test_image_store_crops(tmp_path):
+    store = ImageStore(image_dir=str(tmp_path), save_crops=True)
+    detections = [dict(det) for det in DETECTIONS]
+
+    path = store.save(make_frame(), detections)
+    store.close()
+
+    assert path == detections[0]["image_path"]
+    assert all(os.path.isfile(det["image_path"]) for det in detections)
+    assert cv2.imread(detections[0]["image_path"]).shape[:2] == (260, 130)
+
+def test_image_store_reuses_duplicate_frames(tmp_path):
+    store = ImageStore(image_dir=str(tmp_path), dedup=ImageDeduplicator(max_age_s=None))
+    frame = make_frame()
+    noisy = np.clip(frame.astype(np.int16) + np.random.default_rng(1).integers(-3, 4, frame.shape), 0, 255).astype(np.uint8)
+
+    paths = [store.save(frame, DETECTIONS), store.save(noisy, DETECTIONS), store.save(frame, DETECTIONS[:1])]
+    store.flush()
+
+    assert paths[1] == paths[0]
+    assert paths[2] != paths[0]  # different objects are a different sighting
+    assert len(os.listdir(tmp_path)) == 2
+    assert store.get_stats()["written"] == 2
+    assert store.get_stats()["deduplicated"] == 1
+
+    os.remove(paths[0])
+    assert store.save(frame, DETECTIONS) != paths[0]
+    store.close()
+
+def test_image_store_reuses_duplicate_crops(tmp_path):
+    store = ImageStore(image_dir=str(tmp_path), save_crops=True)
+    first = [dict(det) for det in DETECTIONS]
+    second = [dict(det) for det in DETECTIONS]
+
+    store.save(make_frame(), first)
+    store.save(make_frame(), second)
+    store.close()
+
+    assert [det["image_path"] for det in second] == [det["image_path"] for det in first]
+    assert len(os.listdir(tmp_path)) == 2
+
+def test_image_store_save_after_close_rolls_back(tmp_path):
+    dedup = ImageDeduplicator(max_age_s=None)
+    store = ImageStore(image_dir=str(tmp_path), queue_size=2, dedup=dedup)
+    store.close()
+
+    for _ in range(3):
+        try:
+            store.save(make_frame(), DETECTIONS)
+            assert False, "a closed store should not accept writes"
+        except RuntimeError:
+            pass
+
+    assert store._pending == set()
+    assert dedup.get_stats()["entries"] == 0
+    store.flush()  # every slot was released, or this would block
+    assert os.listdir(tmp_path) == []
+
+if __name__ == "__main__":
+    test_image_filename_is_unique()
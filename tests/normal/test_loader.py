@@ -0,0 +1,97 @@
+import subprocess
+import sys
+import threading
+import pytest
+from visionassist.loader import ModelLoader
+
+def slow_loader(release, calls):
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return "weights"
+    return load
+
+def test_eager_loads_in_init():
+    loader = ModelLoader(lambda: "weights", mode="eager")
+    assert loader.is_ready()
+    assert loader.get() == "weights"
+    assert loader.load_ms is not None
+
+def test_lazy_loads_on_first_use_once():
+    calls = []
+    loader = ModelLoader(lambda: calls.append(1) or "weights", mode="lazy")
+    assert not loader.is_ready()
+    assert calls == []
+
+    assert loader.get() == "weights"
+    assert loader.get() == "weights"
+    assert calls == [1]
+
+def test_background_reports_readiness():
+    release, calls = threading.Event(), []
+    loader = ModelLoader(slow_loader(release, calls), mode="background")
+
+    assert not loader.is_ready()
+    assert not loader.wait_ready(timeout=0.05)
+
+    release.set()
+    assert loader.wait_ready(timeout=5)
+    assert loader.get() == "weights"
+    assert calls == [1]
+
+def test_get_waits_for_background_load():
+    release, calls = threading.Event(), []
+    loader = ModelLoader(slow_loader(release, calls), mode="background")
+    threading.Timer(0.05, release.set).start()
+
+    assert loader.get() == "weights"
+    assert calls == [1]
+
+def test_failed_load_raises_and_can_retry():
+    attempts = []
+    def load():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("weights missing")
+        return "weights"
+
+    loader = ModelLoader(load, mode="lazy")
+    with pytest.raises(RuntimeError):
+        loader.get()
+    assert not loader.is_ready()
+    assert loader.get() == "weights"
+
+def test_wait_ready_raises_when_background_load_fails():
+    def load():
+        raise OSError("weights missing")
+
+    loader = ModelLoader(load, mode="background")
+    with pytest.raises(RuntimeError) as failure:
+        loader.wait_ready(timeout=5)
+    assert isinstance(failure.value.__cause__, OSError)
+    with pytest.raises(RuntimeError):
+        loader.wait_ready()
+    assert not loader.is_ready()
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        ModelLoader(lambda: None, mode="later")
+
+def test_imports_do_not_pull_in_heavy_dependencies():
+    code = (
+        "import sys\n"
+        "import visionassist.model.yolo, visionassist.stt.model, visionassist.memory.database, visionassist.tts.model\n"
+        "print(','.join(m for m in ('torch', 'ultralytics', 'cv2', 'whisper', 'gtts', 'scipy') if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+if __name__ == "__main__":
+    test_eager_loads_in_init()
+    test_lazy_loads_on_first_use_once()
+    test_background_reports_readiness()
+    test_get_waits_for_background_load()
+    test_failed_load_raises_and_can_retry()
+    test_wait_ready_raises_when_background_load_fails()
+    test_invalid_mode()
+    test_imports_do_not_pull_in_heavy_dependencies()
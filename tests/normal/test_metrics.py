@@ -0,0 +1,133 @@
+import json
+import urllib.request
+from visionassist import metrics
+from visionassist.memory.database import Database
+from visionassist.metrics import MetricsRegistry
+from visionassist.tts.backends import TTSBackend
+from visionassist.tts.cache import PhraseCache
+from visionassist.tts.model import TextToSpeechModel
+
+class EchoBackend(TTSBackend):
+    name = "echo"
+
+    def synthesize(self, text, lang):
+        return text.encode("utf-8")
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+
+    @registry.timed("work")
+    def work(x):
+        return x * 2
+
+    assert work(21) == 42
+    registry.inc("calls")
+    registry.observe("latency", 5)
+    with registry.span("block"):
+        pass
+
+    assert registry.snapshot() == {"counters": {}, "spans": {}}
+
+def test_counters_and_span_quantiles():
+    registry = MetricsRegistry(enabled=True)
+    registry.inc("frames")
+    registry.inc("frames", 2)
+    for value in range(1, 101):
+        registry.observe("stage", value)
+
+    snapshot = registry.snapshot()
+    assert snapshot["counters"] == {"frames": 3}
+    stage = snapshot["spans"]["stage"]
+    assert stage["count"] == 100
+    assert stage["p50"] == 51
+    assert stage["p99"] == 100
+    assert stage["max"] == 100
+
+def test_timed_records_duration_and_keeps_exceptions():
+    registry = MetricsRegistry(enabled=True)
+
+    @registry.timed("fails")
+    def fails():
+        raise KeyError("boom")
+
+    try:
+        fails()
+        assert False, "exception should propagate"
+    except KeyError:
+        pass
+    assert registry.snapshot()["spans"]["fails"]["count"] == 1
+
+def test_drain_and_merge_across_registries():
+    worker, parent = MetricsRegistry(enabled=True), MetricsRegistry(enabled=True)
+    parent.inc("frames")
+    parent.observe("stage", 100)
+    worker.inc("frames", 2)
+    for value in range(1, 4):
+        worker.observe("stage", value)
+
+    parent.merge(worker.drain())
+
+    snapshot = parent.snapshot()
+    assert snapshot["counters"] == {"frames": 3}
+    assert snapshot["spans"]["stage"]["count"] == 4
+    assert snapshot["spans"]["stage"]["sum"] == 106
+    assert snapshot["spans"]["stage"]["max"] == 100
+    assert worker.drain() == {"counters": {}, "histograms": {}}
+
+def test_prometheus_format():
+    registry = MetricsRegistry(enabled=True)
+    registry.inc("db.cache_hits", 4)
+    registry.observe("yolo.detect", 3)
+    registry.observe("yolo.detect", 30000)
+
+    text = registry.to_prometheus()
+
+    assert "visionassist_db_cache_hits_total 4" in text
+    assert "# TYPE visionassist_span_duration_ms histogram" in text
+    assert 'visionassist_span_duration_ms_bucket{span="yolo.detect",le="5"} 1' in text
+    assert 'visionassist_span_duration_ms_bucket{span="yolo.detect",le="+Inf"} 2' in text
+    assert 'visionassist_span_duration_ms_count{span="yolo.detect"} 2' in text
+
+def test_instrumented_components_and_endpoint(tmp_path):
+    metrics.registry.reset()
+    metrics.enable()
+    server = metrics.serve(port=0)
+    try:
+        db = Database(db_path=str(tmp_path / "metrics.db"))
+        db.insert_detection("frame.jpg", [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}])
+        db.get_latest_objects("cup")
+        db.get_latest_objects("cup")
+
+        tts = TextToSpeechModel(backend=EchoBackend(), cache=PhraseCache(str(tmp_path / "cache")))
+        tts.synthesize("hello")
+        tts.synthesize("hello")
+
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(f"{base}/metrics.json") as response:
+            snapshot = json.loads(response.read())
+        with urllib.request.urlopen(f"{base}/metrics") as response:
+            prometheus = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+        metrics.disable()
+        metrics.registry.reset()
+
+    assert snapshot["counters"]["db.objects_inserted"] == 1
+    assert snapshot["counters"]["db.cache_hits"] >= 1
+    assert snapshot["counters"]["tts.cache_hits"] == 1
+    assert snapshot["spans"]["db.insert_detections"]["count"] == 1
+    assert snapshot["spans"]["tts.synthesize"]["count"] == 2
+    assert snapshot["spans"]["tts.backend.echo"]["count"] == 1
+    assert 'span="db.get_latest_objects"' in prometheus
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_disabled_registry_records_nothing()
+    test_counters_and_span_quantiles()
+    test_timed_records_duration_and_keeps_exceptions()
+    test_drain_and_merge_across_registries()
+    test_prometheus_format()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_instrumented_components_and_endpoint(Path(tmp))
@@ -0,0 +1,156 @@
+import os
+import time
+import numpy as np
+from sqlalchemy import func, select
+from visionassist import metrics
+from visionassist.memory.database import Database
+from visionassist.memory.models import Detection
+from visionassist.memory.query import QueryEngine
+from visionassist.memory.retention import RetentionWorker
+from visionassist.pipeline.multi import MultiCameraRunner, SharedFrameRing
+
+
+class SyntheticDetector:
+    """Stands in for YOLOModel inside the worker processes; must be importable to be spawned."""
+
+    def detect(self, frame):
+        return [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}]
+
+    def save_with_bbox(self, frame, detections):
+        return f"frame_{int(frame[0, 0, 0])}.jpg"
+
+
+class FlakyDetector(SyntheticDetector):
+    """Fails on every frame whose first pixel is odd."""
+
+    def detect(self, frame):
+        if frame[0, 0, 0] % 2:
+            raise ValueError("bad frame")
+        return super().detect(frame)
+
+
+class BatchDetector(SyntheticDetector):
+    """Names every saved image after the size of the batch its frame came in."""
+
+    def detect_batch(self, frames):
+        self.batch_size = len(frames)
+        return [self.detect(frame) for frame in frames]
+
+    def save_with_bbox(self, frame, detections):
+        return f"batch_{self.batch_size}_{super().save_with_bbox(frame, detections)}"
+
+
+class MeteredDetector(SyntheticDetector):
+    """Records a counter and a span per frame, like YOLOModel does, inside the worker process."""
+
+    def detect(self, frame):
+        metrics.inc("test.worker_frames")
+        with metrics.span("test.worker_detect"):
+            return super().detect(frame)
+
+
+class CrashingDetector(SyntheticDetector):
+    """Kills its worker process on the first frame, like a segfault in the model would."""
+
+    def detect(self, frame):
+        os._exit(1)
+
+
+def synthetic_frames(n_frames, shape=(8, 8, 3), interval_s=0.0):
+    for i in range(n_frames):
+        time.sleep(interval_s)
+        yield np.full(shape, i % 256, dtype=np.uint8)
+
+
+def test_shared_frame_ring_round_trip():
+    ring = SharedFrameRing(slots=3, shape=(4, 5, 3))
+    attached = SharedFrameRing(slots=3, shape=(4, 5, 3), name=ring.name, create=False)
+    try:
+        frame = np.arange(60, dtype=np.uint8).reshape(4, 5, 3)
+        ring.write(2, frame)
+
+        assert np.array_equal(attached.view(2), frame)
+        assert not attached.view(1).any()
+    finally:
+        attached.close()
+        ring.close()
+        ring.unlink()
+
+def test_runner_tags_detections_with_source(tmp_path):
+    db = Database(db_path=str(tmp_path / "cameras.db"))
+    sources = {"kitchen": synthetic_frames(12), "hall": synthetic_frames(7, shape=(6, 10, 3))}
+    retention = RetentionWorker(db, image_dir=str(tmp_path / "images"))
+    runner = MultiCameraRunner(sources, database=db, detector_factory=SyntheticDetector, ring_slots=2, write_batch=5, drop_when_busy=False, retention=retention)
+
+    stats = runner.run()
+
+    assert stats["kitchen"]["processed"] == stats["kitchen"]["written"] == 12
+    assert stats["hall"]["processed"] == stats["hall"]["written"] == 7
+    assert stats["total"]["errors"] == stats["total"]["dropped"] == 0
+    with db.SessionLocal() as session:
+        counts = dict(session.execute(select(Detection.source_id, func.count()).group_by(Detection.source_id)).all())
+    assert counts == {"kitchen": 12, "hall": 7}
+    assert QueryEngine(db).last_seen(["cup"])[0].source_id in ("kitchen", "hall")
+    assert retention.get_stats()["runs"] >= 1
+    assert retention._thread is None
+
+def test_runner_counts_failed_frames(tmp_path):
+    db = Database(db_path=str(tmp_path / "flaky.db"))
+    runner = MultiCameraRunner({"porch": synthetic_frames(10)}, database=db, detector_factory=FlakyDetector, drop_when_busy=False, retention=False)
+
+    stats = runner.run()
+
+    assert stats["porch"]["errors"] == 5
+    assert stats["porch"]["written"] == 5
+    assert db.get_detected_object_count() == 5
+
+def test_runner_batches_detection(tmp_path):
+    db = Database(db_path=str(tmp_path / "batched.db"))
+    runner = MultiCameraRunner({"yard": synthetic_frames(12)}, database=db, detector_factory=BatchDetector, ring_slots=4, drop_when_busy=False, retention=False)
+
+    stats = runner.run()
+
+    assert stats["yard"]["processed"] == stats["yard"]["written"] == 12
+    with db.SessionLocal() as session:
+        batch_sizes = [int(path.split("_")[1]) for path in session.scalars(select(Detection.image_path))]
+    assert max(batch_sizes) > 1
+
+def test_runner_merges_worker_metrics():
+    metrics.registry.reset()
+    metrics.enable()
+    try:
+        runner = MultiCameraRunner({"kitchen": synthetic_frames(6), "hall": synthetic_frames(4)}, detector_factory=MeteredDetector, drop_when_busy=False, retention=False)
+        runner.run()
+        snapshot = metrics.snapshot()
+    finally:
+        metrics.disable()
+        metrics.registry.reset()
+
+    assert snapshot["counters"]["test.worker_frames"] == 10
+    assert snapshot["spans"]["test.worker_detect"]["count"] == 10
+
+def test_runner_restarts_dead_workers(tmp_path):
+    db = Database(db_path=str(tmp_path / "crash.db"))
+    runner = MultiCameraRunner({"garage": synthetic_frames(3000, interval_s=0.01)}, database=db, detector_factory=CrashingDetector,
+                               ring_slots=2, drop_when_busy=True, retention=False, max_restarts=1)
+
+    stats = runner.run()
+
+    assert stats["garage"]["restarts"] == 1
+    assert stats["garage"]["errors"] == 1
+    assert stats["garage"]["processed"] == 0
+    assert stats["garage"]["captured"] < 3000
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_shared_frame_ring_round_trip()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_runner_tags_detections_with_source(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_runner_counts_failed_frames(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_runner_batches_detection(Path(tmp))
+    test_runner_merges_worker_metrics()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_runner_restarts_dead_workers(Path(tmp))
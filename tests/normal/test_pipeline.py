@@ -0,0 +1,119 @@
+import time
+import numpy as np
+from visionassist.memory.database import Database
+from visionassist.memory.retention import RetentionWorker
+from visionassist.model.tracker import ObjectTracker
+from visionassist.pipeline.stream import LatestQueue, StreamingPipeline
+
+
+class SyntheticDetector:
+    """Stands in for YOLOModel so the pipeline can run on synthetic frames."""
+
+    def __init__(self, save_delay=0.0):
+        self.save_delay = save_delay
+        self.saved = 0
+
+    def detect(self, frame):
+        return [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}]
+
+    def save_with_bbox(self, frame, detections):
+        time.sleep(self.save_delay)
+        self.saved += 1
+        return f"frame_{int(frame[0, 0, 0])}.jpg"
+
+
+class BatchDetector(SyntheticDetector):
+    """Records the size of every batch it is given."""
+
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def detect_batch(self, frames):
+        self.batch_sizes.append(len(frames))
+        return [self.detect(frame) for frame in frames]
+
+
+class SlowDatabase(Database):
+    """Database whose writes take longer than a frame."""
+
+    def insert_detection(self, *args, **kwargs):
+        time.sleep(0.02)
+        return super().insert_detection(*args, **kwargs)
+
+
+def synthetic_frames(n_frames, interval_s=0.0):
+    for i in range(n_frames):
+        time.sleep(interval_s)
+        yield np.full((8, 8, 3), i % 256, dtype=np.uint8)
+
+
+def test_latest_queue_drops_oldest():
+    q = LatestQueue(maxsize=2)
+    for i in range(5):
+        q.put_latest(i)
+
+    assert q.dropped == 3
+    assert [q.get_nowait(), q.get_nowait()] == [3, 4]
+
+def test_pipeline_runs_all_stages(tmp_path):
+    db = Database(db_path=str(tmp_path / "pipeline.db"))
+    retention = RetentionWorker(db, image_dir=str(tmp_path / "images"))
+    pipeline = StreamingPipeline(synthetic_frames(20), SyntheticDetector(), database=db, queue_size=32, retention=retention)
+
+    stats = pipeline.run()
+
+    assert stats["capture"]["processed"] == 20
+    assert stats["detect"]["processed"] == 20
+    assert stats["persist"]["processed"] == stats["save"]["processed"] == 20
+    assert db.get_detected_object_count() == 20
+    assert retention.get_stats()["runs"] >= 1
+    assert retention._thread is None
+
+def test_pipeline_batches_detection(tmp_path):
+    db = Database(db_path=str(tmp_path / "batched.db"))
+    detector = BatchDetector()
+    pipeline = StreamingPipeline(synthetic_frames(20), detector, database=db, queue_size=32, retention=False)
+
+    stats = pipeline.run()
+
+    assert stats["detect"]["processed"] == sum(detector.batch_sizes) == 20
+    assert max(detector.batch_sizes) > 1
+    assert db.get_detected_object_count() == 20
+
+def test_pipeline_tracker_persists_once_per_sighting(tmp_path):
+    db = Database(db_path=str(tmp_path / "tracked.db"))
+    pipeline = StreamingPipeline(synthetic_frames(20), SyntheticDetector(), database=db, queue_size=32, tracker=ObjectTracker(), retention=False)
+
+    stats = pipeline.run()
+
+    assert stats["detect"]["processed"] == 20
+    assert db.get_detected_object_count() == 1
+
+def test_pipeline_slow_save_does_not_stall_detection():
+    detector = SyntheticDetector(save_delay=0.05)
+    pipeline = StreamingPipeline(synthetic_frames(50), detector, queue_size=1)
+
+    start = time.monotonic()
+    stats = pipeline.run()
+    elapsed = time.monotonic() - start
+
+    assert stats["detect"]["processed"] + stats["detect"]["dropped"] == 50
+    assert detector.saved < 50
+    assert elapsed < 50 * detector.save_delay
+
+def test_pipeline_slow_database_does_not_lose_saved_images(tmp_path):
+    db = SlowDatabase(db_path=str(tmp_path / "slow.db"))
+    detector = SyntheticDetector()
+    pipeline = StreamingPipeline(synthetic_frames(40, interval_s=0.005), detector, database=db, queue_size=1, retention=False)
+
+    stats = pipeline.run()
+
+    assert stats["persist"]["dropped"] == 0
+    assert detector.saved > 10
+    assert stats["persist"]["processed"] == stats["save"]["processed"] == detector.saved
+    assert db.get_detected_object_count() == detector.saved
+
+if __name__ == "__main__":
+    test_latest_queue_drops_oldest()
+    test_pipeline_slow_save_does_not_stall_detection()
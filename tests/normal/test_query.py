@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from visionassist.memory.database import Database
+from visionassist.memory.models import Detection, DetectedObject
+from visionassist.memory.query import (
+    QueryEngine, frame_region, parse_query, resolve_labels, time_ago, utcnow, LAST_SEEN, TIME_WINDOW, NEAR, UNKNOWN
+)
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+def add_frame(db, minutes_ago, labels, image_path=None):
+    """Insert one frame with a fixed timestamp, `minutes_ago` before NOW."""
+    timestamp = NOW - timedelta(minutes=minutes_ago)
+    with db.SessionLocal() as session:
+        detection_id = session.execute(
+            insert(Detection).returning(Detection.id),
+            {"image_path": image_path or f"frame_{minutes_ago}.jpg", "timestamp": timestamp},
+        ).scalar_one()
+        session.execute(insert(DetectedObject), [
+            {"detection_id": detection_id, "object_name": label, "confidence": 0.9,
+             "x1": 10, "y1": 10, "x2": 50, "y2": 50, "timestamp": timestamp}
+            for label in labels
+        ])
+        session.commit()
+
+def make_engine(tmp_path, page_size=5):
+    db = Database(db_path=str(tmp_path / "query.db"), cache_size=0)
+    add_frame(db, 300, ["laptop", "mouse", "cup"])
+    add_frame(db, 90, ["laptop", "cup"])
+    add_frame(db, 30, ["cell phone", "book"])
+    add_frame(db, 5, ["laptop", "book"], image_path="desk.jpg")
+    add_frame(db, 2, ["cup"])
+    return QueryEngine(db, page_size=page_size)
+
+def test_resolve_labels_synonyms():
+    assert resolve_labels("where is my phone") == ["cell phone"]
+    assert resolve_labels("Where did I leave my cell phone?") == ["cell phone"]
+    assert resolve_labels("have you seen my keys") == []
+    assert resolve_labels("my mug and my books") == ["cup", "book"]
+    assert resolve_labels("my bag") == ["backpack", "handbag", "suitcase"]
+
+def test_parse_query_intents():
+    assert parse_query("Where is my laptop?", now=NOW).intent == LAST_SEEN
+    assert parse_query("What was near my laptop", now=NOW).intent == NEAR
+    assert parse_query("hello there", now=NOW).intent == UNKNOWN
+
+    window = parse_query("did you see my phone in the last 10 minutes", now=NOW)
+    assert window.intent == TIME_WINDOW
+    assert window.labels == ["cell phone"]
+    assert window.since == NOW - timedelta(minutes=10)
+
+    assert parse_query("what did you see in the past hour", now=NOW).since == NOW - timedelta(hours=1)
+    yesterday = parse_query("was my book here yesterday", now=NOW)
+    assert yesterday.until - yesterday.since == timedelta(days=1)
+
+def test_time_ago():
+    assert time_ago(NOW - timedelta(seconds=20), NOW) == "just now"
+    assert time_ago(NOW - timedelta(minutes=1), NOW) == "1 minute ago"
+    assert time_ago(NOW - timedelta(minutes=150), NOW) == "2 hours ago"
+
+def test_last_seen(tmp_path):
+    engine = make_engine(tmp_path)
+    result = engine.ask("Where did I leave my computer?", now=NOW)
+
+    assert result.intent == LAST_SEEN
+    assert [(s.label, s.image_path) for s in result.sightings] == [("laptop", "desk.jpg")]
+    assert result.sightings[0].bbox == (10, 10, 50, 50)
+    assert result.to_speech(now=NOW) == "Your laptop was last seen 5 minutes ago."
+
+    missing = engine.ask("where is my umbrella", now=NOW)
+    assert missing.to_speech(now=NOW) == "I have not seen your umbrella."
+
+def test_frame_region():
+    assert frame_region((0, 300, 100, 400), (1280, 720)) == "on the left"
+    assert frame_region((1200, 0, 1280, 100), (1280, 720)) == "in the top right"
+    assert frame_region((600, 600, 700, 720), (1280, 720)) == "at the bottom"
+    assert frame_region((600, 300, 700, 400), (1280, 720)) == "in the middle"
+
+def test_last_seen_location(tmp_path):
+    db = Database(db_path=str(tmp_path / "location.db"))
+    db.insert_detection("kitchen.jpg", [{"label": "cup", "confidence": 0.9, "bbox": (10, 300, 110, 400)}], source_id="kitchen", frame_size=(1280, 720))
+    db.insert_detection("desk.jpg", [{"label": "book", "confidence": 0.9, "bbox": (1100, 10, 1200, 90)}], frame_size=(1280, 720))
+    db.insert_detection("hall.jpg", [{"label": "laptop", "confidence": 0.9, "bbox": None}], source_id="hall")
+    engine = QueryEngine(db)
+
+    cup = engine.ask("where is my cup")
+    assert cup.sightings[0].source_id == "kitchen"
+    assert cup.to_speech(now=utcnow()) == "Your cup was last seen just now. It was on the left of camera kitchen."
+    assert engine.ask("where is my book").to_speech(now=utcnow()) == "Your book was last seen just now. It was in the top right of the camera view."
+    assert engine.ask("where is my laptop").to_speech(now=utcnow()) == "Your laptop was last seen just now. It was seen by camera hall."
+
+def test_time_window_pagination(tmp_path):
+    engine = make_engine(tmp_path, page_size=2)
+
+    first, cursor = engine.seen_between(since=NOW - timedelta(minutes=60))
+    assert [s.label for s in first] == ["cup", "book"]
+    assert cursor is not None
+
+    second, cursor = engine.seen_between(since=NOW - timedelta(minutes=60), cursor=cursor)
+    assert sorted(s.label for s in second) == ["book", "laptop"]
+    assert cursor is not None
+
+    third, cursor = engine.seen_between(since=NOW - timedelta(minutes=60), cursor=cursor)
+    assert [s.label for s in third] == ["cell phone"]
+    assert cursor is None
+
+    result = engine.ask("did you see my phone in the last hour", now=NOW)
+    assert result.to_speech(now=NOW) == "I saw your cell phone 30 minutes ago."
+
+def test_cooccurrence(tmp_path):
+    engine = make_engine(tmp_path)
+    result = engine.ask("what was near my laptop", now=NOW)
+
+    assert result.intent == NEAR
+    assert [(r.label, r.frames) for r in result.related] == [("cup", 2), ("book", 1), ("mouse", 1)]
+    assert result.to_speech(now=NOW) == "Next to your laptop I saw your cup, your book and your mouse."
+
+    recent = engine.co_occurring(["laptop"], frames=1)
+    assert [r.label for r in recent] == ["book"]
+
+def query_plan(engine, stmt):
+    with engine.database.engine.connect() as conn:
+        compiled = stmt.compile(conn, compile_kwargs={"literal_binds": True})
+        return " ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}"))
+
+def test_queries_use_indexes(tmp_path):
+    engine = make_engine(tmp_path)
+    latest = (
+        engine._sightings().where(DetectedObject.object_name == "cup")
+        .order_by(DetectedObject.timestamp.desc(), DetectedObject.id.desc()).limit(1)
+    )
+    recent = (
+        engine._sightings().where(DetectedObject.timestamp >= NOW)
+        .order_by(DetectedObject.timestamp.desc(), DetectedObject.id.desc()).limit(5)
+    )
+
+    plan = query_plan(engine, latest)
+    assert "ix_detection_objects_name_timestamp" in plan and "TEMP B-TREE" not in plan
+    plan = query_plan(engine, recent)
+    assert "ix_detection_objects_timestamp" in plan and "TEMP B-TREE" not in plan
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_resolve_labels_synonyms()
+    test_parse_query_intents()
+    test_time_ago()
+    test_frame_region()
+    for test in (test_last_seen, test_last_seen_location, test_time_window_pagination, test_cooccurrence, test_queries_use_indexes):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
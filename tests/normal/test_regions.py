@@ -0,0 +1,43 @@
+import numpy as np
+from visionassist.model.regions import InferenceMode, inference_mode, make_tiles, resolve_region
+
+def test_resolve_region_clips_to_frame():
+    assert resolve_region((0.25, 0.5, 0.75, 1.0), 720, 1280) == (320, 360, 960, 720)
+    assert resolve_region((0.8, -0.2, 0.2, 0.5), 100, 100) == (20, 0, 80, 50)
+
+def test_resolve_region_on_frame_edge_is_not_empty():
+    frame = np.zeros((100, 200, 3), dtype=np.uint8)
+    for region in [(1.0, 1.0, 1.0, 1.0), (1.0, 0.0, 1.2, 1.0), (0.0, 0.0, 0.0, 0.0)]:
+        x1, y1, x2, y2 = resolve_region(region, 100, 200)
+        assert 0 <= x1 < x2 <= 200 and 0 <= y1 < y2 <= 100
+        assert frame[y1:y2, x1:x2].size
+    assert resolve_region((1.0, 1.0, 1.0, 1.0), 100, 200) == (199, 99, 200, 100)
+
+def test_make_tiles_cover_window_with_overlap():
+    tiles = make_tiles((0, 0, 1920, 1080), tile_size=640, overlap=0.2)
+
+    assert all(x2 - x1 == 640 and y2 - y1 == 640 for x1, y1, x2, y2 in tiles)
+    assert sorted({x1 for x1, _, _, _ in tiles}) == [0, 512, 1024, 1280]
+    assert sorted({y1 for _, y1, _, _ in tiles}) == [0, 440]
+    assert make_tiles((10, 20, 300, 200), tile_size=640) == [(10, 20, 300, 200)]
+
+def test_inference_mode_windows():
+    assert InferenceMode().is_whole_frame
+    assert InferenceMode().windows(720, 1280) == [(0, 0, 1280, 720)]
+
+    roi = InferenceMode(rois={"table": (0.0, 0.5, 0.5, 1.0), "door": (0.9, 0.0, 1.0, 1.0)})
+    assert roi.windows(720, 1280) == [(0, 360, 640, 720), (1152, 0, 1280, 720)]
+
+    tiled = inference_mode({"tile_size": 640, "tile_overlap": 0.0})
+    windows = tiled.windows(1080, 1920)
+    assert len(windows) == 3 * 2 + 1
+    assert windows[-1] == (0, 0, 1920, 1080)
+
+    tiles_only = InferenceMode(rois={"table": (0.0, 0.5, 0.5, 1.0)}, tile_size=640, tile_overlap=0.0, full_frame=False)
+    assert tiles_only.windows(1440, 2560) == [(0, 720, 640, 1360), (640, 720, 1280, 1360), (0, 800, 640, 1440), (640, 800, 1280, 1440)]
+
+if __name__ == "__main__":
+    test_resolve_region_clips_to_frame()
+    test_resolve_region_on_frame_edge_is_not_empty()
+    test_make_tiles_cover_window_with_overlap()
+    test_inference_mode_windows()
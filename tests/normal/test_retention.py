@@ -0,0 +1,186 @@
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from visionassist.memory.database import Database
+from visionassist.memory.models import Detection
+from visionassist.memory.retention import RetentionPolicy, RetentionWorker
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+def make_image(image_dir, name, size=1000, age_s=0):
+    path = os.path.join(image_dir, name)
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    if age_s:
+        old = time.time() - age_s
+        os.utime(path, (old, old))
+    return path
+
+def set_age(db_path, days):
+    with sqlite3.connect(db_path) as conn:
+        timestamp = (NOW - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+        conn.execute("UPDATE detections SET timestamp = ?", (timestamp,))
+        conn.execute("UPDATE detection_objects SET timestamp = ?", (timestamp,))
+
+def make_worker(tmp_path, **kwargs):
+    image_dir = str(tmp_path / "images")
+    os.makedirs(image_dir, exist_ok=True)
+    db = Database(db_path=str(tmp_path / "retention.db"), cache_size=5)
+    kwargs.setdefault("policies", {})
+    return db, RetentionWorker(db, image_dir=image_dir, batch_size=7, **kwargs), image_dir
+
+def detection_count(db):
+    with db.SessionLocal() as session:
+        return session.execute(select(func.count(Detection.id))).scalar()
+
+def test_retention_keeps_newest_per_label_and_removes_images(tmp_path):
+    db, worker, image_dir = make_worker(tmp_path, default_policy=RetentionPolicy(max_entries=5, max_age_days=None), policies={"book": {"max_entries": 2}})
+    for i in range(30):
+        db.insert_detection(make_image(image_dir, f"cup_{i}.jpg"), [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}])
+    for i in range(10):
+        db.insert_detection(make_image(image_dir, f"book_{i}.jpg"), [{"label": "book", "confidence": 0.9, "bbox": (1, 2, 3, 4)}])
+    assert db.get_detected_object_count() == 40
+
+    stats = worker.run_once(now=NOW)
+
+    assert stats["objects"] == 25 + 8
+    assert stats["detections"] == 33
+    assert stats["images"] == 33
+    assert db.get_detected_object_count() == 7
+    assert detection_count(db) == 7
+    assert sorted(os.listdir(image_dir)) == sorted([f"cup_{i}.jpg" for i in range(25, 30)] + ["book_8.jpg", "book_9.jpg"])
+    assert [obj.image_path for obj in db.get_latest_objects("book")] == [None, None]
+    assert db.get_latest_objects("cup", limit=1)[0].detection_id == 30
+
+def test_retention_deletes_by_age(tmp_path):
+    db, worker, image_dir = make_worker(tmp_path, default_policy=RetentionPolicy(max_entries=None, max_age_days=7))
+    db.insert_detection(make_image(image_dir, "old.jpg"), [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}])
+    set_age(tmp_path / "retention.db", days=10)
+    db.insert_detection(make_image(image_dir, "new.jpg"), [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}])
+
+    worker.run_once(now=NOW)
+
+    assert os.listdir(image_dir) == ["new.jpg"]
+    assert db.get_detected_object_count() == 1
+
+def test_retention_removes_crops(tmp_path):
+    db, worker, image_dir = make_worker(tmp_path, default_policy=RetentionPolicy(max_entries=1, max_age_days=None))
+    for i in range(3):
+        db.insert_detection(make_image(image_dir, f"frame_{i}.jpg"), [
+            {"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4), "image_path": make_image(image_dir, f"cup_{i}.jpg")},
+        ])
+
+    worker.run_once(now=NOW)
+
+    assert sorted(os.listdir(image_dir)) == ["cup_2.jpg", "frame_2.jpg"]
+
+def test_retention_disk_budget(tmp_path):
+    db, worker, image_dir = make_worker(tmp_path, default_policy=RetentionPolicy(max_entries=None, max_age_days=None), disk_budget_mb=25_000 / (1024 * 1024))
+    for i in range(40):
+        db.insert_detection(make_image(image_dir, f"frame_{i:02}.jpg", size=1000), [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}])
+
+    stats = worker.run_once(now=NOW)
+
+    remaining = sorted(os.listdir(image_dir))
+    assert sum(os.path.getsize(os.path.join(image_dir, name)) for name in remaining) <= 25_000
+    assert remaining[-1] == "frame_39.jpg"
+    assert stats["bytes_freed"] >= 15_000
+    assert detection_count(db) == len(remaining)
+
+def test_retention_disk_budget_ignores_unreferenced_files(tmp_path):
+    db, worker, image_dir = make_worker(tmp_path, default_policy=RetentionPolicy(max_entries=None, max_age_days=None), disk_budget_mb=1)
+    make_image(image_dir, "being_written.jpg", size=2 * 1024 * 1024)
+    for i in range(40):
+        db.insert_detection(make_image(image_dir, f"frame_{i:02}.jpg", size=1000), [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}])
+
+    stats = worker.run_once(now=NOW)
+
+    assert stats["detections"] == 0
+    assert detection_count(db) == 40
+    assert len(os.listdir(image_dir)) == 41
+
+def test_retention_sweeps_unreferenced_files(tmp_path):
+    db, worker, image_dir = make_worker(tmp_path, orphan_grace_s=60)
+    db.insert_detection(make_image(image_dir, "kept.jpg", age_s=3600), [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}])
+    make_image(image_dir, "stray.jpg", age_s=3600)
+    make_image(image_dir, "pending.jpg")
+
+    worker.run_once(now=NOW)
+
+    assert sorted(os.listdir(image_dir)) == ["kept.jpg", "pending.jpg"]
+
+def test_retention_on_legacy_schema(tmp_path):
+    # detection_objects created before its foreign key declared ON DELETE CASCADE
+    db_path = str(tmp_path / "retention.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE detections (id INTEGER PRIMARY KEY AUTOINCREMENT, image_path VARCHAR NOT NULL, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)")
+        conn.execute("CREATE TABLE detection_objects (id INTEGER PRIMARY KEY AUTOINCREMENT, detection_id INTEGER NOT NULL REFERENCES detections (id), object_name VARCHAR NOT NULL, confidence FLOAT, bbox TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)")
+    db, worker, image_dir = make_worker(tmp_path, disk_budget_mb=0.001, default_policy=RetentionPolicy(max_entries=None, max_age_days=None))
+    for i in range(5):
+        db.insert_detection(make_image(image_dir, f"frame_{i}.jpg", size=500), [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}])
+
+    stats = worker.run_once(now=NOW)
+
+    # one batch of up to 7 oldest detections goes per budget step
+    assert stats["detections"] == stats["objects"] == stats["images"] == 5
+    assert detection_count(db) == db.get_detected_object_count() == 0
+    assert os.listdir(image_dir) == []
+
+def test_retention_keeps_shared_images(tmp_path):
+    db, worker, image_dir = make_worker(tmp_path, default_policy=RetentionPolicy(max_entries=2, max_age_days=None))
+    shared = make_image(image_dir, "static_scene.jpg")
+    for _ in range(4):
+        db.insert_detection(shared, [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}])
+
+    stats = worker.run_once(now=NOW)
+    assert stats["detections"] == 2
+    assert stats["images"] == 0
+    assert os.path.isfile(shared)
+
+    worker.default_policy = RetentionPolicy(max_entries=0, max_age_days=None)
+    stats = worker.run_once(now=NOW)
+    assert stats["images"] == 1
+    assert os.listdir(image_dir) == []
+
+def test_retention_incremental_vacuum(tmp_path):
+    db, worker, image_dir = make_worker(tmp_path, default_policy=RetentionPolicy(max_entries=1, max_age_days=None))
+    objects = [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}] * 50
+    db.insert_detections([(f"frame_{i}.jpg", objects) for i in range(200)])
+
+    worker.run_once(now=NOW)
+
+    with sqlite3.connect(tmp_path / "retention.db") as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+def test_retention_worker_thread(tmp_path):
+    db, worker, image_dir = make_worker(tmp_path, default_policy=RetentionPolicy(max_entries=1, max_age_days=None), interval_s=0.01)
+    db.insert_detections([(f"frame_{i}.jpg", [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}]) for i in range(5)])
+
+    worker.start()
+    deadline = time.time() + 5
+    while worker.get_stats()["runs"] == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    worker.stop(timeout=5)
+
+    assert db.get_detected_object_count() == 1
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (
+        test_retention_keeps_newest_per_label_and_removes_images,
+        test_retention_deletes_by_age,
+        test_retention_removes_crops,
+        test_retention_disk_budget,
+        test_retention_disk_budget_ignores_unreferenced_files,
+        test_retention_sweeps_unreferenced_files,
+        test_retention_on_legacy_schema,
+        test_retention_keeps_shared_images,
+        test_retention_incremental_vacuum,
+        test_retention_worker_thread,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
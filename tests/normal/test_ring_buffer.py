@@ -0,0 +1,60 @@
+import numpy as np
+from visionassist.stt.ring_buffer import AudioRingBuffer
+
+def block(start, n):
+    return np.arange(start, start + n, dtype=np.float32).reshape(-1, 1)
+
+def test_ring_buffer_reads_back_writes():
+    ring = AudioRingBuffer(capacity=10)
+    ring.write(block(0, 4))
+    ring.write(block(4, 3))
+
+    data, start = ring.read(0)
+
+    assert start == 0
+    assert data[:, 0].tolist() == list(range(7))
+
+def test_ring_buffer_wraps_and_drops_oldest():
+    ring = AudioRingBuffer(capacity=10)
+    for i in range(0, 25, 5):
+        ring.write(block(i, 5))
+
+    data, start = ring.read(0)
+
+    assert ring.written == 25
+    assert start == 15
+    assert data[:, 0].tolist() == list(range(15, 25))
+
+def test_ring_buffer_preroll_window():
+    ring = AudioRingBuffer(capacity=100)
+    ring.write(block(0, 50))
+
+    # recording starts now with 8 samples of pre-roll
+    start_position = ring.written - 8
+    ring.write(block(50, 20))
+
+    data, start = ring.read(start_position)
+    assert start == 42
+    assert data[:, 0].tolist() == list(range(42, 70))
+
+def test_ring_buffer_oversized_block():
+    ring = AudioRingBuffer(capacity=4)
+    ring.write(block(0, 10))
+
+    data, start = ring.read(0)
+    assert start == 6
+    assert data[:, 0].tolist() == [6, 7, 8, 9]
+
+def test_ring_buffer_memory_is_fixed():
+    ring = AudioRingBuffer(capacity=1000)
+    nbytes = ring._buffer.nbytes
+    for i in range(100):
+        ring.write(block(i * 512, 512))
+    assert ring._buffer.nbytes == nbytes
+
+if __name__ == "__main__":
+    test_ring_buffer_reads_back_writes()
+    test_ring_buffer_wraps_and_drops_oldest()
+    test_ring_buffer_preroll_window()
+    test_ring_buffer_oversized_block()
+    test_ring_buffer_memory_is_fixed()
@@ -0,0 +1,35 @@
+import numpy as np
+from visionassist.model.gate import SceneChangeGate
+
+def make_frame(value, height=120, width=160):
+    return np.full((height, width, 3), value, dtype=np.uint8)
+
+def test_scene_gate_skips_static_frames():
+    gate = SceneChangeGate(threshold=0.02, max_interval_s=60)
+
+    decisions = [gate.should_infer(make_frame(100), now=i) for i in range(10)]
+
+    assert decisions == [True] + [False] * 9
+    assert gate.get_stats()["frames_inferred"] == 1
+    assert gate.get_stats()["frames_skipped"] == 9
+
+def test_scene_gate_detects_change():
+    gate = SceneChangeGate(threshold=0.02, max_interval_s=60)
+    gate.should_infer(make_frame(100), now=0)
+
+    changed = make_frame(100)
+    changed[:, :80] = 255
+
+    assert gate.should_infer(changed, now=1)
+
+def test_scene_gate_max_interval():
+    gate = SceneChangeGate(threshold=0.02, max_interval_s=5)
+    gate.should_infer(make_frame(100), now=0)
+
+    assert not gate.should_infer(make_frame(100), now=4)
+    assert gate.should_infer(make_frame(100), now=5)
+
+if __name__ == "__main__":
+    test_scene_gate_skips_static_frames()
+    test_scene_gate_detects_change()
+    test_scene_gate_max_interval()
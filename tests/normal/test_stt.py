@@ -1,3 +1,5 @@
+import io
+import soundfile as sf
 from visionassist.stt.model import SpeechToTextModel
 from visionassist.config import ENVITRONMENT, WHISPER_MODEL_NAME
 
@@ -10,6 +12,21 @@ def test_stt_model_offline():
     
     assert "transcription" in data
 
+def test_stt_model_offline_in_memory():
+    stt_model = SpeechToTextModel(
+        model_size=WHISPER_MODEL_NAME,
+        mode="offline"
+    )
+    audio, samplerate = sf.read("tests/assets/audio.mp3", dtype="float32")
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, samplerate, format="WAV")
+
+    from_bytes = stt_model.transcribe_from_bytes(buffer.getvalue())
+    from_array = stt_model.transcribe_from_array(audio, samplerate)
+
+    assert "transcription" in from_bytes
+    assert "transcription" in from_array
+
 def test_stt_model_online():
     stt_model = SpeechToTextModel(
         url=ENVITRONMENT["WHISPER_API_URL"],
@@ -22,4 +39,5 @@ def test_stt_model_online():
 
 if __name__ == "__main__":
     test_stt_model_offline()
+    test_stt_model_offline_in_memory()
     test_stt_model_online()
\ No newline at end of file
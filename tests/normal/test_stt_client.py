@@ -0,0 +1,125 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pytest
+import soundfile as sf
+from visionassist.stt.client import WhisperAPIClient, AsyncWhisperAPIClient
+
+API_KEY = "test-key"
+
+
+class StandInWhisperAPI(BaseHTTPRequestHandler):
+    """Mimics the transcription API: checks auth, reads the upload, answers with JSON."""
+
+    failures_left = 0
+    uploads = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        cls = type(self)
+
+        if self.headers.get("Authorization") != f"Bearer {API_KEY}":
+            self._reply(401, {"error": "unauthorized"})
+            return
+        if cls.failures_left > 0:
+            cls.failures_left -= 1
+            self._reply(503, {"error": "busy"})
+            return
+
+        cls.uploads.append(body)
+        self._reply(200, {"transcription": {"text": "hello world"}})
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def stand_in_api():
+    StandInWhisperAPI.failures_left = 0
+    StandInWhisperAPI.uploads = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInWhisperAPI)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/transcribe"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def api_url():
+    with stand_in_api() as url:
+        yield url
+
+
+def make_wav_bytes(samplerate=44100, seconds=1.0):
+    t = np.arange(int(samplerate * seconds)) / samplerate
+    buffer = io.BytesIO()
+    sf.write(buffer, 0.3 * np.sin(2 * np.pi * 440 * t), samplerate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
+
+
+def test_client_transcribes_and_shrinks_upload(api_url):
+    wav_bytes = make_wav_bytes()
+
+    with WhisperAPIClient(api_url, API_KEY, upload_format="FLAC") as client:
+        data = client.transcribe(audio_bytes=wav_bytes)
+
+    assert data["transcription"]["text"] == "hello world"
+    assert b"fLaC" in StandInWhisperAPI.uploads[0]
+    assert len(StandInWhisperAPI.uploads[0]) < len(wav_bytes) / 2
+
+def test_client_uploads_file_path(api_url):
+    with WhisperAPIClient(api_url, API_KEY) as client:
+        data = client.transcribe(audio_path=os.path.join("tests", "assets", "audio.mp3"))
+
+    assert "transcription" in data
+
+def test_client_retries_transient_errors(api_url):
+    StandInWhisperAPI.failures_left = 2
+
+    with WhisperAPIClient(api_url, API_KEY, retries=3, backoff=0.01) as client:
+        data = client.transcribe(audio=np.zeros(16000, dtype=np.float32), samplerate=16000)
+
+    assert data["transcription"]["text"] == "hello world"
+    assert StandInWhisperAPI.failures_left == 0
+
+def test_client_gives_up_after_retries(api_url):
+    StandInWhisperAPI.failures_left = 10
+
+    with WhisperAPIClient(api_url, API_KEY, retries=1, backoff=0.01) as client:
+        with pytest.raises(Exception):
+            client.transcribe(audio=np.zeros(1600, dtype=np.float32), samplerate=16000)
+
+def test_async_client_concurrent_requests(api_url):
+    async def run():
+        async with AsyncWhisperAPIClient(api_url, API_KEY, max_concurrency=2) as client:
+            return await asyncio.gather(*[
+                client.transcribe(audio=np.zeros(1600, dtype=np.float32), samplerate=16000)
+                for _ in range(5)
+            ])
+
+    results = asyncio.run(run())
+
+    assert len(results) == 5
+    assert len(StandInWhisperAPI.uploads) == 5
+
+if __name__ == "__main__":
+    for test in (test_client_transcribes_and_shrinks_upload, test_client_uploads_file_path, test_client_retries_transient_errors,
+                 test_client_gives_up_after_retries, test_async_client_concurrent_requests):
+        with stand_in_api() as url:
+            test(url)
@@ -0,0 +1,90 @@
+import os
+import numpy as np
+import pytest
+from visionassist.stt.worker import SpeechToTextWorker
+
+
+class EchoModel:
+    """Reports the audio length instead of running Whisper, so the worker plumbing runs without the model."""
+
+    def transcribe_from_array(self, audio, samplerate):
+        if len(audio) == 3:
+            os._exit(1)  # simulate a decoder crash
+        return {"transcription": {"text": str(len(audio))}, "timing": {"transcribe_ms": 0.0}}
+
+
+def load_echo_model(model_size):
+    return EchoModel()
+
+
+def load_missing_model(model_size):
+    raise FileNotFoundError(f"no such model: {model_size}")
+
+
+def test_stt_worker_returns_futures():
+    worker = SpeechToTextWorker(model_factory=load_echo_model).start()
+    try:
+        assert worker.wait_ready(timeout=30)
+
+        futures = [worker.submit(np.zeros(n, dtype=np.float32)) for n in (16000, 8000)]
+        texts = [future.result(timeout=10)["transcription"]["text"] for future in futures]
+        # 44.1 kHz input is resampled to 16 kHz in the caller before queueing
+        resampled = worker.transcribe(np.zeros(44100, dtype=np.float32), samplerate=44100, timeout=10)
+
+        assert texts == ["16000", "8000"]
+        assert resampled["transcription"]["text"] == "16000"
+        assert "queue_wait_ms" in resampled["timing"]
+        assert worker.get_metrics()["completed"] == 3
+    finally:
+        worker.stop()
+
+def test_stt_worker_restarts_after_crash():
+    worker = SpeechToTextWorker(model_factory=load_echo_model, warmup=False).start()
+    try:
+        assert worker.wait_ready(timeout=30)
+
+        with pytest.raises(RuntimeError):
+            worker.submit(np.zeros(3, dtype=np.float32)).result(timeout=30)
+
+        assert worker.wait_ready(timeout=30)
+        assert worker.transcribe(np.zeros(10, dtype=np.float32), timeout=10)["transcription"]["text"] == "10"
+        assert worker.restarts == 1
+        assert worker.get_metrics()["failed"] == 1
+    finally:
+        worker.stop()
+
+def test_stt_worker_gives_up_after_max_restarts():
+    worker = SpeechToTextWorker(model_factory=load_echo_model, warmup=False, max_restarts=1, restart_backoff_s=0.05).start()
+    try:
+        assert worker.wait_ready(timeout=30)
+        with pytest.raises(RuntimeError):
+            worker.submit(np.zeros(3, dtype=np.float32)).result(timeout=30)
+        assert worker.wait_ready(timeout=30)
+        with pytest.raises(RuntimeError):
+            worker.submit(np.zeros(3, dtype=np.float32)).result(timeout=30)
+
+        with pytest.raises(RuntimeError, match="giving up"):
+            worker.submit(np.zeros(10, dtype=np.float32)).result(timeout=30)
+        assert worker.restarts == 1
+    finally:
+        worker.stop()
+
+def test_stt_worker_fails_requests_when_model_cannot_load():
+    worker = SpeechToTextWorker(model_size="missing.en", model_factory=load_missing_model).start()
+    try:
+        pending = worker.submit(np.zeros(10, dtype=np.float32))
+        with pytest.raises(RuntimeError, match="no such model: missing.en"):
+            pending.result(timeout=30)
+        with pytest.raises(RuntimeError, match="no such model"):
+            worker.wait_ready(timeout=30)
+        with pytest.raises(RuntimeError, match="no such model"):
+            worker.transcribe(np.zeros(10, dtype=np.float32), timeout=1)
+        assert worker.restarts == 0
+    finally:
+        worker.stop()
+
+if __name__ == "__main__":
+    test_stt_worker_returns_futures()
+    test_stt_worker_restarts_after_crash()
+    test_stt_worker_gives_up_after_max_restarts()
+    test_stt_worker_fails_requests_when_model_cannot_load()
@@ -0,0 +1,51 @@
+from visionassist.model.tracker import ObjectTracker, iou_matrix, events_to_objects
+
+def detection(label, bbox, confidence=0.9):
+    return {"label": label, "confidence": confidence, "bbox": bbox}
+
+def test_iou_matrix():
+    ious = iou_matrix([(0, 0, 10, 10)], [(0, 0, 10, 10), (5, 0, 15, 10), (20, 20, 30, 30)])
+    assert ious.shape == (1, 3)
+    assert ious[0, 0] == 1.0
+    assert abs(ious[0, 1] - 1 / 3) < 1e-6
+    assert ious[0, 2] == 0.0
+
+def test_tracker_static_object_appears_once():
+    tracker = ObjectTracker()
+
+    events = []
+    for _ in range(100):
+        events += tracker.update([detection("backpack", (10, 10, 110, 110))])
+
+    assert [e["event"] for e in events] == ["appeared"]
+
+def test_tracker_moved_and_disappeared():
+    tracker = ObjectTracker(iou_threshold=0.1, move_threshold=0.25, max_missed=2)
+    first = tracker.update([detection("cup", (0, 0, 100, 100))])
+    track_id = first[0]["track_id"]
+
+    # small jitter is not a move
+    assert tracker.update([detection("cup", (5, 5, 105, 105))]) == []
+
+    moved = tracker.update([detection("cup", (50, 0, 150, 100))])
+    assert [(e["event"], e["track_id"]) for e in moved] == [("moved", track_id)]
+
+    assert tracker.update([]) == []
+    assert tracker.update([]) == []
+    gone = tracker.update([])
+    assert [(e["event"], e["track_id"]) for e in gone] == [("disappeared", track_id)]
+
+def test_tracker_keeps_labels_apart():
+    tracker = ObjectTracker()
+    tracker.update([detection("cup", (0, 0, 50, 50))])
+
+    events = tracker.update([detection("bottle", (0, 0, 50, 50)), detection("cup", (0, 0, 50, 50))])
+
+    assert [(e["event"], e["label"]) for e in events] == [("appeared", "bottle")]
+    assert len(events_to_objects(events)) == 1
+
+if __name__ == "__main__":
+    test_iou_matrix()
+    test_tracker_static_object_appears_once()
+    test_tracker_moved_and_disappeared()
+    test_tracker_keeps_labels_apart()
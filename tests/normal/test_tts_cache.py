@@ -0,0 +1,123 @@
+import os
+from visionassist.memory.database import Database
+from visionassist.memory.query import QueryEngine, utcnow
+from visionassist.tts.backends import TTSBackend
+from visionassist.tts.cache import PhraseCache, phrase_key
+from visionassist.tts.model import TextToSpeechModel, split_sentences
+
+class FakeBackend(TTSBackend):
+    name = "fake"
+    extension = "mp3"
+
+    def __init__(self):
+        self.calls = []
+
+    def synthesize(self, text, lang):
+        self.calls.append((text, lang))
+        return f"{lang}:{text}".encode("utf-8") * 10
+
+def test_phrase_key_depends_on_text_lang_and_engine():
+    key = phrase_key("hello", "en", "gtts")
+    assert key == phrase_key("hello", "en", "gtts")
+    assert key != phrase_key("hello", "fr", "gtts")
+    assert key != phrase_key("hello", "en", "espeak")
+    assert key != phrase_key("hello!", "en", "gtts")
+
+def test_repeated_phrase_is_synthesized_once(tmp_path):
+    backend = FakeBackend()
+    model = TextToSpeechModel(backend=backend, cache=PhraseCache(str(tmp_path / "cache")))
+
+    first = model.generate_audio("Your cup was seen just now.", str(tmp_path / "a.mp3"))
+    second = model.generate_audio("Your cup was seen just now.", str(tmp_path / "b.mp3"))
+
+    assert len(backend.calls) == 1
+    with open(first, "rb") as a, open(second, "rb") as b:
+        assert a.read() == b.read()
+    assert model.cache.get_stats()["memory_hits"] == 1
+
+def test_generate_audio_uses_backend_extension(tmp_path):
+    class WavBackend(FakeBackend):
+        name = "fakewav"
+        extension = "wav"
+
+    model = TextToSpeechModel(backend=WavBackend(), cache=False)
+    try:
+        model.generate_audio("hello", str(tmp_path / "hello.mp3"))
+        assert False, "a .mp3 path should be rejected for wav audio"
+    except ValueError:
+        pass
+    assert model.generate_audio("hello", str(tmp_path / "hello.wav")).endswith("hello.wav")
+
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        assert model.generate_audio("hello") == str(tmp_path / "output.wav")
+    finally:
+        os.chdir(cwd)
+
+def test_cache_survives_restart(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    TextToSpeechModel(backend=FakeBackend(), cache=PhraseCache(cache_dir)).synthesize("hello")
+
+    backend = FakeBackend()
+    model = TextToSpeechModel(backend=backend, cache=PhraseCache(cache_dir))
+    assert model.synthesize("hello") == b"en:hello" * 10
+    assert backend.calls == []
+    assert model.cache.get_stats()["disk_hits"] == 1
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    # each fake phrase is 100 bytes, so only two fit
+    cache = PhraseCache(str(tmp_path / "cache"), max_bytes=250, memory_entries=0)
+    keys = [phrase_key(str(i), "en", "fake") for i in range(3)]
+    cache.put(keys[0], b"0" * 100)
+    cache.put(keys[1], b"1" * 100)
+    cache.get(keys[0])
+    cache.put(keys[2], b"2" * 100)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == b"0" * 100
+    assert cache.get(keys[2]) == b"2" * 100
+    assert len(os.listdir(tmp_path / "cache")) == 2
+    assert cache.get_stats()["disk_bytes"] == 200
+
+def test_prewarm(tmp_path):
+    backend = FakeBackend()
+    model = TextToSpeechModel(backend=backend, cache=PhraseCache(str(tmp_path / "cache")))
+
+    thread = model.prewarm(["I have not seen your book.", "Your book was last seen just now."], background=True)
+    thread.join(timeout=5)
+    assert len(backend.calls) == 2
+
+    model.synthesize("I have not seen your book.")
+    assert len(backend.calls) == 2
+
+def test_prewarmed_phrases_answer_queries(tmp_path):
+    backend = FakeBackend()
+    model = TextToSpeechModel(backend=backend, cache=PhraseCache(str(tmp_path / "cache")))
+    model.prewarm()
+    db = Database(db_path=str(tmp_path / "query.db"))
+    db.insert_detection("desk.jpg", [{"label": "cup", "confidence": 0.9, "bbox": (1, 2, 3, 4)}])
+
+    answer = QueryEngine(db).ask("where are my cup and my keys and my laptop").to_speech(now=utcnow())
+
+    calls = len(backend.calls)
+    for sentence in split_sentences(answer):
+        model.synthesize(sentence)
+    assert "Your cup was last seen just now." in answer
+    assert len(backend.calls) == calls
+
+def test_empty_text_rejected(tmp_path):
+    model = TextToSpeechModel(backend=FakeBackend(), cache=PhraseCache(str(tmp_path / "cache")))
+    try:
+        model.synthesize("")
+        assert False, "empty text should raise"
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_phrase_key_depends_on_text_lang_and_engine()
+    for test in (test_repeated_phrase_is_synthesized_once, test_generate_audio_uses_backend_extension, test_cache_survives_restart, test_cache_evicts_least_recently_used, test_prewarm, test_prewarmed_phrases_answer_queries, test_empty_text_rejected):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
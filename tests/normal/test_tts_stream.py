@@ -0,0 +1,76 @@
+import shutil
+import time
+import pytest
+from visionassist.tts.backends import EspeakBackend, TTSBackend, get_backend
+from visionassist.tts.model import TextToSpeechModel, split_sentences
+
+class SlowBackend(TTSBackend):
+    name = "slow"
+    extension = "wav"
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = []
+
+    def synthesize(self, text, lang):
+        self.calls.append(text)
+        time.sleep(self.delay)
+        return text.encode("utf-8")
+
+def test_split_sentences():
+    text = "Your cup is on the table. It was seen 2 minutes ago!\nAnything else?  Yes"
+    assert split_sentences(text) == ["Your cup is on the table.", "It was seen 2 minutes ago!", "Anything else?", "Yes"]
+    assert split_sentences("  ") == []
+
+def test_stream_yields_sentences_in_order():
+    model = TextToSpeechModel(backend=SlowBackend(0), cache=False)
+    chunks = list(model.stream("One. Two. Three. Four."))
+
+    assert [sentence for sentence, _ in chunks] == ["One.", "Two.", "Three.", "Four."]
+    assert [audio for _, audio in chunks] == [b"One.", b"Two.", b"Three.", b"Four."]
+
+def test_stream_first_chunk_before_whole_text():
+    delay = 0.1
+    model = TextToSpeechModel(backend=SlowBackend(delay), cache=False)
+    text = "First sentence. Second sentence. Third sentence. Fourth sentence."
+
+    start = time.perf_counter()
+    chunks = model.stream(text)
+    next(chunks)
+    first_audio = time.perf_counter() - start
+
+    # playing the first chunk takes longer than synthesizing the next one
+    for _ in chunks:
+        time.sleep(delay * 1.5)
+    total = time.perf_counter() - start
+
+    assert first_audio < delay * 2
+    # lookahead overlaps synthesis with playback
+    assert total < 4 * delay + 4 * delay * 1.5
+
+def test_stream_uses_cache(tmp_path):
+    from visionassist.tts.cache import PhraseCache
+    backend = SlowBackend(0)
+    model = TextToSpeechModel(backend=backend, cache=PhraseCache(str(tmp_path / "cache")))
+
+    list(model.stream("Hello. Your bag is here."))
+    list(model.stream("Your bag is here. Goodbye."))
+
+    assert sorted(backend.calls) == ["Goodbye.", "Hello.", "Your bag is here."]
+
+def test_get_backend():
+    assert get_backend("espeak").extension == "wav"
+    with pytest.raises(ValueError):
+        get_backend("missing")
+
+@pytest.mark.skipif(shutil.which("espeak-ng") is None, reason="espeak-ng not installed")
+def test_espeak_backend():
+    audio = EspeakBackend().synthesize("hello", "en")
+    assert audio[:4] == b"RIFF"
+
+if __name__ == "__main__":
+    test_split_sentences()
+    test_stream_yields_sentences_in_order()
+    test_stream_first_chunk_before_whole_text()
+    test_get_backend()
+    test_espeak_backend()
@@ -0,0 +1,70 @@
+import numpy as np
+import soundfile as sf
+from visionassist.stt.vad import UtteranceSegmenter, StreamingTranscriber, iter_audio_chunks
+
+SAMPLERATE = 16000
+
+def make_speech_like_audio():
+    """0.5 s silence, 1 s tone, 1 s silence, 0.8 s tone, 1 s silence."""
+    def tone(seconds):
+        t = np.arange(int(SAMPLERATE * seconds)) / SAMPLERATE
+        return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    def silence(seconds):
+        return np.zeros(int(SAMPLERATE * seconds), dtype=np.float32)
+
+    return np.concatenate([silence(0.5), tone(1.0), silence(1.0), tone(0.8), silence(1.0)])
+
+def fake_transcribe(audio, samplerate):
+    return {"transcription": {"text": f"{len(audio) / samplerate:.1f}s"}}
+
+def test_segmenter_cuts_on_silence():
+    segmenter = UtteranceSegmenter(SAMPLERATE, partial_interval_s=None)
+    audio = make_speech_like_audio()
+
+    events = []
+    for start in range(0, len(audio), 1024):
+        events += segmenter.feed(audio[start:start + 1024])
+    events += segmenter.flush()
+
+    assert [kind for kind, *_ in events] == ["final", "final"]
+    first_start, first_end = events[0][2], events[0][3]
+    assert 0.25 < first_start <= 0.5
+    assert 1.5 < first_end < 2.2
+
+def test_segmenter_ignores_short_noise():
+    segmenter = UtteranceSegmenter(SAMPLERATE, min_speech_ms=250)
+    click = np.zeros(SAMPLERATE, dtype=np.float32)
+    click[8000:8100] = 0.9
+
+    assert segmenter.feed(click) + segmenter.flush() == []
+
+def test_streaming_transcriber_from_wav_file(tmp_path):
+    wav_path = str(tmp_path / "utterances.wav")
+    sf.write(wav_path, make_speech_like_audio(), SAMPLERATE)
+
+    transcriber = StreamingTranscriber(fake_transcribe, SAMPLERATE)
+    results = transcriber.transcribe_stream(iter_audio_chunks(wav_path, blocksize=512))
+
+    finals = [r for r in results if r["final"]]
+    partials = [r for r in results if not r["final"]]
+    assert len(finals) == 2
+    assert len(partials) >= 1
+    assert all(isinstance(r["text"], str) for r in results)
+
+def test_streaming_transcriber_background_thread():
+    received = []
+    transcriber = StreamingTranscriber(fake_transcribe, SAMPLERATE, on_result=received.append)
+    transcriber.start()
+
+    audio = make_speech_like_audio()
+    for start in range(0, len(audio), 1024):
+        transcriber.push(audio[start:start + 1024])
+    transcriber.stop(timeout=5)
+
+    assert len([r for r in received if r["final"]]) == 2
+
+if __name__ == "__main__":
+    test_segmenter_cuts_on_silence()
+    test_segmenter_ignores_short_noise()
+    test_streaming_transcriber_background_thread()
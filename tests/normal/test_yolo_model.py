@@ -1,3 +1,4 @@
+from visionassist.model.regions import InferenceMode
 from visionassist.model.yolo import YOLOModel
 from visionassist.logger import logger
 import cv2
@@ -12,13 +13,79 @@ def test_yolo_model_detection():
     detections = model.detect(frame)
     assert isinstance(detections, list)
 
+def test_yolo_model_detection_as_array():
+    frame = cv2.imread("tests/assets/trucks.jpg")
+    detections = model.detect(frame, as_array=True)
+    assert model.to_dicts(detections) == model.detect(frame)
+
+def test_yolo_model_detect_batch():
+    frames = [cv2.imread("tests/assets/truck.jpg"), cv2.imread("tests/assets/trucks.jpg")]
+    batched = model.detect_batch(frames, batch_size=2)
+
+    assert len(batched) == len(frames)
+    for detections in batched:
+        assert isinstance(detections, list)
+        assert all(set(det) == {"label", "confidence", "bbox"} for det in detections)
+
+def test_yolo_model_scene_gate_reuses_detections():
+    gated = YOLOModel(scene_gate=True)
+    frame = cv2.imread("tests/assets/trucks.jpg")
+
+    first = gated.detect(frame)
+    second = gated.detect(frame)
+
+    assert first == second
+    assert gated.scene_gate.frames_inferred == 1
+    assert gated.scene_gate.frames_skipped == 1
+
+def test_yolo_model_scene_gate_reinfers_when_mode_changes():
+    gated = YOLOModel(scene_gate=True)
+    frame = cv2.imread("tests/assets/trucks.jpg")
+    width = frame.shape[1]
+    right = InferenceMode(rois={"right": (0.5, 0.0, 1.0, 1.0)})
+
+    gated.detect(frame)
+    cropped = gated.detect(frame, inference=right)
+
+    assert gated.scene_gate.frames_inferred == 2
+    assert all(det["bbox"][2] > width / 2 for det in cropped)
+    assert gated.detect(frame, inference=right) == cropped
+    assert gated.scene_gate.frames_skipped == 1
+
 def test_yolo_model_save_with_bbox():
     frame = cv2.imread("tests/assets/trucks.jpg")
     detections = model.detect(frame)
     file_path = model.save_with_bbox(frame, detections)
     assert isinstance(file_path, str)
 
+def test_yolo_model_background_loading():
+    background = YOLOModel(load_mode="background")
+    assert background.wait_ready(timeout=120)
+    assert background.is_ready()
+    assert background.class_ids == model.class_ids
+
+def test_yolo_model_roi_and_tiled_modes():
+    frame = cv2.imread("tests/assets/trucks.jpg")
+    height, width = frame.shape[:2]
+    whole = model.detect(frame)
+
+    everything = model.detect(frame, inference=InferenceMode(rois={"all": (0.0, 0.0, 1.0, 1.0)}))
+    assert [det["label"] for det in everything] == [det["label"] for det in whole]
+
+    left = model.detect(frame, inference={"rois": {"left": (0.0, 0.0, 0.5, 1.0)}})
+    assert all(det["bbox"][0] < width / 2 for det in left)
+
+    tiled = model.detect(frame, inference=InferenceMode(tile_size=128))
+    assert all(0 <= x1 < x2 <= width and 0 <= y1 < y2 <= height for x1, y1, x2, y2 in (det["bbox"] for det in tiled))
+    assert {det["label"] for det in whole} <= {det["label"] for det in tiled}
+
 if __name__ == "__main__":
     test_yolo_model_initialization()
     test_yolo_model_detection()
-    test_yolo_model_save_with_bbox()
\ No newline at end of file
+    test_yolo_model_detection_as_array()
+    test_yolo_model_detect_batch()
+    test_yolo_model_scene_gate_reuses_detections()
+    test_yolo_model_scene_gate_reinfers_when_mode_changes()
+    test_yolo_model_save_with_bbox()
+    test_yolo_model_background_loading()
+    test_yolo_model_roi_and_tiled_modes()
\ No newline at end of file